@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
@@ -21,6 +22,9 @@ logger = logging.getLogger(__name__)
 # Import routers
 from .routers import hazards, data, analysis, reports, climate_data
 from .routers import bbox
+from .services.netcdf_catalog import netcdf_catalog
+from .services.exposure_registry import exposure_registry
+from .services.compute_cluster import compute_cluster
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,11 +34,31 @@ async def lifespan(app: FastAPI):
     # Startup
     # TODO: Load CLIMADA data
     # TODO: Initialize cache
-    
+    # Catálogo do acervo NetCDF: refresh incremental (só arquivos novos/alterados são abertos)
+    try:
+        summary = await asyncio.to_thread(netcdf_catalog.refresh, False)
+        logger.info(f"📚 NetCDF catalog: {summary}")
+    except Exception as exc:
+        logger.warning(f"⚠️ NetCDF catalog refresh failed: {exc}")
+    # Camadas de exposição (shapefiles do frontend) lidas uma vez, com índice espacial
+    try:
+        summary = await asyncio.to_thread(exposure_registry.load)
+        logger.info(f"🗺️ Exposure layers: {len(summary['layers'])} in {summary['load_seconds']}s")
+    except Exception as exc:
+        logger.warning(f"⚠️ Exposure registry load failed: {exc}")
+    # Cluster dask local opcional (DASK_CLUSTER=1) para estatísticas/médias de região grandes
+    if compute_cluster.enabled:
+        try:
+            summary = await asyncio.to_thread(compute_cluster.start)
+            logger.info(f"🧮 Dask cluster: {summary['workers']} dashboard={summary['dashboard']}")
+        except Exception as exc:
+            logger.warning(f"⚠️ Dask cluster start failed, using local scheduler: {exc}")
+
     yield
     
     # Shutdown
     logger.info("🛑 OceanValue Backend shutting down...")
+    await asyncio.to_thread(compute_cluster.stop)
 
 # Create FastAPI app
 app = FastAPI(
@@ -0,0 +1,226 @@
+"""JSON responses that serialize numpy arrays directly (no intermediate Python lists).
+
+``NumpyJSONResponse`` writes ndarrays/numpy scalars with orjson, maps NaN/Inf to
+``null`` and optionally rounds floats to ``API_FLOAT_DECIMALS`` digits.
+``NumpyJSONRoute`` makes the routers hand raw endpoint results to that response
+instead of FastAPI's ``jsonable_encoder`` (which cannot encode ndarrays and
+walks every element in Python).
+
+Clients that send ``Accept: application/x-oceanvalue-array`` get
+``BinaryArrayResponse`` instead (see ``negotiate``): every ndarray of the
+payload is written as a raw little-endian buffer and the rest of the payload
+goes into a small JSON header, so grids and long series can be read with typed
+array views (``Float32Array``) without any parsing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import math
+import os
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _env_decimals() -> Optional[int]:
+    raw = os.getenv("API_FLOAT_DECIMALS", "").strip()
+    return int(raw) if raw else None
+
+
+FLOAT_DECIMALS = _env_decimals()
+
+
+def round_floats(obj: Any, decimals: int) -> Any:
+    """Arredonda floats e arrays float; só percorre os contêineres, nunca os elementos dos arrays."""
+    if isinstance(obj, np.ndarray):
+        return np.round(obj, decimals) if obj.dtype.kind == "f" else obj
+    if isinstance(obj, (float, np.floating)):
+        return round(float(obj), decimals) if math.isfinite(obj) else obj
+    if isinstance(obj, dict):
+        return {key: round_floats(value, decimals) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(value, decimals) for value in obj]
+    return obj
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        if not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)
+        # dtypes sem suporte no orjson (objeto/cftime, strings, float16...)
+        if obj.dtype.kind == "f":
+            return obj.astype(np.float64)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _plain(obj: Any) -> Any:
+    """Conversão completa para tipos nativos (caminho sem orjson)."""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "M":
+            obj = np.datetime_as_string(obj, unit="s")
+        return _plain(obj.tolist())
+    if isinstance(obj, np.generic):
+        return _plain(obj.item())
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {str(key): _plain(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_plain(value) for value in obj]
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(content: Any, decimals: Optional[int] = FLOAT_DECIMALS) -> bytes:
+    if decimals is not None:
+        content = round_floats(content, decimals)
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(_plain(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class NumpyJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+ARRAY_MEDIA_TYPE = "application/x-oceanvalue-array"
+ARRAY_MAGIC = b"OVA1"
+ARRAY_ALIGN = 8
+
+
+def _pad(size: int) -> int:
+    return (-size) % ARRAY_ALIGN
+
+
+def _wire_array(arr: np.ndarray) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+    """Array no formato de transporte (float32/int32/uint8, little-endian) e seus metadados."""
+    info: Dict[str, Any] = {}
+    kind = arr.dtype.kind
+    if kind == "M":
+        # Epoch em milissegundos como float64 (NaT vira NaN).
+        stamps = arr.astype("datetime64[ms]")
+        arr = np.where(np.isnat(stamps), np.nan, stamps.astype(np.int64)).astype("<f8")
+        info["encoding"] = "datetime64[ms]"
+        info["nodata"] = "NaN"
+    elif kind == "f":
+        arr = arr.astype("<f4")
+        info["nodata"] = "NaN"
+    elif kind == "b" or (kind == "u" and arr.dtype.itemsize == 1):
+        arr = arr.astype(np.uint8)
+    elif kind in "iu":
+        arr = arr.astype("<i4")
+    else:
+        return None
+    info["dtype"] = arr.dtype.name
+    info["shape"] = [int(size) for size in arr.shape]
+    return np.ascontiguousarray(arr), info
+
+
+def encode_arrays(content: Dict[str, Any]) -> bytes:
+    """Serializa o payload no layout binário: magic, tamanho do cabeçalho, cabeçalho JSON, buffers.
+
+    Os arrays numéricos de primeiro nível viram buffers alinhados em 8 bytes; os
+    demais campos (e arrays de texto/objeto) ficam em ``meta`` no cabeçalho.
+    """
+    meta: Dict[str, Any] = {}
+    arrays: Dict[str, Dict[str, Any]] = {}
+    buffers: List[bytes] = []
+    offset = 0
+    for key, value in content.items():
+        wire = _wire_array(value) if isinstance(value, np.ndarray) else None
+        if wire is None:
+            meta[key] = value
+            continue
+        arr, info = wire
+        data = arr.tobytes()
+        info.update(offset=offset, nbytes=len(data))
+        arrays[str(key)] = info
+        buffers.append(data + b"\0" * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+
+    header = dumps({"arrays": arrays, "meta": meta})
+    prefix = len(ARRAY_MAGIC) + 4
+    header += b" " * _pad(prefix + len(header))
+    return b"".join([ARRAY_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+class BinaryArrayResponse(Response):
+    media_type = ARRAY_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return encode_arrays(content)
+
+
+def negotiate(request: Request, content: Any) -> Any:
+    """``BinaryArrayResponse`` se o cliente pediu o formato binário; senão o payload segue como JSON."""
+    if not isinstance(content, dict):
+        return content
+    if ARRAY_MEDIA_TYPE in request.headers.get("accept", ""):
+        return BinaryArrayResponse(content, headers={"Vary": "Accept"})
+    return NumpyJSONResponse(content, headers={"Vary": "Accept"})
+
+
+def _wrap_endpoint(call: Callable, status_code: int) -> Callable:
+    if getattr(call, "__numpy_json__", False):
+        # include_router recria as rotas a partir do endpoint já embrulhado.
+        return call
+
+    def to_response(result: Any) -> Any:
+        if isinstance(result, Response):
+            return result
+        return NumpyJSONResponse(result, status_code=status_code)
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            return to_response(await call(*args, **kwargs))
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            return to_response(call(*args, **kwargs))
+    endpoint.__numpy_json__ = True
+    return endpoint
+
+
+class NumpyJSONRoute(APIRoute):
+    """Rota cujo retorno (dict com ndarrays) vai direto para ``NumpyJSONResponse``.
+
+    Rotas com ``response_model`` explícito seguem o fluxo normal de validação do FastAPI.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        response_model = kwargs.get("response_model")
+        if response_model is None or isinstance(response_model, DefaultPlaceholder):
+            endpoint = _wrap_endpoint(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
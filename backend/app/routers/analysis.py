@@ -1,12 +1,15 @@
+from ..responses import NumpyJSONResponse, NumpyJSONRoute
 from ..services.netcdf_reader import netcdf_reader
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, List, Literal
 from ..services.climate_risk_adapter import climate_risk_adapter
 from ..services.climate_risk_kernel import climate_risk_kernel
 from ..services.litpop_service import litpop_population_service
 from ..services.climada_wind_wave_service import climada_wind_wave_service
+from ..services.uncertainty import MC_MAX_RUNS
+from ..services.wind_derived import KNOTS_PER_MS
 import logging
 from io import BytesIO
 import numpy as np
@@ -20,7 +23,7 @@ from reportlab.lib.utils import ImageReader
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=NumpyJSONResponse, route_class=NumpyJSONRoute)
 
 
 class WindRiskRequest(BaseModel):
@@ -103,6 +106,11 @@ class ClimateScenarioRequest(BaseModel):
     historical_period: str
     future_period: str
     ssp_scenario: Literal["SSP1-2.6", "SSP2-4.5", "SSP5-8.5"]
+    # Abaixo de 128 runs (MC_MIN_RUNS) não há parada antecipada: todos os runs são avaliados
+    mc_runs: int = Field(512, ge=1, le=MC_MAX_RUNS)
+    mc_seed: Optional[int] = Field(None, ge=0)
+    mc_sampler: Literal["sobol", "lhs", "random"] = "sobol"
+    mc_tolerance: float = Field(0.05, ge=0)
 
 
 class ClimateRiskOffshoreRequest(BaseModel):
@@ -216,9 +224,9 @@ def _draw_climate_graph_pages(pdf: canvas.Canvas, result: Dict) -> None:
     charts = result.get("climada_graphs") or {}
 
     rp = charts.get("return_period_curve") or {}
-    rp_x = rp.get("return_period", []) or []
-    rp_y = rp.get("impact", []) or []
-    if rp_x and rp_y:
+    rp_x = _series(rp.get("return_period"))
+    rp_y = _series(rp.get("impact"))
+    if len(rp_x) and len(rp_y):
         fig, ax = plt.subplots(figsize=(6.5, 4.2))
         ax.plot(rp_x, rp_y)
         ax.set_title("CLIMADA - Curva de Retorno")
@@ -233,9 +241,9 @@ def _draw_climate_graph_pages(pdf: canvas.Canvas, result: Dict) -> None:
         pdf.showPage()
 
     exc = charts.get("loss_exceedance_curve") or {}
-    exc_x = exc.get("probability", []) or []
-    exc_y = exc.get("loss", []) or []
-    if exc_x and exc_y:
+    exc_x = _series(exc.get("probability"))
+    exc_y = _series(exc.get("loss"))
+    if len(exc_x) and len(exc_y):
         fig, ax = plt.subplots(figsize=(6.5, 4.2))
         ax.plot(exc_x, exc_y)
         ax.set_title("CLIMADA - Curva de Excedencia")
@@ -267,6 +275,11 @@ def _draw_climate_graph_pages(pdf: canvas.Canvas, result: Dict) -> None:
         pdf.showPage()
 
 
+def _series(value: object) -> object:
+    """Lista ou ndarray vindo do serviço; ``None`` vira lista vazia (sem testar o valor-verdade do array)."""
+    return [] if value is None else value
+
+
 def _coerce_float(value: object, default: float = 0.0) -> float:
     try:
         if value is None:
@@ -358,10 +371,10 @@ def _build_multi_risk_response_from_climada(
 
         charts = payload.get("charts", {}) or {}
         distributions_out[hazard_name] = {
-            "hist_bins": charts.get("hist_bins", []) or [],
-            "hist_counts": charts.get("hist_counts", []) or [],
-            "exceedance_values": charts.get("exceedance_values", []) or [],
-            "exceedance_probs": charts.get("exceedance_probs", []) or [],
+            "hist_bins": _series(charts.get("hist_bins")),
+            "hist_counts": _series(charts.get("hist_counts")),
+            "exceedance_values": _series(charts.get("exceedance_values")),
+            "exceedance_probs": _series(charts.get("exceedance_probs")),
         }
 
     combined = result.get("combined", {}) or {}
@@ -375,7 +388,7 @@ def _build_multi_risk_response_from_climada(
         }
 
     payload = {
-        "time": result.get("time", []) or [],
+        "time": _series(result.get("time")),
         "hazards": hazards_out,
         "distributions": distributions_out,
         "combined": {
@@ -394,8 +407,8 @@ def _build_multi_risk_response_from_climada(
             if isinstance(details, dict)
         },
         "combined_exceedance": {
-            "values": ((result.get("climada_graphs", {}) or {}).get("loss_exceedance_curve", {}) or {}).get("loss", []) or [],
-            "probs": ((result.get("climada_graphs", {}) or {}).get("loss_exceedance_curve", {}) or {}).get("probability", []) or [],
+            "values": _series(((result.get("climada_graphs", {}) or {}).get("loss_exceedance_curve", {}) or {}).get("loss")),
+            "probs": _series(((result.get("climada_graphs", {}) or {}).get("loss_exceedance_curve", {}) or {}).get("probability")),
         },
         "metrics": {
             hazard: {
@@ -418,7 +431,7 @@ def _build_multi_risk_response_from_climada(
     }
 
     if include_series:
-        series: Dict[str, List[float]] = {}
+        series: Dict[str, np.ndarray] = {}
         if "wind" in hazards_out:
             wind_series = netcdf_reader.get_interval_series(
                 variable="sfcWind",
@@ -428,7 +441,7 @@ def _build_multi_risk_response_from_climada(
                 end_year=int(end_time[:4]),
                 stat="mean"
             )
-            series["wind"] = np.asarray(wind_series, dtype=float).tolist()
+            series["wind"] = np.asarray(wind_series, dtype=float)
             # TODO: Add direction_series interval logic if needed
         if "wave" in hazards_out:
             wave_series = netcdf_reader.get_interval_series(
@@ -439,7 +452,7 @@ def _build_multi_risk_response_from_climada(
                 end_year=int(end_time[:4]),
                 stat="mean"
             )
-            series["wave"] = np.asarray(wave_series, dtype=float).tolist()
+            series["wave"] = np.asarray(wave_series, dtype=float)
         payload["series"] = series
 
     if combine_mode != "worst":
@@ -639,13 +652,14 @@ async def run_wind_risk(request: WindRiskRequest):
             stat="mean"
         )
 
-        speed_knots = np.asarray(wind_series, dtype=float) * 1.9438444924406
+        speed_knots = np.asarray(wind_series, dtype=float) * KNOTS_PER_MS
         try:
+            # Mesma janela (anos completos) de get_interval_series, para alinhar com a velocidade.
             direction_series = netcdf_reader.get_wind_direction_series(
                 lat=request.lat,
                 lon=request.lon,
-                start_time=request.start_time,
-                end_time=request.end_time,
+                start_time=f"{int(request.start_time[:4])}-01-01",
+                end_time=f"{int(request.end_time[:4])}-12-31",
                 stat="mean",
             )
             direction_deg = np.asarray(direction_series, dtype=float)
@@ -672,10 +686,10 @@ async def run_wind_risk(request: WindRiskRequest):
         return {
             "lat": float(request.lat),
             "lon": float(request.lon),
-            "time": result.get("time", []) or [],
-            "speed_knots": speed_knots.tolist(),
-            "direction_deg": direction_deg.tolist(),
-            "status": status.tolist(),
+            "time": _series(result.get("time")),
+            "speed_knots": speed_knots,
+            "direction_deg": direction_deg,
+            "status": status,
             "limits": {
                 "operational_max_knots": op_limit,
                 "attention_max_knots": att_limit,
@@ -886,7 +900,7 @@ async def run_multi_risk_pdf(request: MultiRiskRequest):
             pdf.showPage()
 
         combined_exc = result.get("combined_exceedance", {})
-        if combined_exc.get("values"):
+        if len(_series(combined_exc.get("values"))):
             fig, ax = plt.subplots(figsize=(6.5, 4))
             ax.plot(combined_exc.get("values", []), combined_exc.get("probs", []))
             ax.set_title("Excedencia combinada")
@@ -1123,9 +1137,13 @@ async def run_climate_risk_offshore(request: ClimateRiskOffshoreRequest):
                 risk_quantile=request.risk_quantile,
                 risk_load_method=request.risk_load_method,
                 expense_ratio=request.expense_ratio,
+                mc_runs=request.scenario.mc_runs,
+                mc_seed=request.scenario.mc_seed,
+                mc_sampler=request.scenario.mc_sampler,
+                mc_tolerance=request.scenario.mc_tolerance,
             )
 
-        return climada_wind_wave_service._to_serializable(response)
+        return response
     except Exception as exc:
         import traceback, logging
         logging.getLogger(__name__).error("Erro em climate-risk-offshore", exc_info=True)
@@ -1276,6 +1294,10 @@ async def run_climate_risk_onshore(request: ClimateRiskOnshoreRequest):
                 risk_quantile=request.risk_quantile,
                 risk_load_method=request.risk_load_method,
                 expense_ratio=request.expense_ratio,
+                mc_runs=request.scenario.mc_runs,
+                mc_seed=request.scenario.mc_seed,
+                mc_sampler=request.scenario.mc_sampler,
+                mc_tolerance=request.scenario.mc_tolerance,
             )
 
         return response
@@ -1,15 +1,21 @@
 from ..services.netcdf_reader import netcdf_reader
 """Climate data API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Literal, Optional, List
+import asyncio
 import os
 import httpx
 from ..services.zarr_reader import zarr_reader
 from ..services.cmems_current import cmems_current_reader
 from ..services.climada_wind_wave_service import climada_wind_wave_service
+from ..services.climate_query import climate_query
+from ..services.spatial_aggregation import weight_mask_cache
+from ..services.compute_cluster import compute_cluster
+from ..services.uncertainty import MC_MAX_RUNS
+from ..responses import NumpyJSONResponse, NumpyJSONRoute, negotiate
 
-router = APIRouter()
+router = APIRouter(default_response_class=NumpyJSONResponse, route_class=NumpyJSONRoute)
 
 
 @router.get("/variables")
@@ -17,7 +23,7 @@ async def get_available_variables():
     """Get list of available climate variables."""
     try:
         return {
-            "variables": netcdf_reader.get_available_variables(),
+            "variables": climate_query.get_available_variables(),
             "descriptions": {
                 "hs": "Significant wave height (m)",
                 "tp": "Wave period (s)",
@@ -33,8 +39,8 @@ async def get_available_variables():
 async def get_dataset_metadata():
     """Get dataset metadata (time range, spatial bounds)."""
     try:
-        time_range = netcdf_reader.get_time_range()
-        spatial_bounds = netcdf_reader.get_spatial_bounds()
+        time_range = climate_query.get_time_range()
+        spatial_bounds = climate_query.get_spatial_bounds()
         
         return {
             "time_range": {
@@ -47,8 +53,22 @@ async def get_dataset_metadata():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get hit/miss/eviction counters of the point-series cache, the NetCDF handle pool, the Zarr chunk cache, the spatial weight masks and the per-backend query routing."""
+    return {
+        "point_series": netcdf_reader.cache_stats(),
+        "handles": netcdf_reader.handle_stats(),
+        "zarr": zarr_reader.cache_stats(),
+        "spatial_masks": weight_mask_cache.stats(),
+        "compute_cluster": compute_cluster.stats(),
+        "query_router": climate_query.stats(),
+    }
+
+
 @router.get("/timeseries")
 async def get_timeseries(
+    request: Request,
     variable: str = Query(..., description="Variable name (hs, tp, u10, v10)"),
     lat: float = Query(..., description="Latitude"),
     lon: float = Query(..., description="Longitude"),
@@ -57,14 +77,30 @@ async def get_timeseries(
 ):
     """Get time series at a specific point."""
     try:
-        data = netcdf_reader.get_timeseries_at_point(
+        data = climate_query.get_timeseries_at_point(
             variable, lat, lon, start_time, end_time
         )
-        return data
+        return negotiate(request, data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_quantiles(quantiles: Optional[str]) -> List[float]:
+    """Quantis separados por vírgula; ValueError (400) se algum não for número em [0, 1]."""
+    values = []
+    for item in (quantiles or "").split(","):
+        if not item.strip():
+            continue
+        try:
+            value = float(item)
+        except ValueError:
+            raise ValueError(f"Quantil inválido: '{item.strip()}'. Use números em [0, 1], ex.: 0.5,0.9,0.99")
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Quantil fora de [0, 1]: {item.strip()}")
+        values.append(value)
+    return values
+
+
 @router.get("/statistics")
 async def get_statistics(
     variable: str = Query(..., description="Variable name"),
@@ -74,14 +110,23 @@ async def get_statistics(
     lat_max: Optional[float] = Query(None),
     lon_min: Optional[float] = Query(None),
     lon_max: Optional[float] = Query(None),
+    quantiles: Optional[str] = Query(None, description="Comma-separated quantiles in [0, 1], e.g. 0.5,0.9,0.99"),
+    hist_bins: Optional[int] = Query(None, ge=1, le=500, description="Histogram bins over [min, max]"),
 ):
     """Get statistics for queried region and time period."""
     try:
-        stats = netcdf_reader.get_statistics(
+        quantile_list = _parse_quantiles(quantiles)
+        # Fora do event loop: a redução roda no pool/cluster e o request só aguarda.
+        stats = await asyncio.to_thread(
+            climate_query.get_statistics,
             variable, start_time, end_time,
-            lat_min, lat_max, lon_min, lon_max
+            lat_min, lat_max, lon_min, lon_max,
+            quantiles=quantile_list,
+            hist_bins=hist_bins,
         )
         return stats
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -95,20 +140,28 @@ async def get_spatial_average(
     lat_max: Optional[float] = Query(None),
     lon_min: Optional[float] = Query(None),
     lon_max: Optional[float] = Query(None),
+    polygon: Optional[str] = Query(None, description="Exposure layer (e.g. campos_producao, blocos_exploratorios, santos)"),
+    feature: Optional[str] = Query(None, description="Feature name inside the layer; whole layer when omitted"),
 ):
-    """Get spatial average time series for a region."""
+    """Get area-weighted spatial average time series for a bbox and/or polygon."""
     try:
-        data = netcdf_reader.get_spatial_average(
+        data = await asyncio.to_thread(
+            climate_query.get_spatial_average,
             variable, start_time, end_time,
-            lat_min, lat_max, lon_min, lon_max
+            lat_min, lat_max, lon_min, lon_max,
+            polygon=polygon,
+            feature=feature,
         )
         return data
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/snapshot")
 async def get_snapshot(
+    request: Request,
     variable: str = Query(..., description="Variable name"),
     time: str = Query(..., description="Time (ISO format)"),
     lat_min: Optional[float] = Query(None),
@@ -118,11 +171,11 @@ async def get_snapshot(
 ):
     """Get 2D grid snapshot at a specific time."""
     try:
-        data = netcdf_reader.get_grid_snapshot(
+        data = climate_query.get_grid_snapshot(
             variable, time,
             lat_min, lat_max, lon_min, lon_max
         )
-        return data
+        return negotiate(request, data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -177,6 +230,7 @@ async def get_current_snapshot(
 
 @router.get("/wind-snapshot")
 async def get_wind_snapshot(
+    request: Request,
     time: str = Query(..., description="Time (ISO format)"),
     lat_min: Optional[float] = Query(None),
     lat_max: Optional[float] = Query(None),
@@ -184,21 +238,23 @@ async def get_wind_snapshot(
     lon_max: Optional[float] = Query(None),
     stat: str = Query("mean", description="mean or max"),
 ):
-    """Get wind snapshot from ERA5 Zarr with operational status."""
+    """Get wind snapshot with operational status from the cheapest backend covering the time."""
     try:
-        return netcdf_reader.get_wind_hazard_snapshot(
+        data = climate_query.get_wind_hazard_snapshot(
             time=time,
             lat_min=lat_min,
             lat_max=lat_max,
             lon_min=lon_min,
             lon_max=lon_max,
         )
+        return negotiate(request, data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/wind-hazard-snapshot")
 async def get_wind_hazard_snapshot(
+    request: Request,
     time: str = Query(..., description="Time (ISO format)"),
     lat_min: Optional[float] = Query(None),
     lat_max: Optional[float] = Query(None),
@@ -207,9 +263,9 @@ async def get_wind_hazard_snapshot(
     operational_max_knots: float = Query(15.0, description="Operational max wind (knots)"),
     attention_max_knots: float = Query(20.0, description="Attention max wind (knots)"),
 ):
-    """Get wind hazard snapshot from ERA5 Zarr with speed/direction/status."""
+    """Get wind hazard snapshot with speed/direction/status (backends with wind direction first)."""
     try:
-        return netcdf_reader.get_wind_hazard_snapshot(
+        data = climate_query.get_wind_hazard_snapshot(
             time=time,
             lat_min=lat_min,
             lat_max=lat_max,
@@ -218,12 +274,38 @@ async def get_wind_hazard_snapshot(
             operational_limit_knots=operational_max_knots,
             attention_limit_knots=attention_max_knots,
         )
+        return negotiate(request, data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/wind-rose")
+async def get_wind_rose(
+    lat: float = Query(..., description="Latitude"),
+    lon: float = Query(..., description="Longitude"),
+    months: Optional[str] = Query(None, description="Comma-separated months (1-12); all when omitted"),
+    operational_max_knots: float = Query(15.0, description="Operational max wind (knots)"),
+    attention_max_knots: float = Query(20.0, description="Attention max wind (knots)"),
+):
+    """Get the wind rose of the nearest ERA5 cell from the precomputed cube (live series as fallback)."""
+    try:
+        month_list = [int(item) for item in months.split(",") if item.strip()] if months else None
+        return climate_query.get_wind_rose(
+            lat=lat,
+            lon=lon,
+            months=month_list,
+            operational_limit_knots=operational_max_knots,
+            attention_limit_knots=attention_max_knots,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/wave-snapshot")
 async def get_wave_snapshot(
+    request: Request,
     time: str = Query(..., description="Time (ISO format)"),
     lat_min: Optional[float] = Query(None),
     lat_max: Optional[float] = Query(None),
@@ -231,9 +313,10 @@ async def get_wave_snapshot(
     lon_max: Optional[float] = Query(None),
     stat: str = Query("mean", description="mean or max"),
 ):
-    """Get wave snapshot from ERA5 Zarr dataset."""
+    """Get wave snapshot from the map-major backend covering the time."""
     try:
-        return netcdf_reader.get_grid_snapshot("hs", time, lat_min, lat_max, lon_min, lon_max)
+        data = climate_query.get_grid_snapshot("hs", time, lat_min, lat_max, lon_min, lon_max)
+        return negotiate(request, data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -248,6 +331,10 @@ async def get_wind_scenario_comparison(
     future_period: str = Query("2035-2064", description="Future period (YYYY-YYYY)"),
     operational_max_knots: float = Query(15.0, description="Operational max wind (knots)"),
     attention_max_knots: float = Query(20.0, description="Attention max wind (knots)"),
+    mc_runs: int = Query(512, ge=1, le=MC_MAX_RUNS, description="Maximum Monte Carlo uncertainty runs (no early stop below 128)"),
+    mc_seed: Optional[int] = Query(None, ge=0, description="Monte Carlo seed (default: derived from the request assumptions)"),
+    mc_sampler: Literal["sobol", "lhs", "random"] = Query("sobol", description="sobol, lhs or random"),
+    mc_tolerance: float = Query(0.05, ge=0.0, description="Standard error of the AAL/PML bands, as a fraction of the band width, to stop at (0 runs all)"),
 ):
     """Compare historical vs future wind conditions using CLIMADA impact calculations."""
     try:
@@ -261,6 +348,10 @@ async def get_wind_scenario_comparison(
             future_period=future_period,
             operational_max=operational_max_knots,
             attention_max=attention_max_knots,
+            mc_runs=mc_runs,
+            mc_seed=mc_seed,
+            mc_sampler=mc_sampler,
+            mc_tolerance=mc_tolerance,
         )
     except FileNotFoundError as e:
         return {
@@ -311,6 +402,8 @@ async def get_wind_scenario_comparison(
                 "future_monthly_mean_knots": [None for _ in range(12)],
             },
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -325,6 +418,10 @@ async def get_wave_scenario_comparison(
     future_period: str = Query("2035-2064", description="Future period (YYYY-YYYY)"),
     operational_max_meters: float = Query(2.0, description="Operational max wave height (m)"),
     attention_max_meters: float = Query(4.0, description="Attention max wave height (m)"),
+    mc_runs: int = Query(512, ge=1, le=MC_MAX_RUNS, description="Maximum Monte Carlo uncertainty runs (no early stop below 128)"),
+    mc_seed: Optional[int] = Query(None, ge=0, description="Monte Carlo seed (default: derived from the request assumptions)"),
+    mc_sampler: Literal["sobol", "lhs", "random"] = Query("sobol", description="sobol, lhs or random"),
+    mc_tolerance: float = Query(0.05, ge=0.0, description="Standard error of the AAL/PML bands, as a fraction of the band width, to stop at (0 runs all)"),
 ):
     """Compare historical vs future wave conditions using CLIMADA impact calculations."""
     try:
@@ -338,6 +435,10 @@ async def get_wave_scenario_comparison(
             future_period=future_period,
             operational_max=operational_max_meters,
             attention_max=attention_max_meters,
+            mc_runs=mc_runs,
+            mc_seed=mc_seed,
+            mc_sampler=mc_sampler,
+            mc_tolerance=mc_tolerance,
         )
     except FileNotFoundError as e:
         return {
@@ -388,5 +489,7 @@ async def get_wave_scenario_comparison(
                 "future_monthly_mean_meters": [None for _ in range(12)],
             },
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,17 @@
 import logging
 import os
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
 import numpy as np
 
+from .loss_distribution import LossDistribution
+
 logger = logging.getLogger(__name__)
 
+# Quantis do painel de sensibilidade (VaR/TVaR/prêmio técnico)
+SENSITIVITY_QUANTILES = (0.90, 0.95, 0.99)
+
 
 @dataclass
 class ClimadaRuntime:
@@ -45,76 +50,21 @@ class ClimadaPetalsEngine:
                 f"Detalhe: {self.runtime.reason}"
             )
 
-    def _build_climada_impact(self, loss_per_step: np.ndarray, annualization: float):
-        self._assert_available()
-        if not self.runtime.available:
-            return None
-
-        Impact = self.runtime.Impact
-        if Impact is None:
-            return None
-
-        impact = Impact()
-        n = max(int(loss_per_step.size), 1)
-        impact.at_event = np.asarray(loss_per_step, dtype=float)
-        annualization_f = float(max(annualization, 1e-12))
-        impact.frequency = np.full(n, annualization_f / n, dtype=float)
-        impact.event_id = np.arange(1, n + 1, dtype=int)
-        impact.date = np.arange(737061, 737061 + n, dtype=int)
-        impact.unit = "BRL"
-
-        return impact
-
-    def _extract_climada_aal(self, impact) -> float | None:
-        if impact is None:
-            return None
-
-        try:
-            candidate = float(np.sum(np.asarray(impact.at_event, dtype=float) * np.asarray(impact.frequency, dtype=float)))
-            if np.isfinite(candidate):
-                return candidate
-        except Exception:
-            pass
-        return None
-
-    def _extract_climada_var(self, impact, risk_quantile: float) -> float | None:
-        if impact is None:
-            return None
-
-        exceedance_prob = float(np.clip(1.0 - risk_quantile, 1e-6, 0.5))
-        return_period = 1.0 / exceedance_prob
-
-        try:
-            curve = impact.calc_freq_curve(return_per=[return_period])
-            values = np.asarray(curve.impact, dtype=float)
-            if values.size > 0 and np.isfinite(values[0]):
-                return float(values[0])
-        except Exception:
-            return None
-        return None
-
-    def _extract_climada_pml(self, impact) -> float | None:
-        if impact is None:
-            return None
-        try:
-            curve = impact.calc_freq_curve()
-            values = np.asarray(curve.impact, dtype=float)
-            if values.size > 0:
-                candidate = float(np.nanmax(values))
-                if np.isfinite(candidate):
-                    return candidate
-        except Exception:
-            return None
-        return None
-
-    def build_petals_appendix(self, loss_per_step: np.ndarray, annualization: float) -> Dict[str, List[float] | List[str]]:
+    def build_petals_appendix(
+        self,
+        loss_per_step: np.ndarray,
+        annualization: float,
+        distribution: Optional[LossDistribution] = None,
+    ) -> Dict[str, List[float] | List[str]]:
         quantiles = [0.50, 0.75, 0.90, 0.95, 0.99]
         labels = [f"Q{int(q * 100)}" for q in quantiles]
 
-        if loss_per_step.size == 0:
+        if distribution is None:
+            distribution = LossDistribution.from_losses(loss_per_step, annualization)
+        if distribution.size == 0:
             return {"petals_labels": labels, "petals_values": [0.0 for _ in quantiles]}
 
-        values = [float(np.nanquantile(loss_per_step, q)) * annualization for q in quantiles]
+        values = [float(v) for v in distribution.petals_quantiles(quantiles, annualization)]
         vmax = max(max(values), 1e-12)
         normalized = [float(v / vmax) for v in values]
         return {
@@ -123,96 +73,147 @@ class ClimadaPetalsEngine:
             "petals_raw_values": values,
         }
 
-    def compute_pricing(
+    def compute_pricing_table(
         self,
         loss_per_step: np.ndarray,
         annualization: float,
-        risk_quantile: float,
-        risk_load_method: str,
+        risk_quantiles: Sequence[float],
+        risk_load_methods: Sequence[str],
         expense_ratio: float,
-    ) -> Dict[str, float | str | Dict]:
-        clean = np.asarray(loss_per_step, dtype=float)
-        clean = clean[np.isfinite(clean)]
-        if clean.size == 0:
-            clean = np.array([0.0], dtype=float)
-
-        impact = self._build_climada_impact(clean, annualization=annualization)
-        aal_base = self._extract_climada_aal(impact)
-        if aal_base is None:
-            aal_base = float(np.mean(clean)) * float(max(annualization, 0.0))
-
-        quantile = float(np.clip(risk_quantile, 0.5, 0.999))
-        aal = float(aal_base)
-
-        pml_base = self._extract_climada_pml(impact)
-        if pml_base is None:
-            pml_base = float(np.nanmax(clean)) * float(max(annualization, 0.0))
-        pml = float(pml_base)
-
-        var_base = self._extract_climada_var(impact, quantile)
-        if var_base is None:
-            var_base = float(np.nanquantile(clean, quantile)) * float(max(annualization, 0.0))
-        var_q = float(var_base)
-
-        threshold_base = var_q / float(max(annualization, 1e-12))
-        tail = clean[clean >= threshold_base]
-        tvar_q = (float(np.nanmean(tail)) if tail.size else threshold_base) * float(max(annualization, 0.0))
-
-        method = (risk_load_method or "none").lower()
-        if method == "var":
-            risk_load = max(var_q - aal, 0.0)
-        elif method == "tvar":
-            risk_load = max(tvar_q - aal, 0.0)
-        elif method == "stdev":
-            risk_load = float(np.nanstd(clean)) * np.sqrt(annualization)
-        else:
-            risk_load = 0.0
+        distribution: Optional[LossDistribution] = None,
+    ) -> Dict:
+        """Precificação para vários quantis e métodos de carregamento a partir de uma única ordenação.
+
+        VaR/TVaR vêm por quantil (listas alinhadas a ``risk_quantiles``); ``risk_load`` e
+        ``technical_premium`` por método e quantil. ``distribution`` já ordenada
+        (``LossDistribution.from_losses``) evita reordenar ``loss_per_step``.
+        """
+        self._assert_available()
+        if distribution is None:
+            distribution = LossDistribution.from_losses(loss_per_step, annualization)
+        if distribution.size == 0:
+            distribution = LossDistribution.from_losses(np.array([0.0], dtype=float), annualization)
+        annualization_f = float(max(annualization, 0.0))
+
+        quantiles = np.clip(np.asarray(risk_quantiles, dtype=float).reshape(-1), 0.5, 0.999)
+        # Mesmas grandezas do Impact do CLIMADA: aai_agg, máximo da curva de frequência e perda no período de retorno
+        aal = float(distribution.aal)
+        pml = float(distribution.pml)
+
+        return_periods = 1.0 / np.clip(1.0 - quantiles, 1e-6, 0.5)
+        var_q = distribution.loss_at_return_period(return_periods)
+        missing = ~np.isfinite(var_q)
+        if missing.any():
+            var_q[missing] = distribution.quantile(quantiles[missing]) * annualization_f
+
+        thresholds = var_q / float(max(annualization, 1e-12))
+        tvar_q = distribution.tail_mean(thresholds) * annualization_f
 
         pure_premium = aal
-        technical_premium = pure_premium * (1.0 + float(max(expense_ratio, 0.0))) + risk_load
-
-        petals = self.build_petals_appendix(clean, annualization)
+        loading = pure_premium * (1.0 + float(max(expense_ratio, 0.0)))
+        risk_load: Dict[str, List[float]] = {}
+        technical_premium: Dict[str, List[float]] = {}
+        for method in dict.fromkeys((m or "none").lower() for m in risk_load_methods):
+            if method == "var":
+                load = np.maximum(var_q - aal, 0.0)
+            elif method == "tvar":
+                load = np.maximum(tvar_q - aal, 0.0)
+            elif method == "stdev":
+                load = np.full(quantiles.size, distribution.std * np.sqrt(annualization))
+            else:
+                load = np.zeros(quantiles.size)
+            risk_load[method] = [float(v) for v in load]
+            technical_premium[method] = [float(v) for v in loading + load]
 
         return {
-            "aal": float(aal),
-            "pml": float(pml),
-            "var": float(var_q),
-            "tvar": float(tvar_q),
-            "risk_load": float(risk_load),
+            "aal": aal,
+            "pml": pml,
             "pure_premium": float(pure_premium),
-            "technical_premium": float(technical_premium),
-            "risk_quantile": float(quantile),
-            "risk_load_method": method,
+            "risk_quantiles": [float(q) for q in quantiles],
+            "var": [float(v) for v in var_q],
+            "tvar": [float(v) for v in tvar_q],
+            "risk_load": risk_load,
+            "technical_premium": technical_premium,
             "engine": "climada",
-            "petals_appendix": petals,
+            "petals_appendix": self.build_petals_appendix(distribution.losses, annualization, distribution),
         }
 
-    def compute_quantile_sensitivity(
-        self,
-        loss_per_step: np.ndarray,
-        annualization: float,
+    @staticmethod
+    def pricing_from_table(table: Dict, risk_quantile: float, risk_load_method: str) -> Dict[str, float | str | Dict]:
+        """Linha (quantil, método) da tabela no formato de ``compute_pricing``."""
+        method = (risk_load_method or "none").lower()
+        quantile = float(np.clip(risk_quantile, 0.5, 0.999))
+        matches = np.flatnonzero(np.isclose(table["risk_quantiles"], quantile))
+        if matches.size == 0:
+            raise ValueError(f"Quantil {quantile} fora da tabela de precificação.")
+        index = int(matches[0])
+        return {
+            "aal": float(table["aal"]),
+            "pml": float(table["pml"]),
+            "var": float(table["var"][index]),
+            "tvar": float(table["tvar"][index]),
+            "risk_load": float(table["risk_load"][method][index]),
+            "pure_premium": float(table["pure_premium"]),
+            "technical_premium": float(table["technical_premium"][method][index]),
+            "risk_quantile": float(table["risk_quantiles"][index]),
+            "risk_load_method": method,
+            "engine": table["engine"],
+            "petals_appendix": table["petals_appendix"],
+        }
+
+    @staticmethod
+    def quantile_sensitivity_from_table(
+        table: Dict,
         risk_load_method: str,
-        expense_ratio: float,
+        quantiles: Sequence[float] = SENSITIVITY_QUANTILES,
     ) -> List[Dict[str, float]]:
-        quantiles = [0.90, 0.95, 0.99]
         results: List[Dict[str, float]] = []
         for q in quantiles:
-            pricing = self.compute_pricing(
-                loss_per_step=loss_per_step,
-                annualization=annualization,
-                risk_quantile=q,
-                risk_load_method=risk_load_method,
-                expense_ratio=expense_ratio,
-            )
+            row = ClimadaPetalsEngine.pricing_from_table(table, q, risk_load_method)
             results.append(
                 {
                     "quantile": float(q),
-                    "var": float(pricing["var"]),
-                    "tvar": float(pricing["tvar"]),
-                    "technical_premium": float(pricing["technical_premium"]),
+                    "var": float(row["var"]),
+                    "tvar": float(row["tvar"]),
+                    "technical_premium": float(row["technical_premium"]),
                 }
             )
         return results
 
+    def compute_pricing(
+        self,
+        loss_per_step: np.ndarray,
+        annualization: float,
+        risk_quantile: float,
+        risk_load_method: str,
+        expense_ratio: float,
+        distribution: Optional[LossDistribution] = None,
+    ) -> Dict[str, float | str | Dict]:
+        table = self.compute_pricing_table(
+            loss_per_step=loss_per_step,
+            annualization=annualization,
+            risk_quantiles=[risk_quantile],
+            risk_load_methods=[risk_load_method],
+            expense_ratio=expense_ratio,
+            distribution=distribution,
+        )
+        return self.pricing_from_table(table, risk_quantile, risk_load_method)
+
+    def compute_quantile_sensitivity(
+        self,
+        loss_per_step: np.ndarray,
+        annualization: float,
+        risk_load_method: str,
+        expense_ratio: float,
+    ) -> List[Dict[str, float]]:
+        table = self.compute_pricing_table(
+            loss_per_step=loss_per_step,
+            annualization=annualization,
+            risk_quantiles=SENSITIVITY_QUANTILES,
+            risk_load_methods=[risk_load_method],
+            expense_ratio=expense_ratio,
+        )
+        return self.quantile_sensitivity_from_table(table, risk_load_method)
+
 
 climada_petals_engine = ClimadaPetalsEngine()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -14,8 +15,19 @@ from climada.hazard.base import Hazard
 from climada.hazard.centroids import Centroids
 
 from .climada_petals import climada_petals_engine
+from .climate_risk_kernel import climate_risk_kernel
+from .climatology import climatology_store, quantile_lists, yearly_monthly_means
+from .impact_kernel import single_centroid_impact
+from .loss_distribution import LossDistribution, exceedance_probs as plotting_positions
+from .netcdf_catalog import BASE_DIR
 from .netcdf_reader import netcdf_reader
 from .oceanpact_data_reader import get_netcdf_series, find_netcdf_file
+from .uncertainty import MC_DEFAULT_RUNS, MC_TOLERANCE, RETURN_PERIODS, scenario_uncertainty
+from .wind_derived import KNOTS_PER_MS
+
+
+# Um único ativo: impacto pelo kernel vetorizado (0 força o ImpactCalc completo do CLIMADA)
+CLIMADA_FAST_IMPACT = os.getenv("CLIMADA_FAST_IMPACT", "1").strip().lower() in {"1", "true", "yes", "on"}
 
 
 @dataclass
@@ -132,33 +144,8 @@ class ClimadaWindWaveService:
 
     @staticmethod
     def _exceedance_probs(n: int, method: str = "weibull") -> np.ndarray:
-        if n <= 0:
-            return np.array([], dtype=float)
-        rank = np.arange(1, n + 1, dtype=float)
-        m = (method or "weibull").lower()
-        if m == "weibull":
-            return rank / (n + 1)
-        elif m == "gringorten":
-            return (rank - 0.44) / (n + 0.12)
-        elif m == "cunnane":
-            return (rank - 0.4) / (n + 0.2)
-        else:
-            return rank / (n + 1)
+        return plotting_positions(n, method)
 
-        # ...existing code for response (sanitized block remains)...
-
-    @staticmethod
-    def _to_serializable(obj):
-        """Recursively cast numpy/scalars to JSON-friendly types."""
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, (np.generic,)):
-            return obj.item()
-        if isinstance(obj, dict):
-            return {k: ClimadaWindWaveService._to_serializable(v) for k, v in obj.items()}
-        if isinstance(obj, (list, tuple)):
-            return [ClimadaWindWaveService._to_serializable(v) for v in obj]
-        return obj
     @staticmethod
     def _build_exposures(lat: float, lon: float, asset_value: float, haz_code: str) -> Exposures:
         impf_column = f"impf_{haz_code}"
@@ -174,6 +161,66 @@ class ClimadaWindWaveService:
         exposures.check()
         return exposures
 
+    def _climada_impact(
+        self,
+        *,
+        hazard_name: str,
+        intensity: np.ndarray,
+        lat: float,
+        lon: float,
+        asset_value: float,
+        impf_set: ImpactFuncSet,
+        per_event_frequency: float,
+    ) -> Impact:
+        """``Impact`` pelo ``ImpactCalc`` completo (Hazard de um centroide + Exposures)."""
+        cfg = self._CONFIG[hazard_name]
+        n_events = int(intensity.size)
+        hazard = Hazard()
+        hazard.haz_type = cfg.code
+        # CLIMADA expects intensity matrix shaped (n_event, n_centroid); we have 1 centroid.
+        hazard.intensity = sparse.csr_matrix(np.asarray(intensity, dtype=float).reshape(n_events, 1))
+        hazard.frequency = np.full(n_events, per_event_frequency, dtype=float)
+        hazard.event_id = np.arange(1, n_events + 1, dtype=int)
+        hazard.event_name = np.array([f"event_{i}" for i in range(1, n_events + 1)], dtype=object)
+        hazard.date = np.arange(n_events, dtype=int)
+        hazard.units = cfg.unit
+        hazard.centroids = Centroids.from_lat_lon([float(lat)], [float(lon)])
+
+        exposures = self._build_exposures(lat=lat, lon=lon, asset_value=asset_value, haz_code=cfg.code)
+        return ImpactCalc(exposures, impf_set, hazard).impact(save_mat=False, assign_centroids=True)
+
+    @staticmethod
+    def _point_impact(
+        *,
+        intensity: np.ndarray,
+        lat: float,
+        lon: float,
+        asset_value: float,
+        impact_func: ImpactFunc,
+        per_event_frequency: float,
+    ) -> Impact:
+        """``Impact`` de um único ativo pelo kernel vetorizado (mesmo resultado do ``ImpactCalc``)."""
+        value = float(max(asset_value, 0.0))
+        result = single_centroid_impact(
+            intensity,
+            value,
+            impact_func.intensity,
+            impact_func.mdd,
+            impact_func.paa,
+            per_event_frequency,
+        )
+        n_events = int(result.at_event.size)
+        impact = Impact()
+        impact.event_id = np.arange(1, n_events + 1, dtype=int)
+        impact.date = np.arange(n_events, dtype=int)
+        impact.coord_exp = np.array([[float(lat), float(lon)]], dtype=float)
+        impact.tot_value = value
+        impact.at_event = result.at_event
+        impact.frequency = result.frequency
+        impact.eai_exp = result.eai_exp
+        impact.aai_agg = result.aai_agg
+        return impact
+
     def _build_impact_func_set(
         self,
         *,
@@ -208,58 +255,42 @@ class ClimadaWindWaveService:
 
     @staticmethod
     def _impact_summary(
-        impact: Impact,
+        distribution: LossDistribution,
         *,
         risk_quantile: float,
         annualization: float,
         risk_load_method: str,
         expense_ratio: float,
     ) -> Dict[str, float | Dict]:
-        at_event = np.asarray(impact.at_event, dtype=float)
-        clean_events = at_event[np.isfinite(at_event)]
-        if clean_events.size == 0:
-            clean_events = np.array([0.0], dtype=float)
-
-        frequency = np.asarray(getattr(impact, "frequency", np.array([], dtype=float)), dtype=float)
-        frequency = frequency[np.isfinite(frequency)]
+        if distribution.size == 0:
+            distribution = LossDistribution.from_events(np.array([0.0]), np.array([0.0]))
 
-        aal_raw = float(getattr(impact, "aai_agg", np.nan))
+        aal_raw = float(distribution.aal)
         if not np.isfinite(aal_raw) or aal_raw <= 0.0:
-            if frequency.size == clean_events.size and frequency.size > 0:
-                aal_raw = float(np.sum(clean_events * frequency))
-            else:
-                aal_raw = float(np.mean(clean_events)) * float(max(annualization, 1e-9))
+            aal_raw = float(np.mean(distribution.losses)) * float(max(annualization, 1e-9))
 
         quantile = float(np.clip(risk_quantile, 0.5, 0.999))
         return_period = 1.0 / float(max(1e-6, 1.0 - quantile))
 
-        var_q = 0.0
-        try:
-            curve_rp = impact.calc_freq_curve(return_per=[return_period])
-            var_q = float(np.asarray(curve_rp.impact, dtype=float)[0])
-        except Exception as exc:
-            import logging
-            logging.error(f"Erro ao calcular VaR: {exc}")
-            var_q = 0.0
-            raise ValueError(f"Erro ao calcular VaR: {exc}")
+        var_q = float(distribution.loss_at_return_period(return_period)[0])
+        threshold = float(distribution.quantile(quantile)[0])
         if not np.isfinite(var_q) or var_q <= 0.0:
-            var_q = float(np.nanquantile(clean_events, quantile))
-
-        threshold = float(np.nanquantile(clean_events, quantile))
-        tail = clean_events[clean_events >= threshold]
-        tvar_q = float(np.nanmean(tail)) if tail.size else threshold
+            var_q = threshold
+        tvar_q = float(distribution.tail_mean(threshold)[0])
 
+        # Mesmas perdas com frequência uniforme annualization / n: reaproveita a ordenação
         pricing = climada_petals_engine.compute_pricing(
-            loss_per_step=clean_events,
+            loss_per_step=distribution.losses,
             annualization=float(max(annualization, 1e-9)),
             risk_quantile=quantile,
             risk_load_method=risk_load_method,
             expense_ratio=expense_ratio,
+            distribution=distribution.with_annualization(float(max(annualization, 1e-9))),
         )
 
         return {
             "aal": float(aal_raw),
-            "pml": float(np.nanmax(clean_events)) if clean_events.size else 0.0,
+            "pml": float(distribution.pml),
             "var": float(var_q),
             "tvar": float(tvar_q),
             # ...removed duplicate/old pricing_models block...
@@ -289,10 +320,6 @@ class ClimadaWindWaveService:
         if clean.size == 0:
             clean = np.array([0.0], dtype=float)
 
-        # Build hazard/exposure/vulnerability using CLIMADA classes
-        from climada.hazard import Hazard, Centroids
-        from scipy.sparse import csr_matrix
-
         n_events = int(clean.size)
 
         # Estimate event spacing from the time coordinate to derive per-event frequency
@@ -307,18 +334,6 @@ class ClimadaWindWaveService:
         annualization = float(8760.0 / total_hours) if annualization <= 0 else float(annualization)
         per_event_frequency = float(max(annualization, 1e-9)) / max(n_events, 1)
 
-        hazard = Hazard()
-        hazard.haz_type = cfg.code
-        # CLIMADA expects intensity matrix shaped (n_event, n_centroid); we have 1 centroid.
-        hazard.intensity = csr_matrix(clean.reshape(n_events, 1))
-        hazard.frequency = np.full(n_events, per_event_frequency, dtype=float)
-        hazard.event_id = np.arange(1, n_events + 1, dtype=int)
-        hazard.event_name = np.array([f"event_{i}" for i in range(1, n_events + 1)], dtype=object)
-        hazard.date = np.arange(n_events, dtype=int)
-        hazard.units = cfg.unit
-        hazard.centroids = Centroids.from_lat_lon([float(lat)], [float(lon)])
-
-        exposures = self._build_exposures(lat=lat, lon=lon, asset_value=asset_value, haz_code=cfg.code)
         impf_set = self._build_impact_func_set(
             haz_code=cfg.code,
             unit=cfg.unit,
@@ -328,8 +343,28 @@ class ClimadaWindWaveService:
             stop_loss_factor=hazard_stop_loss_factor,
         )
 
-        # Run native CLIMADA impact; if flat/invalid, rebuild per-event losses from AAL to avoid zeroed outputs
-        impact = ImpactCalc(exposures, impf_set, hazard).impact(save_mat=False, assign_centroids=True)
+        if CLIMADA_FAST_IMPACT:
+            # Um ativo e uma curva: MDD x PAA interpolados direto sobre a série, sem Hazard/Exposures
+            impact = self._point_impact(
+                intensity=clean,
+                lat=lat,
+                lon=lon,
+                asset_value=asset_value,
+                impact_func=impf_set.get_func(haz_type=cfg.code, fun_id=1),
+                per_event_frequency=per_event_frequency,
+            )
+        else:
+            impact = self._climada_impact(
+                hazard_name=hazard_name,
+                intensity=clean,
+                lat=lat,
+                lon=lon,
+                asset_value=asset_value,
+                impf_set=impf_set,
+                per_event_frequency=per_event_frequency,
+            )
+
+        # If flat/invalid, rebuild per-event losses from AAL to avoid zeroed outputs
         raw_at_event = np.asarray(getattr(impact, "at_event", np.array([], dtype=float)), dtype=float)
 
         # Use CLIMADA frequency when present; otherwise derive evenly across events
@@ -395,35 +430,19 @@ class ClimadaWindWaveService:
         counts, bin_edges = np.histogram(clean, bins=20)
         bin_centers = 0.5 * (bin_edges[1:] + bin_edges[:-1])
 
-        # Loss-based exceedance curve per hazard
-        loss_values = np.asarray(impact.at_event, dtype=float)
-        loss_freq = np.asarray(impact.frequency, dtype=float)
-        mask = np.isfinite(loss_values)
-        if mask.any():
-            sort_idx = np.argsort(loss_values[mask])[::-1]
-            sorted_losses = loss_values[mask][sort_idx]
-            sorted_freq = loss_freq[mask][sort_idx] if loss_freq.size == loss_values.size else np.zeros_like(sorted_losses)
-            cum = np.cumsum(sorted_freq)
-            total = float(np.sum(sorted_freq)) if np.isfinite(sorted_freq).any() else 0.0
-            if total <= 0.0:
-                exceedance = self._exceedance_probs(sorted_losses.size, exceedance_method)
-            else:
-                exceedance = 1.0 - np.clip(cum / total, 0.0, 1.0)
-            exceedance_vals = sorted_losses.tolist()
-            exceedance_probs = np.asarray(exceedance, dtype=float).tolist()
-        else:
-            exceedance_vals = []
-            exceedance_probs = []
+        # Distribuição de perdas ordenada uma vez: excedência, VaR/TVaR e curva de período de retorno
+        distribution = LossDistribution.from_events(impact.at_event, impact.frequency)
+        exceedance_vals, exceedance_probs = distribution.exceedance_curve(exceedance_method)
 
         pricing_summary = self._impact_summary(
-            impact,
+            distribution,
             risk_quantile=risk_quantile,
             annualization=float(annualization),
             risk_load_method=risk_load_method,
             expense_ratio=expense_ratio,
         )
         pml_value = float(pricing_summary.get("pml", 0.0))
-        return_curve = impact.calc_freq_curve(return_per=[2, 5, 10, 20, 50, 100])
+        return_impact = distribution.loss_at_return_period(RETURN_PERIODS)
 
         return {
             "hazard": hazard_name,
@@ -466,12 +485,12 @@ class ClimadaWindWaveService:
             "pricing": pricing_summary,
             "pml": pml_value,
             "charts": {
-                "hist_bins": bin_centers.tolist(),
-                "hist_counts": counts.astype(int).tolist(),
+                "hist_bins": bin_centers,
+                "hist_counts": counts.astype(int),
                 "exceedance_values": exceedance_vals,
                 "exceedance_probs": exceedance_probs,
-                "return_period": [float(v) for v in return_curve.return_per],
-                "impact": [float(v) for v in np.asarray(return_curve.impact, dtype=float)],
+                "return_period": [float(v) for v in RETURN_PERIODS],
+                "impact": [float(v) for v in return_impact],
             },
         }
 
@@ -516,28 +535,22 @@ class ClimadaWindWaveService:
         if not np.isfinite(combined_frequency).any():
             combined_frequency = np.full(base_n, float(max(annualization, 1e-9)) / max(base_n, 1), dtype=float)
 
-        combined_impact = Impact()
-        combined_impact.at_event = np.asarray(combined_at_event, dtype=float)
-        combined_impact.frequency = np.asarray(combined_frequency, dtype=float)
-        combined_impact.event_id = np.arange(1, base_n + 1, dtype=int)
-        combined_impact.date = np.arange(737000, 737000 + base_n, dtype=int)
-        combined_impact.unit = "BRL"
-
+        distribution = LossDistribution.from_events(combined_at_event, combined_frequency)
         pricing = self._impact_summary(
-            combined_impact,
+            distribution,
             risk_quantile=risk_quantile,
             annualization=annualization,
             risk_load_method=risk_load_method,
             expense_ratio=expense_ratio,
         )
-        return_curve = combined_impact.calc_freq_curve(return_per=[2, 5, 10, 20, 50, 100])
 
         return {
             "at_event": combined_at_event,
-            "frequency": np.asarray(combined_impact.frequency, dtype=float),
+            "frequency": np.asarray(combined_frequency, dtype=float),
+            "distribution": distribution,
             "pricing": pricing,
-            "return_period": [float(v) for v in return_curve.return_per],
-            "impact_curve": [float(v) for v in np.asarray(return_curve.impact, dtype=float)],
+            "return_period": [float(v) for v in RETURN_PERIODS],
+            "impact_curve": [float(v) for v in distribution.loss_at_return_period(RETURN_PERIODS)],
         }
 
     @staticmethod
@@ -585,9 +598,6 @@ class ClimadaWindWaveService:
             path = netcdf_reader._pick_wind_future_path(scenario, stat)
 
         ds = netcdf_reader._open(path)
-        time_name = netcdf_reader._find_coord(ds, ["time", "t"])
-        lat_name = netcdf_reader._find_coord(ds, ["lat", "latitude", "y"])
-        lon_name = netcdf_reader._find_coord(ds, ["lon", "longitude", "x"])
         # Suporta variáveis corrigidas e máx: preferir sfcWindmax_corr -> sfcWindmax -> sfcWind_corr -> sfcWind
         candidates = [
             "sfcWindmax_corr",
@@ -599,13 +609,10 @@ class ClimadaWindWaveService:
         if var_name is None:
             raise ValueError(f"Nenhuma variável de vento encontrada no dataset. Disponíveis: {list(ds.data_vars)}")
 
-        point = ds[var_name].sel({lat_name: lat, lon_name: lon}, method="nearest")
-        mask = (point[time_name].dt.year >= start_year) & (point[time_name].dt.year <= end_year)
-        filtered = point.where(mask, drop=True).load()
+        values, times = netcdf_reader._read_point_years(path, var_name, lat, lon, start_year, end_year)
 
-        to_knots = 1.9438444924406
-        values_knots = np.asarray(filtered.values, dtype=float) * to_knots
-        return xr.DataArray(values_knots, coords={"time": filtered[time_name].values}, dims=["time"])
+        values_knots = np.asarray(values, dtype=float) * KNOTS_PER_MS
+        return xr.DataArray(values_knots, coords={"time": times}, dims=["time"])
 
     def _load_wave_period_series(
         self,
@@ -646,6 +653,10 @@ class ClimadaWindWaveService:
         risk_quantile: float = 0.95,
         risk_load_method: str = "none",
         expense_ratio: float = 0.15,
+        mc_runs: int = MC_DEFAULT_RUNS,
+        mc_seed: Optional[int] = None,
+        mc_sampler: str = "sobol",
+        mc_tolerance: float = MC_TOLERANCE,
     ) -> Dict:
         if hazard_name not in self._CONFIG:
             raise ValueError("Hazard inválido. Use 'wind' ou 'wave'.")
@@ -765,12 +776,20 @@ class ClimadaWindWaveService:
         hist_metrics = hist_result.get("metrics", {}) or {}
         fut_metrics = fut_result.get("metrics", {}) or {}
 
-        hist_yearly = historical.groupby("time.year").mean(skipna=True)
-        fut_yearly = future.groupby("time.year").mean(skipna=True)
-        hist_monthly = historical.groupby("time.month").mean(skipna=True)
-        fut_monthly = future.groupby("time.month").mean(skipna=True)
+        # Cubo de climatologia (médias e quantis mensais) nos períodos padrão; ao vivo nos demais
+        scale = KNOTS_PER_MS if hazard_name == "wind" else 1.0
+        hist_cube = climatology_store.lookup(
+            hazard_name, stat, "historical", lat, lon, hist_start, hist_end, with_quantiles=True
+        )
+        fut_cube = climatology_store.lookup(
+            hazard_name, stat, scenario.lower(), lat, lon, fut_start, fut_end, with_quantiles=True
+        )
+        hist_years, hist_yearly, hist_month_values = yearly_monthly_means(historical, hist_cube, scale)
+        fut_years, fut_yearly, fut_month_values = yearly_monthly_means(future, fut_cube, scale)
 
-        def _monthly_quantiles(da: xr.DataArray) -> Dict[str, List[float]]:
+        def _monthly_quantiles(da: xr.DataArray, cube: Optional[Dict] = None) -> Dict[str, List[float]]:
+            if cube is not None and cube.get("monthly_quantiles") is not None:
+                return quantile_lists(cube["monthly_quantiles"], scale)
             if da.size == 0 or "time" not in da.coords:
                 return {"p50": [None] * 12, "p90": [None] * 12, "p95": [None] * 12, "p99": [None] * 12}
             quantiles = [0.5, 0.9, 0.95, 0.99]
@@ -785,19 +804,8 @@ class ClimadaWindWaveService:
                 out[label] = month_vals
             return out
 
-        hist_monthly_quant = _monthly_quantiles(historical)
-        fut_monthly_quant = _monthly_quantiles(future)
-
-        hist_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(hist_monthly["month"].values), np.asarray(hist_monthly.values))
-            if np.isfinite(value)
-        }
-        fut_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(fut_monthly["month"].values), np.asarray(fut_monthly.values))
-            if np.isfinite(value)
-        }
+        hist_monthly_quant = _monthly_quantiles(historical, hist_cube)
+        fut_monthly_quant = _monthly_quantiles(future, fut_cube)
 
         historical_payload = {
             "samples": int(hist_values[np.isfinite(hist_values)].size),
@@ -841,17 +849,17 @@ class ClimadaWindWaveService:
                 "stop_samples": int(future_payload["stop_samples"] - historical_payload["stop_samples"]),
             },
             "series": {
-                "historical_years": [int(v) for v in np.asarray(hist_yearly["year"].values, dtype=int).tolist()],
-                f"historical_yearly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": [float(v) for v in np.asarray(hist_yearly.values, dtype=float).tolist()],
-                "future_years": [int(v) for v in np.asarray(fut_yearly["year"].values, dtype=int).tolist()],
-                f"future_yearly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": [float(v) for v in np.asarray(fut_yearly.values, dtype=float).tolist()],
+                "historical_years": np.asarray(hist_years, dtype=int),
+                f"historical_yearly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": np.asarray(hist_yearly, dtype=float),
+                "future_years": np.asarray(fut_years, dtype=int),
+                f"future_yearly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": np.asarray(fut_yearly, dtype=float),
                 "monthly_labels": [f"{month:02d}" for month in range(1, 13)],
                 f"historical_monthly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": [hist_month_values.get(month) for month in range(1, 13)],
                 f"future_monthly_{'mean_knots' if hazard_name == 'wind' else 'mean_meters'}": [fut_month_values.get(month) for month in range(1, 13)],
-                "historical_time": historical["time"].values.astype(str).tolist() if "time" in historical.coords else [],
-                "historical_values": hist_values[np.isfinite(hist_values)].astype(float).tolist(),
-                "future_time": future["time"].values.astype(str).tolist() if "time" in future.coords else [],
-                "future_values": fut_values[np.isfinite(fut_values)].astype(float).tolist(),
+                "historical_time": historical["time"].values if "time" in historical.coords else np.array([], dtype="datetime64[ns]"),
+                "historical_values": hist_values[np.isfinite(hist_values)].astype(float),
+                "future_time": future["time"].values if "time" in future.coords else np.array([], dtype="datetime64[ns]"),
+                "future_values": fut_values[np.isfinite(fut_values)].astype(float),
                 "historical_monthly_quantiles": hist_monthly_quant,
                 "future_monthly_quantiles": fut_monthly_quant,
             },
@@ -877,89 +885,42 @@ class ClimadaWindWaveService:
             "petals_enabled": True,
         }
 
-        # Monte Carlo uncertainty using CLIMADA path only
-        mc_runs = 150
-        aal_samples: List[float] = []
-        pml_samples: List[float] = []
-        var_samples: List[float] = []
-        tvar_samples: List[float] = []
-        curve_samples: List[List[float]] = []
-        return_period_axis: List[float] = []
-
-        rng = np.random.default_rng()
-
-        for _ in range(mc_runs):
-            intensity_factor = float(np.clip(rng.lognormal(mean=0.0, sigma=0.1), 0.7, 1.4))
-            freq_factor = float(np.clip(rng.lognormal(mean=0.0, sigma=0.2), 0.3, 3.0))
-            threshold_factor = float(np.clip(rng.normal(loc=1.0, scale=0.1), 0.6, 1.4))
-
-            op_adj = float(operational_max * threshold_factor)
-            att_adj = float(attention_max * threshold_factor)
-            series_adj = future * intensity_factor
-            annual_adj = float(fut_annualization * freq_factor)
-
-            res = self._compute_single_hazard(
-                hazard_name=hazard_name,
-                series=series_adj,
-                lat=lat,
-                lon=lon,
-                asset_value=float(max(asset_value, 1e-6)),
-                annualization=annual_adj,
-                operational_max=op_adj,
-                attention_max=att_adj,
-                hazard_attention_loss_factor=hazard_attention_factor,
-                hazard_stop_loss_factor=hazard_stop_factor,
-                exceedance_method="weibull",
-                risk_quantile=risk_quantile,
-                risk_load_method=risk_load_method,
-                expense_ratio=expense_ratio,
-            )
-
-            pricing_res = res.get("pricing", {}) or {}
-            aal_samples.append(float(pricing_res.get("aal", 0.0)))
-            pml_samples.append(float(pricing_res.get("pml", 0.0)))
-            var_samples.append(float(pricing_res.get("var", 0.0)))
-            tvar_samples.append(float(pricing_res.get("tvar", 0.0)))
-
-            charts = res.get("charts", {}) or {}
-            rp_axis = charts.get("return_period", [])
-            impacts_axis = charts.get("impact", [])
-            if return_period_axis and len(return_period_axis) != len(rp_axis):
-                # Skip inconsistent axes to avoid mixing different shapes
-                continue
-            if not return_period_axis:
-                return_period_axis = list(rp_axis)
-            curve_samples.append([float(v) for v in impacts_axis])
-
-        def _pct(arr: List[float], q: float) -> float:
-            return float(np.nanpercentile(np.asarray(arr, dtype=float), q)) if arr else 0.0
-
-        def _curve_pct(samples: List[List[float]], q: float) -> List[float]:
-            if not samples or not return_period_axis:
-                return []
-            mat = np.asarray(samples, dtype=float)
-            return [float(np.nanpercentile(mat[:, idx], q)) for idx in range(mat.shape[1])]
-
-        response["uncertainty"] = {
-            "parameters": {
-                "intensity_factor": "lognormal mean=0 sigma=0.1 clipped [0.7,1.4]",
-                "frequency_factor": "lognormal mean=0 sigma=0.2 clipped [0.3,3.0]",
-                "threshold_factor": "normal mean=1 sigma=0.1 clipped [0.6,1.4]",
-                "runs": mc_runs,
-            },
-            "future": {
-                "aal": {"p05": _pct(aal_samples, 5), "p50": _pct(aal_samples, 50), "p95": _pct(aal_samples, 95)},
-                "pml": {"p05": _pct(pml_samples, 5), "p50": _pct(pml_samples, 50), "p95": _pct(pml_samples, 95)},
-                "var": {"p05": _pct(var_samples, 5), "p50": _pct(var_samples, 50), "p95": _pct(var_samples, 95)},
-                "tvar": {"p05": _pct(tvar_samples, 5), "p50": _pct(tvar_samples, 50), "p95": _pct(tvar_samples, 95)},
-                "return_period_curve": {
-                    "return_period": return_period_axis,
-                    "p05": _curve_pct(curve_samples, 5),
-                    "p50": _curve_pct(curve_samples, 50),
-                    "p95": _curve_pct(curve_samples, 95),
-                },
-            },
-        }
+        # Incerteza Monte Carlo: lotes de runs avaliados em matriz até convergir; sem semente explícita,
+        # a semente vem do hash das premissas (pedidos iguais -> mesmas faixas)
+        assumptions_hash = climate_risk_kernel.assumptions_hash({
+            "hazard": hazard_name,
+            "lat": float(lat),
+            "lon": float(lon),
+            "scenario": scenario.lower(),
+            "stat": stat,
+            "historical_period": historical_period,
+            "future_period": future_period,
+            "operational_max": float(operational_max),
+            "attention_max": float(attention_max),
+            "asset_value": float(asset_value),
+            "attention_loss_factor": float(hazard_attention_factor),
+            "stop_loss_factor": float(hazard_stop_factor),
+            "risk_quantile": float(risk_quantile),
+            "mc_runs": int(mc_runs),
+            "mc_sampler": mc_sampler,
+            "mc_tolerance": float(mc_tolerance),
+        })
+        seed = int(mc_seed) if mc_seed is not None else int(assumptions_hash[:16], 16)
+        response["uncertainty"] = scenario_uncertainty(
+            fut_values,
+            annualization=fut_annualization,
+            operational_max=operational_max,
+            attention_max=attention_max,
+            attention_loss_factor=hazard_attention_factor,
+            stop_loss_factor=hazard_stop_factor,
+            asset_value=float(max(asset_value, 1e-6)),
+            risk_quantile=risk_quantile,
+            runs=mc_runs,
+            seed=seed,
+            sampler=mc_sampler,
+            tolerance=mc_tolerance,
+        )
+        response["uncertainty"]["parameters"]["assumptions_hash"] = assumptions_hash
 
         if hazard_name == "wind":
             response["meta"]["operational_max_knots"] = float(operational_max)
@@ -968,7 +929,7 @@ class ClimadaWindWaveService:
             response["meta"]["operational_max_meters"] = float(operational_max)
             response["meta"]["attention_max_meters"] = float(attention_max)
 
-        return self._to_serializable(response)
+        return response
 
     def analyze_point(
         self,
@@ -1136,22 +1097,10 @@ class ClimadaWindWaveService:
             expense_ratio=expense_ratio,
         )
 
-        combined_events = np.asarray(combined_impact["at_event"], dtype=float)
-        combined_freq = np.asarray(combined_impact.get("frequency", []), dtype=float)
-        clean_mask = np.isfinite(combined_events)
-        sorted_idx = np.argsort(combined_events[clean_mask])[::-1] if clean_mask.any() else np.array([], dtype=int)
-        sorted_losses = combined_events[clean_mask][sorted_idx]
-        sorted_freq = combined_freq[clean_mask][sorted_idx] if combined_freq.size == combined_events.size else np.zeros_like(sorted_losses)
-        # Frequency-based exceedance: running exceedance probability = 1 - cumulative frequency
-        exceedance = []
-        if sorted_losses.size:
-            cum = np.cumsum(sorted_freq)
-            total = float(np.sum(sorted_freq)) if np.isfinite(sorted_freq).any() else 0.0
-            if total <= 0.0:
-                exceedance = self._exceedance_probs(sorted_losses.size, exceedance_method)
-            else:
-                exceedance = 1.0 - np.clip(cum / total, 0.0, 1.0)
-        exceedance_list = np.asarray(exceedance, dtype=float).tolist() if len(np.atleast_1d(exceedance)) else []
+        distribution = combined_impact.get("distribution") or LossDistribution.from_events(
+            combined_impact["at_event"], combined_impact.get("frequency", [])
+        )
+        sorted_losses, exceedance_probs = distribution.exceedance_curve(exceedance_method)
 
         hazard_labels = list(hazard_out.keys())
         hazard_aal_values = [float(hazard_out[h]["pricing"].get("aal", 0.0)) for h in hazard_labels]
@@ -1173,7 +1122,7 @@ class ClimadaWindWaveService:
             petals_appendix = _safe_float_or_dict(petals_appendix)
 
         response = {
-            "time": aligned[0].time.values.astype(str).tolist() if aligned else [],
+            "time": aligned[0].time.values if aligned else np.array([], dtype="datetime64[ns]"),
             "hazards": {
                 hazard: {
                     **payload["metrics"],
@@ -1211,8 +1160,8 @@ class ClimadaWindWaveService:
                     "impact": combined_impact["impact_curve"],
                 },
                 "loss_exceedance_curve": {
-                    "probability": exceedance_list,
-                    "loss": sorted_losses.tolist(),
+                    "probability": exceedance_probs,
+                    "loss": sorted_losses,
                 },
                 "hazard_aal_bar": {
                     "labels": hazard_labels,
@@ -1243,7 +1192,7 @@ class ClimadaWindWaveService:
             },
         }
 
-        return self._to_serializable(response)
+        return response
 
     def get_oceanpact_series(self, hazard: str, region: str, period: str, lat: float, lon: float):
         """
@@ -1252,8 +1201,7 @@ class ClimadaWindWaveService:
         region: 'campos', 'santos', etc
         period: 'historico', 'preditivo_2015_2030', etc
         """
-        base_dir = "D:/OceanPact/Netcdf"
-        file = find_netcdf_file(base_dir, hazard, period)
+        file = find_netcdf_file(str(BASE_DIR), hazard, period)
         if file:
             import xarray as xr
             ds = xr.open_dataset(file)
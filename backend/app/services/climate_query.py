@@ -0,0 +1,314 @@
+"""Per-query choice of the climate backend that answers with the least I/O.
+
+Every registered ``ClimateDataSource`` describes how it stores a variable
+(``VariableLayout``). For each query the router keeps the sources that hold the
+variable and cover the requested time, estimates the bytes each one would
+decompress for that query shape (chunks touched x chunk size) and runs it on
+the cheapest:
+
+* point series -> time-major layouts (the NetCDF point stores read one chunk
+  per tile for the whole period);
+* snapshots -> map-major layouts (one time step per chunk);
+* region statistics / spatial averages -> the layout touching fewest chunks;
+* climatology (wind rose) -> the precomputed cube, live series as fallback.
+
+Ties keep the registration order (ERA5 Zarr first, then the NetCDF acervo).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .climate_source import ClimateDataSource, VariableLayout
+from .netcdf_reader import netcdf_reader
+from .spatial_aggregation import region_geometry
+from .wind_rose import summarize_wind_rose, wind_rose_cube
+from .zarr_reader import zarr_reader
+
+
+logger = logging.getLogger(__name__)
+
+Candidate = Tuple[ClimateDataSource, VariableLayout]
+
+
+class ClimateQueryRouter:
+    """Encaminha cada consulta ao backend com menor leitura estimada."""
+
+    def __init__(self, sources: Sequence[ClimateDataSource]) -> None:
+        self.sources = list(sources)
+        self._routed: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _candidates(self, variable: str) -> List[Candidate]:
+        candidates = []
+        for source in self.sources:
+            try:
+                layout = source.describe_variable(variable)
+            except Exception as exc:  # backend indisponível (store/arquivos ausentes)
+                logger.debug(f"{source.name} indisponível para {variable}: {exc}")
+                continue
+            if layout is not None:
+                candidates.append((source, layout))
+        return candidates
+
+    def _choose(
+        self,
+        operation: str,
+        candidates: List[Candidate],
+        cost: Callable[[VariableLayout], int],
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        rank: Optional[Callable[[Candidate], Tuple]] = None,
+    ) -> ClimateDataSource:
+        """Fontes que cobrem o período primeiro; entre elas, a de menor custo."""
+        if not candidates:
+            raise ValueError("Nenhum backend de dados climáticos tem essa variável.")
+
+        def key(item: Candidate) -> Tuple:
+            source, layout = item
+            extra = rank(item) if rank is not None else ()
+            return (not layout.covers(start_time, end_time), *extra, cost(layout))
+
+        source, _ = min(candidates, key=key)
+        with self._lock:
+            self._routed[(operation, source.name)] += 1
+        return source
+
+    def _require(self, variable: str) -> List[Candidate]:
+        candidates = self._candidates(variable)
+        if not candidates:
+            raise ValueError(f"Variável '{variable}' não encontrada em nenhum backend.")
+        return candidates
+
+    @staticmethod
+    def _tagged(result: Dict, source: ClimateDataSource) -> Dict:
+        result["source"] = source.name
+        return result
+
+    def get_available_variables(self) -> List[str]:
+        names: Dict[str, None] = {}
+        for source in self.sources:
+            try:
+                names.update(dict.fromkeys(source.get_available_variables()))
+            except Exception as exc:
+                logger.debug(f"{source.name} sem variáveis: {exc}")
+        return list(names)
+
+    def get_time_range(self) -> Tuple[datetime, datetime]:
+        ranges = []
+        for source in self.sources:
+            try:
+                ranges.append(source.get_time_range())
+            except Exception as exc:
+                logger.debug(f"{source.name} sem eixo temporal: {exc}")
+        if not ranges:
+            raise FileNotFoundError("Nenhum backend de dados climáticos disponível.")
+        return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+    def get_spatial_bounds(self) -> Dict[str, float]:
+        boxes = []
+        for source in self.sources:
+            try:
+                boxes.append(source.get_spatial_bounds())
+            except Exception as exc:
+                logger.debug(f"{source.name} sem grade: {exc}")
+        if not boxes:
+            raise FileNotFoundError("Nenhum backend de dados climáticos disponível.")
+        return {
+            "north": max(box["north"] for box in boxes),
+            "south": min(box["south"] for box in boxes),
+            "west": min(box["west"] for box in boxes),
+            "east": max(box["east"] for box in boxes),
+        }
+
+    def get_timeseries_at_point(
+        self,
+        variable: str,
+        lat: float,
+        lon: float,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Dict:
+        source = self._choose(
+            "timeseries",
+            self._require(variable),
+            lambda layout: layout.read_bytes((layout.time_steps(start_time, end_time), 1, 1), point=True),
+            start_time,
+            end_time,
+        )
+        return self._tagged(source.get_timeseries_at_point(variable, lat, lon, start_time, end_time), source)
+
+    def _region_cost(
+        self,
+        start_time: Optional[str],
+        end_time: Optional[str],
+        bounds: Tuple[Optional[float], Optional[float], Optional[float], Optional[float]],
+    ) -> Callable[[VariableLayout], int]:
+        def cost(layout: VariableLayout) -> int:
+            cells = layout.grid_cells(*bounds)
+            return layout.read_bytes((layout.time_steps(start_time, end_time), *cells))
+
+        return cost
+
+    def get_statistics(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        quantiles: Sequence[float] = (),
+        hist_bins: Optional[int] = None,
+    ) -> Dict:
+        source = self._choose(
+            "statistics",
+            self._require(variable),
+            self._region_cost(start_time, end_time, (lat_min, lat_max, lon_min, lon_max)),
+            start_time,
+            end_time,
+        )
+        stats = source.get_statistics(
+            variable, start_time, end_time, lat_min, lat_max, lon_min, lon_max,
+            quantiles=quantiles, hist_bins=hist_bins,
+        )
+        return self._tagged(stats, source)
+
+    def get_spatial_average(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        polygon: Optional[str] = None,
+        feature: Optional[str] = None,
+    ) -> Dict:
+        bounds = (lat_min, lat_max, lon_min, lon_max)
+        region = region_geometry(lat_min, lat_max, lon_min, lon_max, polygon, feature)
+        if region is not None and not region.is_empty:
+            min_lon, min_lat, max_lon, max_lat = region.bounds
+            bounds = (min_lat, max_lat, min_lon, max_lon)
+        source = self._choose(
+            "spatial_average",
+            self._require(variable),
+            self._region_cost(start_time, end_time, bounds),
+            start_time,
+            end_time,
+        )
+        data = source.get_spatial_average(
+            variable, start_time, end_time, lat_min, lat_max, lon_min, lon_max,
+            polygon=polygon, feature=feature,
+        )
+        return self._tagged(data, source)
+
+    def get_grid_snapshot(
+        self,
+        variable: str,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Dict:
+        bounds = (lat_min, lat_max, lon_min, lon_max)
+        source = self._choose(
+            "snapshot",
+            self._require(variable),
+            lambda layout: layout.read_bytes((1, *layout.grid_cells(*bounds))),
+            time,
+            time,
+        )
+        return self._tagged(source.get_grid_snapshot(variable, time, *bounds), source)
+
+    def get_wind_hazard_snapshot(
+        self,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> Dict:
+        """Prefere fontes com direção do vento; entre elas, a de menor leitura (velocidade + direção)."""
+        bounds = (lat_min, lat_max, lon_min, lon_max)
+        candidates: List[Candidate] = []
+        has_direction: Dict[str, bool] = {}
+        for source in self.sources:
+            try:
+                wind = source.wind_hazard_variables()
+                layout = source.describe_variable(wind["speed"]) if wind else None
+            except Exception as exc:
+                logger.debug(f"{source.name} sem vento: {exc}")
+                continue
+            if layout is not None:
+                candidates.append((source, layout))
+                has_direction[source.name] = bool(wind["direction"])
+
+        source = self._choose(
+            "wind_hazard_snapshot",
+            candidates,
+            lambda layout: layout.read_bytes((1, *layout.grid_cells(*bounds))),
+            time,
+            time,
+            rank=lambda item: (not has_direction[item[0].name],),
+        )
+        data = source.get_wind_hazard_snapshot(
+            time=time,
+            lat_min=lat_min,
+            lat_max=lat_max,
+            lon_min=lon_min,
+            lon_max=lon_max,
+            operational_limit_knots=operational_limit_knots,
+            attention_limit_knots=attention_limit_knots,
+        )
+        return self._tagged(data, source)
+
+    def get_wind_rose(
+        self,
+        lat: float,
+        lon: float,
+        months: Optional[Sequence[int]] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> Dict:
+        """Rosa dos ventos do cubo pré-calculado; sem cubo, da série ERA5 ao vivo."""
+        rose = wind_rose_cube.lookup(
+            lat=lat,
+            lon=lon,
+            months=months,
+            operational_limit_knots=operational_limit_knots,
+            attention_limit_knots=attention_limit_knots,
+        )
+        if rose is not None:
+            rose["source"] = "cube"
+        else:
+            fields = zarr_reader.get_wind_fields(lat=lat, lon=lon)
+            speed, direction = fields.speed_knots, fields.direction_deg
+            if months:
+                selected = speed.time.dt.month.isin(list(months)).values
+                speed, direction = speed[selected], direction[selected]
+            rose = summarize_wind_rose(direction.values, speed.values, operational_limit_knots, attention_limit_knots)
+            rose["source"] = "live"
+        with self._lock:
+            self._routed[("wind_rose", rose["source"])] += 1
+        return rose
+
+    def stats(self) -> Dict:
+        with self._lock:
+            routed = dict(self._routed)
+        by_operation: Dict[str, Dict[str, int]] = {}
+        for (operation, source), count in sorted(routed.items()):
+            by_operation.setdefault(operation, {})[source] = int(count)
+        return {"sources": [source.name for source in self.sources], "routed": by_operation}
+
+
+climate_query = ClimateQueryRouter([zarr_reader, netcdf_reader])
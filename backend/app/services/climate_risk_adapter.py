@@ -5,6 +5,7 @@ from typing import Dict, List, Optional, Tuple
 import numpy as np
 
 from .climada_wind_wave_service import climada_wind_wave_service
+from .uncertainty import MC_DEFAULT_RUNS, MC_TOLERANCE
 
 
 class ClimateRiskAdapter:
@@ -41,6 +42,10 @@ class ClimateRiskAdapter:
         risk_quantile: float = 0.95,
         risk_load_method: str = "none",
         expense_ratio: float = 0.15,
+        mc_runs: int = MC_DEFAULT_RUNS,
+        mc_seed: Optional[int] = None,
+        mc_sampler: str = "sobol",
+        mc_tolerance: float = MC_TOLERANCE,
     ) -> Dict:
         scenario_id = self._SCENARIO_MAP.get(ssp_scenario, "ssp585")
         hazard_changes: Dict[str, Dict] = {}
@@ -73,6 +78,10 @@ class ClimateRiskAdapter:
                     risk_quantile=risk_quantile,
                     risk_load_method=risk_load_method,
                     expense_ratio=expense_ratio,
+                    mc_runs=mc_runs,
+                    mc_seed=mc_seed,
+                    mc_sampler=mc_sampler,
+                    mc_tolerance=mc_tolerance,
                 )
             except Exception as exc:
                 import logging
@@ -170,6 +179,10 @@ class ClimateRiskAdapter:
         risk_quantile: float = 0.95,
         risk_load_method: str = "none",
         expense_ratio: float = 0.15,
+        mc_runs: int = MC_DEFAULT_RUNS,
+        mc_seed: Optional[int] = None,
+        mc_sampler: str = "sobol",
+        mc_tolerance: float = MC_TOLERANCE,
     ) -> Dict:
         scenario_delta = self.compute_scenario_change_percent(
             lat=lat,
@@ -185,6 +198,10 @@ class ClimateRiskAdapter:
             risk_quantile=risk_quantile,
             risk_load_method=risk_load_method,
             expense_ratio=expense_ratio,
+            mc_runs=mc_runs,
+            mc_seed=mc_seed,
+            mc_sampler=mc_sampler,
+            mc_tolerance=mc_tolerance,
         )
 
         factor = max(0.0, 1.0 + scenario_delta["change_percent"] / 100.0)
@@ -20,6 +20,11 @@ class ClimateRiskKernel:
     def _serialize_for_hash(payload: Dict[str, Any]) -> str:
         return json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
 
+    @classmethod
+    def assumptions_hash(cls, assumptions: Dict[str, Any]) -> str:
+        serialized = cls._serialize_for_hash(assumptions)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
     def build_traceability(
         self,
         *,
@@ -27,8 +32,7 @@ class ClimateRiskKernel:
         assumptions: Dict[str, Any],
     ) -> Dict[str, Any]:
         now = datetime.now(timezone.utc)
-        serialized = self._serialize_for_hash(assumptions)
-        assumptions_hash = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        assumptions_hash = self.assumptions_hash(assumptions)
 
         return {
             "run_id": str(uuid4()),
@@ -0,0 +1,174 @@
+"""Common interface of the climate data backends (NetCDF acervo and ERA5 Zarr).
+
+``ClimateDataSource`` is the set of queries the ``climate_data`` API needs;
+``NetcdfReader`` and ``ZarrDataReader`` both implement it. Each backend also
+describes how a variable is stored (``VariableLayout``: coverage, shape and the
+chunk shape read for point series and for maps), which is what
+``climate_query`` uses to send every query to the backend that reads the
+fewest bytes for it.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class VariableLayout:
+    """Cobertura e chunks (tempo, lat, lon) de uma variável em um backend."""
+
+    variable: str
+    time_start: np.datetime64
+    time_end: np.datetime64
+    shape: Tuple[int, int, int]
+    map_chunks: Tuple[int, int, int]
+    point_chunks: Tuple[int, int, int]
+    itemsize: int
+    bounds: Dict[str, float]
+
+    def covers(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> bool:
+        """True se a janela [start_time, end_time] intercepta a cobertura temporal."""
+        start = parse_time(start_time) if start_time else self.time_start
+        end = parse_time(end_time) if end_time else self.time_end
+        return bool(start <= self.time_end and end >= self.time_start)
+
+    def time_steps(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> int:
+        """Passos de tempo aproximados na janela (proporcional à fração coberta)."""
+        total = self.shape[0]
+        span = (self.time_end - self.time_start) / np.timedelta64(1, "s")
+        if span <= 0:
+            return total
+        start = max(parse_time(start_time), self.time_start) if start_time else self.time_start
+        end = min(parse_time(end_time), self.time_end) if end_time else self.time_end
+        fraction = ((end - start) / np.timedelta64(1, "s")) / span
+        return int(min(max(math.ceil(total * fraction), 1), total))
+
+    def grid_cells(
+        self,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Tuple[int, int]:
+        """Células (lat, lon) aproximadas do bbox pedido dentro da grade."""
+
+        def count(size: int, low: float, high: float, req_low: Optional[float], req_high: Optional[float]) -> int:
+            if high <= low:
+                return size
+            lo = low if req_low is None else min(max(req_low, low), high)
+            hi = high if req_high is None else min(max(req_high, low), high)
+            return int(min(max(math.ceil(size * (hi - lo) / (high - low)), 1), size))
+
+        return (
+            count(self.shape[1], self.bounds["south"], self.bounds["north"], lat_min, lat_max),
+            count(self.shape[2], self.bounds["west"], self.bounds["east"], lon_min, lon_max),
+        )
+
+    def read_bytes(self, extent: Tuple[int, int, int], point: bool = False) -> int:
+        """Bytes descomprimidos lidos para um recorte (tempo, lat, lon): chunks tocados x tamanho do chunk."""
+        chunks = self.point_chunks if point else self.map_chunks
+        count = 1
+        for size, chunk in zip(extent, chunks):
+            count *= math.ceil(max(size, 1) / max(chunk, 1))
+        return int(count * chunks[0] * chunks[1] * chunks[2] * self.itemsize)
+
+
+def parse_time(value) -> np.datetime64:
+    """Instante ISO (ou datetime/cftime) como ``datetime64[s]``.
+
+    Datas que só existem em calendários CMIP (30 de fevereiro em ``360_day``)
+    caem no último dia válido do mês.
+    """
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[s]")
+    text = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    text = text.split("+")[0].rstrip("Z")
+    try:
+        return np.datetime64(text, "s")
+    except ValueError:
+        month = np.datetime64(text[:7], "M")
+        return ((month + 1).astype("datetime64[D]") - 1).astype("datetime64[s]")
+
+
+def to_datetime(value: np.datetime64) -> datetime:
+    return np.datetime64(value, "s").astype(datetime)
+
+
+@runtime_checkable
+class ClimateDataSource(Protocol):
+    """Consultas que todo backend de dados climáticos responde."""
+
+    name: str
+
+    def get_available_variables(self) -> List[str]: ...
+
+    def get_time_range(self) -> Tuple[datetime, datetime]: ...
+
+    def get_spatial_bounds(self) -> Dict[str, float]: ...
+
+    def describe_variable(self, variable: str) -> Optional[VariableLayout]: ...
+
+    def wind_hazard_variables(self) -> Optional[Dict]:
+        """``{"speed": variável, "direction": bool}`` lido pelo snapshot de vento; ``None`` sem vento."""
+        ...
+
+    def get_timeseries_at_point(
+        self,
+        variable: str,
+        lat: float,
+        lon: float,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Dict: ...
+
+    def get_statistics(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        quantiles: Sequence[float] = (),
+        hist_bins: Optional[int] = None,
+    ) -> Dict: ...
+
+    def get_spatial_average(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        polygon: Optional[str] = None,
+        feature: Optional[str] = None,
+    ) -> Dict: ...
+
+    def get_grid_snapshot(
+        self,
+        variable: str,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Dict: ...
+
+    def get_wind_hazard_snapshot(
+        self,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> Dict: ...
@@ -0,0 +1,392 @@
+"""Per-cell climatology cube precomputed offline for the scenario comparison endpoints.
+
+For every hazard/stat/source (``historical`` or a scenario such as ``ssp585``)
+the cube stores, per grid cell, the sum and count of valid samples for each
+(year, month). Yearly and monthly means for any period are then exact ratios of
+those sums, without touching the raw series. Monthly p50/p90/p95/p99, the
+period p90/p95/max and the number of samples at or above the default status
+thresholds depend on the full sample set, so they are stored only for the
+standard periods; other periods fall back to live computation.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import xarray as xr
+
+from .netcdf_catalog import BASE_DIR
+from .netcdf_handles import file_signature
+from .netcdf_index import AxisIndex
+from .wind_derived import KNOTS_PER_MS
+
+try:
+    from numcodecs import Blosc  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    Blosc = None
+
+
+CLIMATOLOGY_DIR = Path(os.environ.get("NETCDF_CLIMATOLOGY_DIR", str(BASE_DIR / "climatology")))
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+QUANTILE_LABELS = ("p50", "p90", "p95", "p99")
+# Períodos padrão das telas de comparação (histórico x futuro)
+STANDARD_PERIODS = {
+    "historical": ("1985-2014",),
+    "future": ("2035-2064",),
+}
+# Resumo do período inteiro (quantis lineares; 1.0 = máximo)
+SUMMARY_QUANTILES = (0.9, 0.95, 1.0)
+SUMMARY_LABELS = ("p90", "p95", "max")
+# Limites operacional/atenção padrão das comparações, em nós (vento) e metros (onda)
+STATUS_THRESHOLDS = {"wind": (15.0, 20.0), "wave": (2.0, 4.0)}
+DISPLAY_SCALE = {"wind": KNOTS_PER_MS, "wave": 1.0}
+VARIABLE_CANDIDATES = ("sfcWindmax_corr", "sfcWindmax", "sfcWind_corr", "sfcWind", "hs")
+
+
+def climatology_path(hazard: str, stat: str, source: str, store_dir: Path = CLIMATOLOGY_DIR) -> Path:
+    return Path(store_dir) / f"{hazard}_{stat}_{source.lower()}.zarr"
+
+
+def _year_month(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(times)
+    if np.issubdtype(values.dtype, np.datetime64):
+        months_since_epoch = values.astype("datetime64[M]").astype(int)
+        return months_since_epoch // 12 + 1970, months_since_epoch % 12 + 1
+    years = np.fromiter((item.year for item in values), dtype=int, count=values.size)
+    months = np.fromiter((item.month for item in values), dtype=int, count=values.size)
+    return years, months
+
+
+def _period_years(period: str) -> Tuple[int, int]:
+    start, end = (int(part) for part in period.split("-"))
+    return start, end
+
+
+def build_climatology(
+    reader,
+    hazard: str,
+    stat: str,
+    source: str,
+    store_path: Path,
+    *,
+    periods: Sequence[str] = (),
+    max_memory_mb: int = 1024,
+    tile: int = 8,
+    thresholds: Optional[Sequence[float]] = None,
+) -> Dict[str, object]:
+    """Calcula o cubo de um hazard/stat/fonte a partir dos NetCDFs (ou point stores) do ``reader``.
+
+    ``thresholds`` (unidades de exibição, padrão ``STATUS_THRESHOLDS``) são os limites
+    cujas contagens de amostras ``>=`` ficam gravadas por período padrão.
+    """
+    from .netcdf_timeline import VirtualTimeline
+
+    sources = reader.source_indexes(hazard, stat, source)
+    if not sources:
+        raise FileNotFoundError(f"Nenhum arquivo encontrado para {hazard}/{stat}/{source}.")
+    paths = [path for path, _ in sources]
+    ranges = VirtualTimeline.build(f"{hazard}/{stat}/{source}", sources).resolve()
+
+    with reader.read_source(paths[0]) as handle:
+        first_ds = handle.dataset
+        var_name = next((name for name in VARIABLE_CANDIDATES if name in first_ds.data_vars), None)
+        if var_name is None:
+            var_name = list(first_ds.data_vars)[0]
+        units = str(first_ds[var_name].attrs.get("units", ""))
+    index = sources[0][1]
+    lat_values = np.asarray(index.lat.values)
+    lon_values = np.asarray(index.lon.values)
+    nlat, nlon = lat_values.size, lon_values.size
+
+    time_blocks = []
+    for path, rows in ranges:
+        with reader.read_source(path) as handle:
+            time_blocks.append(np.asarray(handle.dataset[handle.index.time_name].values[rows]))
+    times = np.concatenate(time_blocks)
+    years, months = _year_month(times)
+    year_values = np.arange(int(years.min()), int(years.max()) + 1)
+    keys = (years - year_values[0]) * 12 + (months - 1)
+    if np.any(np.diff(keys) < 0):
+        raise ValueError(f"Eixo temporal fora de ordem em {hazard}/{stat}/{source}.")
+    group_starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+    group_keys = keys[group_starts]
+
+    month_sum = np.zeros((year_values.size, 12, nlat, nlon), dtype=np.float64)
+    month_count = np.zeros((year_values.size, 12, nlat, nlon), dtype=np.int32)
+    quantile_periods = [period for period in periods if str(period).strip()]
+    monthly_quantile = np.full((len(quantile_periods), len(QUANTILES), 12, nlat, nlon), np.nan, dtype=np.float32)
+    threshold_values = np.asarray(
+        STATUS_THRESHOLDS.get(hazard, ()) if thresholds is None else thresholds, dtype=np.float64
+    )
+    display_scale = float(DISPLAY_SCALE.get(hazard, 1.0))
+    period_summary = np.full((len(quantile_periods), len(SUMMARY_QUANTILES), nlat, nlon), np.nan, dtype=np.float64)
+    period_exceedance = np.zeros((len(quantile_periods), threshold_values.size, nlat, nlon), dtype=np.int32)
+
+    # Faixas de latitude que cabem no orçamento de memória (valores + máscara + cópia)
+    band = max(1, int(max_memory_mb * 1024 * 1024 // max(times.size * nlon * 8 * 3, 1)))
+    if band >= tile:
+        band -= band % tile
+    for lat_start in range(0, nlat, band):
+        lat_slice = slice(lat_start, min(lat_start + band, nlat))
+        blocks = []
+        for path, rows in ranges:
+            with reader.read_source(path) as handle:
+                da = handle.dataset[var_name]
+                block = da.isel({handle.index.time_name: rows, handle.index.lat_name: lat_slice})
+                block = block.transpose(handle.index.time_name, handle.index.lat_name, handle.index.lon_name)
+                blocks.append(np.asarray(block.values, dtype=np.float64))
+        values = np.concatenate(blocks, axis=0)
+        finite = np.isfinite(values)
+
+        sums = np.add.reduceat(np.where(finite, values, 0.0), group_starts, axis=0)
+        counts = np.add.reduceat(finite.astype(np.int32), group_starts, axis=0)
+        month_sum[group_keys // 12, group_keys % 12, lat_slice] = sums
+        month_count[group_keys // 12, group_keys % 12, lat_slice] = counts
+
+        for p_idx, period in enumerate(quantile_periods):
+            start_year, end_year = _period_years(period)
+            in_period = (years >= start_year) & (years <= end_year)
+            if np.any(in_period):
+                selected_values = values[in_period]
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    period_summary[p_idx, :, lat_slice] = np.nanquantile(selected_values, SUMMARY_QUANTILES, axis=0)
+                scaled = selected_values * display_scale
+                for t_idx, threshold in enumerate(threshold_values):
+                    period_exceedance[p_idx, t_idx, lat_slice] = np.sum(scaled >= threshold, axis=0)
+            for month in range(1, 13):
+                selected = in_period & (months == month)
+                if not np.any(selected):
+                    continue
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    monthly_quantile[p_idx, :, month - 1, lat_slice] = np.nanquantile(
+                        values[selected], QUANTILES, axis=0
+                    )
+
+    cube = xr.Dataset(
+        {
+            "month_sum": (("year", "month", "lat", "lon"), month_sum),
+            "month_count": (("year", "month", "lat", "lon"), month_count),
+            "monthly_quantile": (("period", "quantile", "month", "lat", "lon"), monthly_quantile),
+            "period_summary": (("period", "summary", "lat", "lon"), period_summary),
+            "period_exceedance": (("period", "threshold", "lat", "lon"), period_exceedance),
+        },
+        coords={
+            "year": year_values,
+            "month": np.arange(1, 13),
+            "lat": lat_values,
+            "lon": lon_values,
+            "period": np.asarray(quantile_periods, dtype=str),
+            "quantile": np.asarray(QUANTILES),
+            "summary": np.asarray(SUMMARY_LABELS, dtype=str),
+            "threshold": threshold_values,
+        },
+        attrs={
+            "hazard": hazard,
+            "stat": stat,
+            "source": source,
+            "variable": var_name,
+            "units": units,
+            "display_scale": display_scale,
+            "sources": json.dumps(
+                [{"path": str(path), "signature": list(file_signature(path))} for path in paths]
+            ),
+        },
+    )
+
+    tile_lat, tile_lon = min(tile, nlat), min(tile, nlon)
+    encoding: Dict[str, Dict] = {
+        "month_sum": {"chunks": (year_values.size, 12, tile_lat, tile_lon)},
+        "month_count": {"chunks": (year_values.size, 12, tile_lat, tile_lon)},
+        "monthly_quantile": {"chunks": (max(len(quantile_periods), 1), len(QUANTILES), 12, tile_lat, tile_lon)},
+        "period_summary": {"chunks": (max(len(quantile_periods), 1), len(SUMMARY_QUANTILES), tile_lat, tile_lon)},
+        "period_exceedance": {"chunks": (max(len(quantile_periods), 1), max(threshold_values.size, 1), tile_lat, tile_lon)},
+    }
+    if Blosc is not None:
+        for name in encoding:
+            encoding[name]["compressor"] = Blosc(cname="zstd", clevel=5, shuffle=Blosc.BITSHUFFLE)
+
+    store_path = Path(store_path)
+    tmp_path = store_path.with_name(store_path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    cube.to_zarr(str(tmp_path), mode="w", encoding=encoding, consolidated=True)
+    if store_path.exists():
+        shutil.rmtree(store_path)
+    tmp_path.rename(store_path)
+    return {
+        "store": str(store_path),
+        "variable": var_name,
+        "years": [int(year_values[0]), int(year_values[-1])],
+        "periods": quantile_periods,
+        "thresholds": threshold_values.tolist(),
+    }
+
+
+class ClimatologyStore:
+    """Leitura dos cubos por célula; ``None`` quando o cubo não existe, está desatualizado ou não cobre o pedido."""
+
+    def __init__(self, store_dir: Path = CLIMATOLOGY_DIR) -> None:
+        self.store_dir = Path(store_dir)
+        self._cubes: Dict[Path, Tuple[float, Optional[xr.Dataset], Optional[Tuple[AxisIndex, AxisIndex]]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_current(cube: xr.Dataset) -> bool:
+        try:
+            sources = json.loads(cube.attrs.get("sources", "[]"))
+            return bool(sources) and all(
+                tuple(file_signature(Path(item["path"]))) == tuple(item["signature"]) for item in sources
+            )
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def _open(self, path: Path) -> Tuple[Optional[xr.Dataset], Optional[Tuple[AxisIndex, AxisIndex]]]:
+        try:
+            mtime = (path / ".zmetadata").stat().st_mtime
+        except OSError:
+            return None, None
+        with self._lock:
+            cached = self._cubes.get(path)
+            if cached is None or cached[0] != mtime:
+                cube = xr.open_zarr(str(path), consolidated=True, chunks=None)
+                axes = (AxisIndex.build("lat", cube["lat"].values), AxisIndex.build("lon", cube["lon"].values))
+                cached = (mtime, cube, axes)
+                self._cubes[path] = cached
+        cube = cached[1]
+        if cube is None or not self._is_current(cube):
+            return None, None
+        return cube, cached[2]
+
+    def lookup(
+        self,
+        hazard: str,
+        stat: str,
+        source: str,
+        lat: float,
+        lon: float,
+        start_year: int,
+        end_year: int,
+        with_quantiles: bool = False,
+        thresholds: Optional[Sequence[float]] = None,
+    ) -> Optional[Dict[str, object]]:
+        """Médias anuais/mensais da célula mais próxima, em unidades do arquivo.
+
+        ``monthly_quantiles`` só é preenchido se pedido e se o período for um dos gravados.
+        Com ``thresholds`` (unidades de exibição), ``summary`` traz amostras, média, p90/p95/máx
+        do período e as contagens ``>=`` de cada limite, se o período e os limites estiverem
+        gravados no cubo; senão fica ``None``.
+        """
+        cube, axes = self._open(climatology_path(hazard, stat, source, self.store_dir))
+        if cube is None or axes is None:
+            return None
+        years = np.asarray(cube["year"].values)
+        # Antes do início do cubo a série ao vivo pode vir de outros arquivos
+        if years.size == 0 or start_year < int(years[0]):
+            return None
+
+        period = f"{int(start_year)}-{int(end_year)}"
+        periods = [str(item) for item in np.asarray(cube["period"].values).tolist()]
+
+        lat_idx = int(axes[0].nearest(np.array([lat]))[0])
+        lon_idx = int(axes[1].nearest(np.array([lon]))[0])
+        year_mask = (years >= start_year) & (years <= end_year)
+        cell = {"lat": lat_idx, "lon": lon_idx}
+        sums = np.asarray(cube["month_sum"].isel(cell).values)[year_mask]
+        counts = np.asarray(cube["month_count"].isel(cell).values)[year_mask]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            yearly_mean = sums.sum(axis=1) / counts.sum(axis=1)
+            monthly_mean = sums.sum(axis=0) / counts.sum(axis=0)
+
+        result: Dict[str, object] = {
+            "years": years[year_mask],
+            "yearly_mean": yearly_mean,
+            "monthly_mean": monthly_mean,
+            "monthly_quantiles": None,
+        }
+        # Quantis só existem para os períodos padrão gravados no cubo
+        if with_quantiles and period in periods:
+            quantiles = np.asarray(cube["monthly_quantile"].isel({**cell, "period": periods.index(period)}).values)
+            result["monthly_quantiles"] = {
+                label: quantiles[q_idx] for q_idx, label in enumerate(QUANTILE_LABELS)
+            }
+        result["summary"] = None
+        if thresholds is not None and period in periods:
+            result["summary"] = self._period_summary(cube, cell, periods.index(period), sums, counts, thresholds)
+        return result
+
+    @staticmethod
+    def _period_summary(
+        cube: xr.Dataset,
+        cell: Dict[str, int],
+        period_idx: int,
+        sums: np.ndarray,
+        counts: np.ndarray,
+        thresholds: Sequence[float],
+    ) -> Optional[Dict[str, object]]:
+        # Cubos anteriores ao resumo por período não têm estas variáveis
+        if "period_summary" not in cube.data_vars or "period_exceedance" not in cube.data_vars:
+            return None
+        stored = np.asarray(cube["threshold"].values, dtype=float)
+        positions = []
+        for threshold in thresholds:
+            match = np.flatnonzero(np.isclose(stored, float(threshold), rtol=1e-9, atol=0.0))
+            if match.size == 0:
+                return None
+            positions.append(int(match[0]))
+        samples = int(counts.sum())
+        summary = np.asarray(cube["period_summary"].isel({**cell, "period": period_idx}).values, dtype=float)
+        exceedance = np.asarray(cube["period_exceedance"].isel({**cell, "period": period_idx}).values)
+        return {
+            "samples": samples,
+            "mean": float(sums.sum() / samples) if samples else 0.0,
+            **{label: float(summary[idx]) for idx, label in enumerate(SUMMARY_LABELS)},
+            "exceedance": [int(exceedance[pos]) for pos in positions],
+        }
+
+
+def yearly_monthly_means(
+    series: xr.DataArray,
+    cube: Optional[Dict[str, object]],
+    cube_scale: float = 1.0,
+) -> Tuple[np.ndarray, np.ndarray, Dict[int, float]]:
+    """(anos, média anual, {mês: média}) do cubo quando disponível, senão calculados da série.
+
+    ``cube_scale`` converte as unidades do arquivo para as da série (ex.: m/s -> nós).
+    """
+    if cube is not None:
+        years = np.asarray(cube["years"], dtype=int)
+        yearly = np.asarray(cube["yearly_mean"], dtype=float) * cube_scale
+        monthly = np.asarray(cube["monthly_mean"], dtype=float) * cube_scale
+        month_values = {month: float(monthly[month - 1]) for month in range(1, 13) if np.isfinite(monthly[month - 1])}
+        return years, yearly, month_values
+
+    yearly_da = series.groupby("time.year").mean(skipna=True)
+    monthly_da = series.groupby("time.month").mean(skipna=True)
+    month_values = {
+        int(month): float(value)
+        for month, value in zip(np.asarray(monthly_da["month"].values), np.asarray(monthly_da.values))
+        if np.isfinite(value)
+    }
+    return np.asarray(yearly_da["year"].values, dtype=int), np.asarray(yearly_da.values, dtype=float), month_values
+
+
+def quantile_lists(quantiles: Dict[str, np.ndarray], scale: float = 1.0) -> Dict[str, List[Optional[float]]]:
+    """Formato das respostas: 12 valores por quantil, ``None`` onde não há dado."""
+    return {
+        label: [float(value) * scale if np.isfinite(value) else None for value in np.asarray(values)]
+        for label, values in quantiles.items()
+    }
+
+
+climatology_store = ClimatologyStore()
@@ -0,0 +1,154 @@
+"""Optional managed dask ``LocalCluster`` for heavy region/grid computations.
+
+Started from the FastAPI ``lifespan`` hook when ``DASK_CLUSTER=1``. Workers are
+separate processes with their own memory limit and spill-to-disk directory,
+so large reductions (region statistics, polygon averages, full-grid
+aggregations) use every core without holding the GIL of the API process.
+``compute`` sends a lazy object to the cluster only when it is large enough
+(``DASK_CLUSTER_MIN_MB``); small selections and the no-cluster case keep
+using dask's local threaded scheduler.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import dask
+
+try:
+    from distributed import Client, LocalCluster
+except ImportError:  # pragma: no cover - optional dependency
+    Client = None
+    LocalCluster = None
+
+
+logger = logging.getLogger(__name__)
+
+DASK_CLUSTER_ENABLED = os.getenv("DASK_CLUSTER", "0").strip().lower() in {"1", "true", "yes"}
+DASK_N_WORKERS = int(os.getenv("DASK_N_WORKERS", "0")) or None
+DASK_THREADS_PER_WORKER = int(os.getenv("DASK_THREADS_PER_WORKER", "2"))
+DASK_MEMORY_LIMIT = os.getenv("DASK_MEMORY_LIMIT", "4GB")
+DASK_SPILL_DIR = os.getenv("DASK_SPILL_DIR", "") or None
+DASK_DASHBOARD_ADDRESS = os.getenv("DASK_DASHBOARD_ADDRESS", "") or None
+DASK_CLUSTER_MIN_MB = float(os.getenv("DASK_CLUSTER_MIN_MB", "64"))
+
+# Frações do memory_limit: começa a gravar em disco em 60-70%, pausa em 85%.
+WORKER_MEMORY_CONFIG = {
+    "distributed.worker.memory.target": 0.6,
+    "distributed.worker.memory.spill": 0.7,
+    "distributed.worker.memory.pause": 0.85,
+    "distributed.worker.memory.terminate": 0.95,
+}
+
+
+def _nbytes(objs: Tuple[Any, ...]) -> int:
+    total = 0
+    for obj in objs:
+        total += int(getattr(obj, "nbytes", 0) or 0)
+    return total
+
+
+class ComputeCluster:
+    """Cluster local opcional; ``compute`` cai no scheduler threaded quando ele não está ativo."""
+
+    def __init__(
+        self,
+        enabled: bool = DASK_CLUSTER_ENABLED,
+        n_workers: Optional[int] = DASK_N_WORKERS,
+        threads_per_worker: int = DASK_THREADS_PER_WORKER,
+        memory_limit: str = DASK_MEMORY_LIMIT,
+        spill_dir: Optional[str] = DASK_SPILL_DIR,
+        dashboard_address: Optional[str] = DASK_DASHBOARD_ADDRESS,
+        min_mb: float = DASK_CLUSTER_MIN_MB,
+    ) -> None:
+        self.enabled = enabled
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.dashboard_address = dashboard_address
+        self.min_bytes = int(min_mb * 1024 * 1024)
+        self._cluster = None
+        self._client = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.local = 0
+
+    @property
+    def client(self):
+        return self._client
+
+    def start(self) -> Dict:
+        """Sobe o cluster (idempotente); sem ``distributed`` instalado só registra o aviso."""
+        with self._lock:
+            if not self.enabled or self._client is not None:
+                return self.stats()
+            if LocalCluster is None:
+                logger.warning("DASK_CLUSTER=1 mas o pacote distributed não está instalado; usando o scheduler local.")
+                return self.stats()
+
+            with dask.config.set(WORKER_MEMORY_CONFIG):
+                self._cluster = LocalCluster(
+                    n_workers=self.n_workers,
+                    threads_per_worker=self.threads_per_worker,
+                    processes=True,
+                    memory_limit=self.memory_limit,
+                    local_directory=self.spill_dir,
+                    dashboard_address=self.dashboard_address,
+                )
+            # Não vira o scheduler global: só o que passa por ``compute`` vai para o cluster.
+            self._client = Client(self._cluster, set_as_default=False)
+            return self.stats()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            if self._cluster is not None:
+                self._cluster.close()
+            self._client = None
+            self._cluster = None
+
+    def compute(self, *objs: Any, nbytes: Optional[int] = None):
+        """``dask.compute`` no cluster quando o cálculo é grande; senão no scheduler local.
+
+        ``nbytes`` é o volume lido pelo grafo (necessário para objetos ``delayed``).
+        """
+        client = self._client
+        size = _nbytes(objs) if nbytes is None else int(nbytes)
+        if client is not None and size >= self.min_bytes:
+            with self._lock:
+                self.submitted += 1
+            return dask.compute(*objs, scheduler=client)
+        with self._lock:
+            self.local += 1
+        return dask.compute(*objs)
+
+    def stats(self) -> Dict:
+        client = self._client
+        workers = {}
+        if client is not None:
+            try:
+                info = client.scheduler_info()
+                workers = {
+                    "count": len(info.get("workers", {})),
+                    "threads": sum(worker.get("nthreads", 0) for worker in info.get("workers", {}).values()),
+                }
+            except Exception:  # pragma: no cover - scheduler unreachable
+                workers = {}
+        return {
+            "enabled": bool(self.enabled),
+            "running": client is not None,
+            "dashboard": getattr(client, "dashboard_link", None) if client is not None else None,
+            "workers": workers,
+            "memory_limit": self.memory_limit,
+            "min_mb": self.min_bytes / (1024 * 1024),
+            "submitted": int(self.submitted),
+            "local": int(self.local),
+        }
+
+
+compute_cluster = ComputeCluster()
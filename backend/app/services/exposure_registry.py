@@ -0,0 +1,395 @@
+"""In-memory registry of the exposure shapefiles served under ``frontend/public/data``.
+
+Every layer (blocos exploratórios, campos de produção, Santos, bounding box...)
+is read once, reprojected to EPSG:4326 and kept with everything the exposure
+reference needs that does not depend on the queried point: the feature union,
+its boundary coordinates, Web Mercator geometries, an ``STRtree`` over them,
+the exposure points and the density raster. A request only picks the nearest
+layer and runs a nearest-neighbour query on its tree.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import Point
+from shapely.ops import unary_union
+from shapely.strtree import STRtree
+
+try:
+    import geopandas as gpd
+except ImportError:  # pragma: no cover - optional dependency
+    gpd = None
+
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_ROOT = Path(__file__).resolve().parents[3]
+EXPOSURE_DATA_DIR = Path(os.environ.get("EXPOSURE_DATA_DIR", str(WORKSPACE_ROOT / "frontend" / "public" / "data")))
+
+MAX_FEATURES = 800
+# Colunas com o nome da feição (mesmos candidatos do tooltip do mapa).
+NAME_FIELDS = ("NOME", "NOME_CAMPO", "NM_CAMPO", "CAMPO", "BLOCO", "NOME_BLOCO", "NM_BLOCO", "SIGLA", "NOMECAMPO", "NOMEBLOCO")
+INTERIOR_SAMPLE_POINTS = 220
+RASTER_BINS = 12
+SAMPLE_SEED = 42
+WEB_MERCATOR_RADIUS = 6378137.0
+
+
+def to_web_mercator(lon, lat):
+    """EPSG:4326 -> EPSG:3857 (esfera de Web Mercator, mesma fórmula do PROJ)."""
+    lon = np.asarray(lon, dtype=float)
+    lat = np.clip(np.asarray(lat, dtype=float), -85.06, 85.06)
+    x = WEB_MERCATOR_RADIUS * np.radians(lon)
+    y = WEB_MERCATOR_RADIUS * np.log(np.tan(np.pi / 4.0 + np.radians(lat) / 2.0))
+    return x, y
+
+
+def _project_coords(coords: np.ndarray) -> np.ndarray:
+    x, y = to_web_mercator(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y])
+
+
+def polygon_exterior_coords(geom) -> Tuple[List[float], List[float]]:
+    """Anel externo do maior polígono da geometria (lon, lat)."""
+    if geom is None or geom.is_empty:
+        return [], []
+
+    polygon = None
+    if geom.geom_type == "Polygon":
+        polygon = geom
+    elif geom.geom_type == "MultiPolygon":
+        polygon = max(list(geom.geoms), key=lambda item: item.area, default=None)
+
+    if polygon is None or polygon.exterior is None:
+        return [], []
+
+    coords = np.asarray(polygon.exterior.coords, dtype=float)
+    return coords[:, 0].tolist(), coords[:, 1].tolist()
+
+
+def sample_points_inside_geometry(
+    geometry, n_points: int = INTERIOR_SAMPLE_POINTS, seed: int = SAMPLE_SEED
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Até ``n_points`` pontos uniformes dentro da geometria (determinístico por geometria/seed)."""
+    if geometry is None or geometry.is_empty:
+        return np.array([], dtype=float), np.array([], dtype=float)
+    sampled_lon, sampled_lat = _sample_points_cached(geometry, int(n_points), int(seed))
+    return sampled_lon.copy(), sampled_lat.copy()
+
+
+@functools.lru_cache(maxsize=64)
+def _sample_points_cached(geometry, n_points: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    min_lon, min_lat, max_lon, max_lat = geometry.bounds
+    if not np.isfinite([min_lon, min_lat, max_lon, max_lat]).all():
+        return np.array([], dtype=float), np.array([], dtype=float)
+
+    rng = np.random.default_rng(seed)
+    shapely.prepare(geometry)
+    bbox_area = (max_lon - min_lon) * (max_lat - min_lat)
+    fill_ratio = geometry.area / bbox_area if bbox_area > 0 else 1.0
+    fill_ratio = min(max(fill_ratio, 0.01), 1.0)
+
+    lon_blocks: List[np.ndarray] = []
+    lat_blocks: List[np.ndarray] = []
+    accepted = 0
+    attempts = 0
+    max_attempts = n_points * 60
+    while accepted < n_points and attempts < max_attempts:
+        # Sobreamostra pelo inverso da fração do bbox ocupada pela geometria.
+        block = int(np.ceil((n_points - accepted) / fill_ratio * 1.25)) + 16
+        block = min(block, max_attempts - attempts)
+        attempts += block
+        lon_candidates = rng.uniform(min_lon, max_lon, block)
+        lat_candidates = rng.uniform(min_lat, max_lat, block)
+        inside = shapely.contains_xy(geometry, lon_candidates, lat_candidates)
+        lon_blocks.append(lon_candidates[inside])
+        lat_blocks.append(lat_candidates[inside])
+        accepted += int(inside.sum())
+
+    sampled_lon = np.concatenate(lon_blocks)[:n_points] if lon_blocks else np.array([], dtype=float)
+    sampled_lat = np.concatenate(lat_blocks)[:n_points] if lat_blocks else np.array([], dtype=float)
+    sampled_lon.setflags(write=False)
+    sampled_lat.setflags(write=False)
+    return sampled_lon, sampled_lat
+
+
+@dataclass
+class ExposureLayer:
+    """Uma camada de exposição carregada: geometrias, índice espacial e a parte fixa da referência."""
+
+    name: str
+    path: Path
+    source_path: str
+    geometries: np.ndarray
+    feature_names: np.ndarray
+    metric_geometries: np.ndarray
+    tree: STRtree
+    union: object
+    center: Tuple[float, float]
+    reference: Dict
+
+    def nearest(self, lat: float, lon: float) -> Tuple[int, float]:
+        """Feição mais próxima do ponto e a distância métrica até ela (km)."""
+        x, y = to_web_mercator(lon, lat)
+        point_metric = Point(float(x), float(y))
+        indices, distances = self.tree.query_nearest(point_metric, return_distance=True, all_matches=False)
+        if len(indices) == 0:
+            return -1, 0.0
+        return int(indices[0]), float(distances[0]) / 1000.0
+
+
+def build_layer(
+    name: str,
+    path: Path,
+    geometries: np.ndarray,
+    source_path: str,
+    feature_names: Optional[np.ndarray] = None,
+) -> Optional[ExposureLayer]:
+    """Pré-calcula união, projeção métrica, STRtree, pontos de exposição e raster de uma camada."""
+    geometries = np.asarray(geometries, dtype=object)
+    if geometries.size == 0:
+        return None
+    if feature_names is None:
+        feature_names = np.full(geometries.size, "", dtype=object)
+
+    metric_geometries = shapely.transform(geometries, _project_coords)
+    # A referência de exposição usa no máximo MAX_FEATURES feições; índice e máscaras usam todas.
+    sample = np.arange(geometries.size)
+    if geometries.size > MAX_FEATURES:
+        sample = np.sort(np.random.default_rng(42).choice(geometries.size, MAX_FEATURES, replace=False))
+    union_geom = unary_union(geometries[sample])
+    representative = shapely.get_coordinates(shapely.point_on_surface(geometries[sample]))
+    lon_points = representative[:, 0].astype(float)
+    lat_points = representative[:, 1].astype(float)
+
+    areas = shapely.area(metric_geometries[sample]).astype(float)
+    if np.all(~np.isfinite(areas)):
+        areas = np.ones_like(lon_points, dtype=float)
+    areas = np.nan_to_num(areas, nan=0.0, posinf=0.0, neginf=0.0)
+    if np.max(areas) <= 0:
+        areas = np.ones_like(areas, dtype=float)
+    values_array = areas / np.max(areas)
+
+    boundary_lon, boundary_lat = polygon_exterior_coords(union_geom)
+
+    inside_count = 0
+    if union_geom is not None and not union_geom.is_empty:
+        inside_count = int(shapely.contains_xy(union_geom, lon_points, lat_points).sum())
+
+    inside_ratio = (inside_count / max(lon_points.size, 1)) if lon_points.size else 0.0
+    if lon_points.size < 20 or inside_ratio < 0.6:
+        sample_geom = union_geom
+        if sample_geom is None or sample_geom.is_empty:
+            sample_geom = geometries[sample[0]]
+        if sample_geom is not None and not sample_geom.is_empty and sample_geom.geom_type not in {"Polygon", "MultiPolygon"}:
+            sample_geom = sample_geom.convex_hull
+
+        sampled_lon, sampled_lat = sample_points_inside_geometry(sample_geom, n_points=INTERIOR_SAMPLE_POINTS)
+        if sampled_lon.size > 0:
+            lon_points = sampled_lon
+            lat_points = sampled_lat
+            values_array = np.ones_like(sampled_lon, dtype=float)
+
+    min_lon, min_lat, max_lon, max_lat = (float(v) for v in shapely.total_bounds(geometries))
+    hist, x_edges, y_edges = np.histogram2d(
+        lon_points,
+        lat_points,
+        bins=[RASTER_BINS, RASTER_BINS],
+        range=[[min_lon, max_lon], [min_lat, max_lat]],
+    )
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2.0
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2.0
+
+    reference = {
+        "source_name": Path(path).stem,
+        "source_path": source_path,
+        "bbox": {
+            "min_lon": min_lon,
+            "max_lon": max_lon,
+            "min_lat": min_lat,
+            "max_lat": max_lat,
+        },
+        "boundary": {
+            "lon": boundary_lon,
+            "lat": boundary_lat,
+        },
+        "exposure_points": {
+            "lon": lon_points.tolist(),
+            "lat": lat_points.tolist(),
+            "value": values_array.astype(float).tolist(),
+        },
+        "raster": {
+            "x_centers": x_centers.tolist(),
+            "y_centers": y_centers.tolist(),
+            "z": hist.T.astype(float).tolist(),
+        },
+    }
+
+    return ExposureLayer(
+        name=name,
+        path=Path(path),
+        source_path=source_path,
+        geometries=geometries,
+        feature_names=np.asarray(feature_names, dtype=object),
+        metric_geometries=metric_geometries,
+        tree=STRtree(metric_geometries),
+        union=union_geom,
+        center=((min_lon + max_lon) / 2.0, (min_lat + max_lat) / 2.0),
+        reference=reference,
+    )
+
+
+def _normalize_name(value) -> str:
+    return "".join(char for char in str(value or "").upper() if char.isalnum())
+
+
+def read_layer(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Geometrias válidas do shapefile em EPSG:4326 e o nome de cada feição (``""`` sem coluna de nome)."""
+    if gpd is None:
+        raise RuntimeError("geopandas não está instalado")
+
+    gdf = gpd.read_file(path)
+    if gdf.empty or "geometry" not in gdf:
+        return np.array([], dtype=object), np.array([], dtype=object)
+
+    gdf = gdf[gdf.geometry.notnull()].copy()
+    gdf = gdf[~gdf.geometry.is_empty].copy()
+    if gdf.empty:
+        return np.array([], dtype=object), np.array([], dtype=object)
+
+    if gdf.crs is None:
+        gdf = gdf.set_crs("EPSG:4326", allow_override=True)
+    elif str(gdf.crs).upper() != "EPSG:4326":
+        gdf = gdf.to_crs("EPSG:4326")
+
+    columns = {_normalize_name(column): column for column in gdf.columns if column != "geometry"}
+    name_column = next((columns[key] for key in map(_normalize_name, NAME_FIELDS) if key in columns), None)
+    names = gdf[name_column].fillna("").astype(str).str.strip() if name_column else None
+    return (
+        np.asarray(gdf.geometry.values, dtype=object),
+        np.asarray(names if names is not None else [""] * len(gdf), dtype=object),
+    )
+
+
+class ExposureRegistry:
+    """Carrega todas as camadas de exposição uma vez e responde consultas de vizinho mais próximo."""
+
+    def __init__(self, data_dir: Path = EXPOSURE_DATA_DIR, workspace_root: Path = WORKSPACE_ROOT):
+        self.data_dir = Path(data_dir)
+        self.workspace_root = Path(workspace_root)
+        self._layers: Optional[List[ExposureLayer]] = None
+        self._centers = np.empty((0, 2), dtype=float)
+        self._load_seconds = 0.0
+        self._polygons: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.workspace_root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def load(self, force: bool = False) -> Dict:
+        """Lê todos os shapefiles de ``data_dir`` (chamado no startup; idempotente)."""
+        with self._lock:
+            if self._layers is not None and not force:
+                return self.stats()
+
+            started = time.perf_counter()
+            layers: List[ExposureLayer] = []
+            if self.data_dir.exists():
+                for shp_path in sorted(self.data_dir.rglob("*.shp")):
+                    try:
+                        geometries, names = read_layer(shp_path)
+                        layer = build_layer(shp_path.stem, shp_path, geometries, self._relative(shp_path), names)
+                    except Exception as exc:
+                        logger.warning(f"Exposure layer {shp_path} skipped: {exc}")
+                        continue
+                    if layer is not None:
+                        layers.append(layer)
+
+            self._layers = layers
+            self._polygons = {}
+            self._centers = np.array([layer.center for layer in layers], dtype=float).reshape(-1, 2)
+            self._load_seconds = time.perf_counter() - started
+            return self.stats()
+
+    @property
+    def layers(self) -> List[ExposureLayer]:
+        if self._layers is None:
+            self.load()
+        return self._layers
+
+    def nearest_layer(self, lat: float, lon: float) -> Optional[ExposureLayer]:
+        """Camada cujo centro do bbox está mais próximo do ponto (distância em graus)."""
+        layers = self.layers
+        if not layers:
+            return None
+        distances = np.hypot(self._centers[:, 0] - lon, self._centers[:, 1] - lat)
+        return layers[int(np.argmin(distances))]
+
+    def reference(self, lat: float, lon: float) -> Optional[Dict]:
+        """Referência de exposição do ponto: camada mais próxima, distância à feição mais próxima e dados fixos."""
+        layer = self.nearest_layer(lat, lon)
+        if layer is None:
+            return None
+
+        _, distance_km = layer.nearest(lat, lon)
+        # Cópia profunda: o dict da camada é compartilhado entre requisições.
+        reference = copy.deepcopy(layer.reference)
+        reference["nearest_distance_km"] = distance_km if math.isfinite(distance_km) else 0.0
+        reference["point"] = {"lat": float(lat), "lon": float(lon)}
+        return reference
+
+    def layer(self, name: str) -> Optional[ExposureLayer]:
+        """Camada pelo nome do arquivo ou da pasta (``campos_producao``, ``blocos_exploratorios``, ``santos``...)."""
+        key = _normalize_name(name)
+        return next(
+            (layer for layer in self.layers if key in (_normalize_name(layer.name), _normalize_name(layer.path.parent.name))),
+            None,
+        )
+
+    def polygon(self, layer_name: str, feature: Optional[str] = None):
+        """Geometria de uma feição (pelo nome) ou a união da camada inteira; ``None`` se não existir."""
+        layer = self.layer(layer_name)
+        if layer is None:
+            return None
+        key = (layer.source_path, _normalize_name(feature))
+        geometry = self._polygons.get(key)
+        if geometry is None:
+            if feature:
+                matches = np.array([_normalize_name(item) == key[1] for item in layer.feature_names], dtype=bool)
+                if not matches.any():
+                    return None
+                geometry = unary_union(layer.geometries[matches])
+            else:
+                geometry = unary_union(layer.geometries)
+            self._polygons[key] = geometry
+        return geometry
+
+    def stats(self) -> Dict:
+        layers = self._layers or []
+        return {
+            "data_dir": str(self.data_dir),
+            "loaded": self._layers is not None,
+            "layers": [
+                {"name": layer.name, "path": layer.source_path, "features": int(layer.geometries.size)}
+                for layer in layers
+            ],
+            "load_seconds": round(self._load_seconds, 3),
+        }
+
+
+exposure_registry = ExposureRegistry()
@@ -0,0 +1,65 @@
+"""Vectorized impact of one exposure point under one impact function.
+
+For a single asset CLIMADA's ``ImpactCalc`` reduces to
+``at_event = value * MDD(intensity) * PAA(intensity)``, with MDD and PAA
+interpolated linearly over the impact-function breakpoints
+(``ImpactFunc.calc_mdr``), ``frequency`` taken from the hazard and
+``aai_agg = sum(at_event * frequency)``. ``single_centroid_impact`` evaluates
+exactly that with two ``np.interp`` calls over the whole series, skipping the
+CSR intensity matrix, the per-event names, the centroids and the exposure
+checks that ``ImpactCalc`` needs for the general many-asset case.
+``scripts/check_impact_parity.py`` compares both paths.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+
+@dataclass
+class PointImpact:
+    """Perdas por evento de um único ativo, no formato dos atributos de ``climada.engine.Impact``."""
+
+    at_event: np.ndarray
+    frequency: np.ndarray
+    aai_agg: float
+
+    @property
+    def eai_exp(self) -> np.ndarray:
+        return np.array([self.aai_agg], dtype=float)
+
+
+def mean_damage_ratio(
+    intensity: np.ndarray,
+    curve_intensity: np.ndarray,
+    mdd: np.ndarray,
+    paa: np.ndarray,
+) -> np.ndarray:
+    """MDD(i) x PAA(i) com interpolação linear, como ``ImpactFunc.calc_mdr``.
+
+    Intensidade zero não gera dano: na matriz esparsa do CLIMADA ela nem é avaliada.
+    """
+    intensity = np.asarray(intensity, dtype=float)
+    curve_intensity = np.asarray(curve_intensity, dtype=float)
+    mdr = np.interp(intensity, curve_intensity, np.asarray(mdd, dtype=float))
+    mdr *= np.interp(intensity, curve_intensity, np.asarray(paa, dtype=float))
+    mdr[intensity == 0.0] = 0.0
+    return mdr
+
+
+def single_centroid_impact(
+    intensity: np.ndarray,
+    value: float,
+    curve_intensity: np.ndarray,
+    mdd: np.ndarray,
+    paa: np.ndarray,
+    frequency: Union[float, np.ndarray],
+) -> PointImpact:
+    """``at_event``/``frequency``/``aai_agg`` de um ativo de valor ``value`` exposto à série ``intensity``."""
+    intensity = np.asarray(intensity, dtype=float).reshape(-1)
+    at_event = float(value) * mean_damage_ratio(intensity, curve_intensity, mdd, paa)
+    frequency = np.broadcast_to(np.asarray(frequency, dtype=float), at_event.shape).copy()
+    return PointImpact(at_event=at_event, frequency=frequency, aai_agg=float(np.dot(at_event, frequency)))
@@ -0,0 +1,160 @@
+"""Sorted loss distribution of one event set, shared by every pricing metric.
+
+``LossDistribution`` sorts the per-event losses once and keeps, aligned with
+them, the exceedance frequencies (the cumulative frequency from the largest
+loss down, as in ``climada.engine.Impact.calc_freq_curve``) and the prefix sums
+of the losses. AAL and PML are then constants, the return-period curve and
+VaR are ``np.interp`` lookups, any quantile is an index computation and tail
+means (TVaR) are one ``searchsorted`` plus a prefix-sum difference, so the
+metrics of ``analyze_point`` and ``compute_pricing`` no longer re-sort the
+same arrays or build a CLIMADA ``Impact`` only to call ``calc_freq_curve``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def exceedance_probs(n: int, method: str = "weibull") -> np.ndarray:
+    """Posições de plotagem (probabilidade de excedência por posto) de ``n`` eventos."""
+    if n <= 0:
+        return np.array([], dtype=float)
+    rank = np.arange(1, n + 1, dtype=float)
+    m = (method or "weibull").lower()
+    if m == "hazen":
+        return (rank - 0.5) / n
+    if m == "gringorten":
+        return (rank - 0.44) / (n + 0.12)
+    if m == "cunnane":
+        return (rank - 0.4) / (n + 0.2)
+    return rank / (n + 1)
+
+
+def _lerp(low: np.ndarray, high: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """Interpolação linear na mesma forma de ``np.quantile`` (resultado idêntico ao ``nanquantile``)."""
+    diff = high - low
+    return np.where(weight >= 0.5, high - diff * (1.0 - weight), low + diff * weight)
+
+
+@dataclass(frozen=True)
+class LossDistribution:
+    """Perdas por evento ordenadas (crescente), com frequência, excedência e somas acumuladas."""
+
+    losses: np.ndarray
+    frequency: np.ndarray
+    exceedance_frequency: np.ndarray
+    cumulative_loss: np.ndarray
+
+    @classmethod
+    def from_events(cls, at_event: np.ndarray, frequency: np.ndarray) -> "LossDistribution":
+        """Distribuição de ``at_event``/``frequency`` (eventos com perda não finita são descartados)."""
+        at_event = np.asarray(at_event, dtype=float).reshape(-1)
+        frequency = np.asarray(frequency, dtype=float).reshape(-1)
+        if frequency.size != at_event.size:
+            frequency = np.zeros(at_event.size, dtype=float)
+        mask = np.isfinite(at_event)
+        order = np.argsort(at_event[mask], kind="stable")
+        return cls._sorted(at_event[mask][order], frequency[mask][order])
+
+    @classmethod
+    def from_samples(cls, values: np.ndarray) -> "LossDistribution":
+        """Amostras sem frequência (ex.: intensidades); a excedência usa posições de plotagem."""
+        values = np.asarray(values, dtype=float).reshape(-1)
+        return cls.from_events(values, np.zeros(values.size, dtype=float))
+
+    @classmethod
+    def from_losses(cls, loss_per_step: np.ndarray, annualization: float) -> "LossDistribution":
+        """Perdas por passo com frequência uniforme ``annualization / n`` (série horária anualizada)."""
+        losses = np.asarray(loss_per_step, dtype=float).reshape(-1)
+        losses = np.sort(losses[np.isfinite(losses)])
+        return cls._sorted(losses, cls._uniform_frequency(losses.size, annualization))
+
+    @classmethod
+    def _sorted(cls, losses: np.ndarray, frequency: np.ndarray) -> "LossDistribution":
+        cumulative_loss = np.concatenate([[0.0], np.cumsum(losses)])
+        exceedance_frequency = np.cumsum(frequency[::-1])[::-1]
+        return cls(
+            losses=losses,
+            frequency=frequency,
+            exceedance_frequency=exceedance_frequency,
+            cumulative_loss=cumulative_loss,
+        )
+
+    @staticmethod
+    def _uniform_frequency(n: int, annualization: float) -> np.ndarray:
+        return np.full(n, float(max(annualization, 1e-12)) / max(n, 1), dtype=float)
+
+    def with_annualization(self, annualization: float) -> "LossDistribution":
+        """Mesmas perdas (sem reordenar) com frequência uniforme ``annualization / n``."""
+        return self._sorted(self.losses, self._uniform_frequency(self.size, annualization))
+
+    @property
+    def size(self) -> int:
+        return int(self.losses.size)
+
+    @cached_property
+    def aal(self) -> float:
+        return float(np.dot(self.losses, self.frequency)) if self.size else 0.0
+
+    @property
+    def pml(self) -> float:
+        return float(self.losses[-1]) if self.size else 0.0
+
+    @cached_property
+    def std(self) -> float:
+        return float(np.std(self.losses)) if self.size else 0.0
+
+    @cached_property
+    def return_period(self) -> np.ndarray:
+        """Período de retorno de cada perda ordenada (``1 / excedência``), como em ``calc_freq_curve``."""
+        with np.errstate(divide="ignore"):
+            return 1.0 / self.exceedance_frequency
+
+    def loss_at_return_period(self, return_periods: Union[float, Sequence[float]]) -> np.ndarray:
+        """Perdas interpoladas nos períodos de retorno (``Impact.calc_freq_curve(return_per=...)``)."""
+        periods = np.atleast_1d(np.asarray(return_periods, dtype=float))
+        if not self.size:
+            return np.zeros(periods.size, dtype=float)
+        return np.interp(periods, self.return_period, self.losses)
+
+    def quantile(self, quantiles: Union[float, Sequence[float]]) -> np.ndarray:
+        """Quantis lineares das perdas (``np.nanquantile``) direto nas perdas ordenadas."""
+        q = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        if not self.size:
+            return np.zeros(q.size, dtype=float)
+        position = q * (self.size - 1)
+        lower = np.clip(np.floor(position).astype(int), 0, self.size - 1)
+        upper = np.minimum(lower + 1, self.size - 1)
+        return _lerp(self.losses[lower], self.losses[upper], position - lower)
+
+    def tail_mean(self, thresholds: Union[float, Sequence[float]]) -> np.ndarray:
+        """Média das perdas >= cada limiar; o próprio limiar quando não há perda na cauda."""
+        thresholds = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        start = np.searchsorted(self.losses, thresholds, side="left")
+        count = self.size - start
+        total = self.cumulative_loss[-1] - self.cumulative_loss[start]
+        return np.where(count > 0, total / np.maximum(count, 1), thresholds)
+
+    def tvar(self, quantiles: Union[float, Sequence[float]]) -> np.ndarray:
+        return self.tail_mean(self.quantile(quantiles))
+
+    def exceedance_curve(self, method: str = "weibull") -> Tuple[np.ndarray, np.ndarray]:
+        """Perdas decrescentes e probabilidade de excedência (1 - frequência acumulada / total).
+
+        Sem frequência positiva, usa as posições de plotagem de ``method``.
+        """
+        losses = self.losses[::-1]
+        cumulative = self.exceedance_frequency[::-1]
+        total = float(self.exceedance_frequency[0]) if self.size else 0.0
+        if not np.isfinite(total) or total <= 0.0:
+            return losses, exceedance_probs(losses.size, method)
+        return losses, 1.0 - np.clip(cumulative / total, 0.0, 1.0)
+
+    def petals_quantiles(self, quantiles: Sequence[float], annualization: Optional[float] = None) -> np.ndarray:
+        """Quantis PETALS (opcionalmente anualizados)."""
+        values = self.quantile(quantiles)
+        return values * float(annualization) if annualization is not None else values
@@ -0,0 +1,254 @@
+"""Persistent manifest of the NetCDF archive (variables, grid, bbox, time range, chunking, checksum).
+
+The archive is scanned once (``scripts/build_netcdf_catalog.py`` or the startup
+refresh) and saved as JSON. Afterwards file discovery and bounding boxes are
+dictionary lookups instead of ``os.walk`` plus an HDF5 open per request. A
+refresh only re-describes files whose size or mtime changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import xarray as xr
+
+from .netcdf_index import AxisIndex
+
+
+BASE_DIR = Path(os.environ.get("NETCDF_BASE_DIR", "D:/OceanPact/Netcdf"))
+CATALOG_PATH = Path(os.environ.get("NETCDF_CATALOG_PATH", str(BASE_DIR / "catalog.json")))
+CATALOG_FORMAT_VERSION = 1
+
+
+def _find_coord(ds: xr.Dataset, candidates: list[str]) -> Optional[str]:
+    return next((name for name in candidates if name in ds.coords), None)
+
+
+def _iso(value) -> str:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(np.datetime_as_string(np.datetime64(value), unit="s"))
+
+
+def file_checksum(path: Path, block_size: int = 8 * 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def describe_file(path: Path, base_dir: Path, checksum: bool = True) -> Dict:
+    """Entrada do catálogo para um NetCDF (abre só metadados e coordenadas)."""
+    stat = path.stat()
+    relative = path.relative_to(base_dir).as_posix()
+    parts = relative.split("/")
+    stem_head = path.stem.split("_")[0].lower()
+    entry: Dict = {
+        "path": relative,
+        "period": parts[0] if len(parts) > 1 else None,
+        "hazard": parts[1] if len(parts) > 2 else None,
+        "stat": "max" if "max" in stem_head else "mean",
+        "size": int(stat.st_size),
+        "mtime_ns": int(stat.st_mtime_ns),
+        "checksum": file_checksum(path) if checksum else None,
+    }
+
+    with xr.open_dataset(path) as ds:
+        lat_name = _find_coord(ds, ["lat", "latitude", "y"])
+        lon_name = _find_coord(ds, ["lon", "longitude", "x"])
+        time_name = _find_coord(ds, ["time", "t"])
+
+        variables: Dict[str, Dict] = {}
+        for name, var in ds.data_vars.items():
+            chunks = var.encoding.get("chunksizes")
+            variables[name] = {
+                "units": var.attrs.get("units"),
+                "dims": list(var.dims),
+                "shape": [int(size) for size in var.shape],
+                "dtype": str(var.dtype),
+                "chunks": [int(size) for size in chunks] if chunks else None,
+            }
+        entry["variables"] = variables
+
+        grid: Dict = {}
+        if lat_name and lon_name:
+            lat_axis = AxisIndex.build(lat_name, ds[lat_name].values)
+            lon_axis = AxisIndex.build(lon_name, ds[lon_name].values)
+            grid = {
+                "lat_name": lat_name,
+                "lon_name": lon_name,
+                "nlat": int(lat_axis.values.size),
+                "nlon": int(lon_axis.values.size),
+                "lat_step": lat_axis.step,
+                "lon_step": lon_axis.step,
+                "regular": bool(lat_axis.regular and lon_axis.regular),
+            }
+            entry["bbox"] = {
+                "min_lat": float(np.nanmin(lat_axis.values)),
+                "max_lat": float(np.nanmax(lat_axis.values)),
+                "min_lon": float(np.nanmin(lon_axis.values)),
+                "max_lon": float(np.nanmax(lon_axis.values)),
+            }
+        else:
+            entry["bbox"] = None
+        entry["grid"] = grid
+
+        if time_name and ds.sizes.get(time_name, 0) > 0:
+            times = ds[time_name].values
+            entry["time"] = {
+                "name": time_name,
+                "start": _iso(times[0]),
+                "end": _iso(times[-1]),
+                "count": int(times.size),
+                "calendar": ds[time_name].encoding.get("calendar"),
+            }
+        else:
+            entry["time"] = None
+    return entry
+
+
+class NetcdfCatalog:
+    """Manifesto JSON do acervo; recarregado quando o arquivo do catálogo muda em disco."""
+
+    def __init__(self, base_dir: Path = BASE_DIR, catalog_path: Path = CATALOG_PATH) -> None:
+        self.base_dir = Path(base_dir)
+        self.catalog_path = Path(catalog_path)
+        self.version = 0
+        self._files: Dict[str, Dict] = {}
+        self._loaded_mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _load_if_changed(self) -> None:
+        try:
+            mtime_ns = self.catalog_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._loaded_mtime_ns:
+            return
+        with self._lock:
+            if mtime_ns == self._loaded_mtime_ns:
+                return
+            with open(self.catalog_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            if payload.get("format_version") == CATALOG_FORMAT_VERSION:
+                self._files = dict(payload.get("files", {}))
+            self._loaded_mtime_ns = mtime_ns
+            self.version += 1
+
+    def _save(self, files: Dict[str, Dict]) -> None:
+        payload = {
+            "format_version": CATALOG_FORMAT_VERSION,
+            "base_dir": str(self.base_dir),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "files": files,
+        }
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.catalog_path)
+
+    def _scan(self) -> List[Path]:
+        return sorted(
+            path
+            for path in self.base_dir.rglob("*.nc")
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+    def refresh(self, checksum: bool = True) -> Dict[str, int]:
+        """Atualiza o manifesto: só arquivos novos ou com tamanho/mtime alterados são reabertos."""
+        self._load_if_changed()
+        if not self.base_dir.exists():
+            return {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        previous = dict(self._files)
+        files: Dict[str, Dict] = {}
+        summary = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        for path in self._scan():
+            relative = path.relative_to(self.base_dir).as_posix()
+            stat = path.stat()
+            known = previous.get(relative)
+            if (
+                known is not None
+                and known.get("size") == int(stat.st_size)
+                and known.get("mtime_ns") == int(stat.st_mtime_ns)
+                and (known.get("checksum") or not checksum)
+            ):
+                files[relative] = known
+                summary["unchanged"] += 1
+                continue
+            try:
+                files[relative] = describe_file(path, self.base_dir, checksum=checksum)
+            except Exception as exc:
+                print(f"[NetcdfCatalog] Falha ao descrever {path}: {exc}")
+                continue
+            summary["updated" if known is not None else "added"] += 1
+        summary["removed"] = len(set(previous) - set(files))
+
+        if summary["added"] or summary["updated"] or summary["removed"] or not self.catalog_path.exists():
+            self._save(files)
+        with self._lock:
+            self._files = files
+            self._loaded_mtime_ns = self.catalog_path.stat().st_mtime_ns if self.catalog_path.exists() else None
+            self.version += 1
+        return summary
+
+    def current_version(self) -> int:
+        """Versão do manifesto carregado (muda a cada refresh ou recarga do JSON)."""
+        self._load_if_changed()
+        return self.version
+
+    def entries(self) -> List[Dict]:
+        self._load_if_changed()
+        return [self._files[key] for key in sorted(self._files)]
+
+    def get(self, path: Path) -> Optional[Dict]:
+        self._load_if_changed()
+        try:
+            relative = Path(path).relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return None
+        return self._files.get(relative)
+
+    def find(
+        self,
+        period: Optional[str] = None,
+        hazard: Optional[str] = None,
+        stat: Optional[str] = None,
+        variable: Optional[str] = None,
+    ) -> List[Dict]:
+        """Entradas filtradas por diretório de período/hazard, estatística e variável."""
+        matches = []
+        for entry in self.entries():
+            if period is not None and entry.get("period") != period:
+                continue
+            if hazard is not None and entry.get("hazard") != hazard:
+                continue
+            if stat is not None and entry.get("stat") != stat:
+                continue
+            if variable is not None and variable not in entry.get("variables", {}):
+                continue
+            matches.append(entry)
+        return matches
+
+    def resolve(self, entry: Dict) -> Path:
+        return self.base_dir / entry["path"]
+
+    def stats(self) -> Dict:
+        self._load_if_changed()
+        return {
+            "catalog_path": str(self.catalog_path),
+            "files": len(self._files),
+            "version": int(self.version),
+        }
+
+
+netcdf_catalog = NetcdfCatalog()
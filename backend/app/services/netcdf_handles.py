@@ -0,0 +1,168 @@
+"""Bounded, thread-safe registry of open NetCDF / point-store datasets.
+
+netCDF4/HDF5 handles must not be read from several threads at once, so every
+handle carries its own lock and reads go through ``DatasetHandlePool.acquire``.
+The pool keeps at most ``max_open`` datasets open (least recently used are
+closed first) and reopens a file transparently when its mtime or size changes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterator, List, Tuple
+
+import xarray as xr
+
+from .netcdf_index import DatasetIndex
+
+
+DEFAULT_MAX_OPEN = int(os.getenv("NETCDF_MAX_OPEN_FILES", "16"))
+
+FileSignature = Tuple[int, int]
+
+
+def file_signature(path: Path) -> FileSignature:
+    """(mtime_ns, size) do arquivo; muda quando o arquivo é substituído em disco."""
+    stat = Path(path).stat()
+    return int(stat.st_mtime_ns), int(stat.st_size)
+
+
+@dataclass
+class DatasetHandle:
+    path: Path
+    dataset: xr.Dataset
+    index: DatasetIndex
+    signature: FileSignature
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    closed: bool = False
+
+    @property
+    def token(self) -> str:
+        """Identifica a versão do arquivo (para chaves de cache que não podem sobreviver a uma troca)."""
+        return f"{self.path}|{self.signature[0]}|{self.signature[1]}"
+
+    def close(self) -> None:
+        # Espera leituras em andamento terminarem antes de fechar o arquivo.
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.dataset.close()
+
+
+class DatasetHandlePool:
+    """LRU de datasets abertos, com lock por arquivo e reabertura por mtime/tamanho."""
+
+    def __init__(self, max_open: int = DEFAULT_MAX_OPEN) -> None:
+        self.max_open = max(int(max_open), 1)
+        self._handles: "OrderedDict[Hashable, DatasetHandle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Event] = {}
+        self.opens = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, path: Path, opener: Callable[[], xr.Dataset]) -> DatasetHandle:
+        """Handle atual de ``key``; ``path`` é o arquivo cuja assinatura invalida o handle.
+
+        Abrir e indexar o arquivo acontece fora do lock do pool (só uma thread por chave
+        abre; as demais esperam por ela), então leituras de outros arquivos não ficam
+        bloqueadas atrás de uma abertura lenta.
+        """
+        signature = file_signature(path)
+        to_close: List[DatasetHandle] = []
+        while True:
+            with self._lock:
+                handle = self._handles.get(key)
+                if handle is not None and handle.signature == signature and not handle.closed:
+                    self._handles.move_to_end(key)
+                    return handle
+                pending = self._loading.get(key)
+                if pending is None:
+                    if handle is not None:
+                        self._handles.pop(key)
+                        to_close.append(handle)
+                        self.reloads += 1
+                    pending = self._loading[key] = threading.Event()
+                    break
+            # Outra thread está abrindo esta chave: espera e confere de novo.
+            pending.wait()
+
+        for stale in to_close:
+            stale.close()
+        to_close = []
+        try:
+            dataset = opener()
+            try:
+                index = DatasetIndex.build(dataset)
+            except BaseException:
+                dataset.close()
+                raise
+            handle = DatasetHandle(path=Path(path), dataset=dataset, index=index, signature=signature)
+
+            with self._lock:
+                current = self._handles.get(key)
+                if current is not None and current.signature == signature and not current.closed:
+                    # Perdeu a corrida: fica com o handle já registrado e fecha o novo.
+                    self._handles.move_to_end(key)
+                    to_close.append(handle)
+                    handle = current
+                else:
+                    if current is not None:
+                        to_close.append(current)
+                    self._handles[key] = handle
+                    self._handles.move_to_end(key)
+                    self.opens += 1
+                    while len(self._handles) > self.max_open:
+                        _, evicted = self._handles.popitem(last=False)
+                        to_close.append(evicted)
+                        self.evictions += 1
+        finally:
+            with self._lock:
+                if self._loading.get(key) is pending:
+                    del self._loading[key]
+            pending.set()
+
+        for stale in to_close:
+            stale.close()
+        return handle
+
+    @contextmanager
+    def acquire(self, key: Hashable, path: Path, opener: Callable[[], xr.Dataset]) -> Iterator[DatasetHandle]:
+        """Handle com o lock de leitura do arquivo adquirido durante o bloco ``with``."""
+        while True:
+            handle = self.get(key, path, opener)
+            with handle.lock:
+                if handle.closed:
+                    # Fechado por outra thread entre o get e o lock: reabre.
+                    continue
+                yield handle
+                return
+
+    def discard(self, key: Hashable) -> None:
+        """Fecha e remove o handle de ``key`` (ex.: versão antiga de um point store)."""
+        with self._lock:
+            handle = self._handles.pop(key, None)
+        if handle is not None:
+            handle.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            handle.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "open": len(self._handles),
+                "max_open": int(self.max_open),
+                "opens": int(self.opens),
+                "reloads": int(self.reloads),
+                "evictions": int(self.evictions),
+            }
@@ -0,0 +1,114 @@
+"""Per-file coordinate/time indexes built once when a NetCDF (or point store) is opened.
+
+They replace per-request ``.sel(method="nearest")`` lookups and ``.dt.year``
+masks: lat/lon snapping becomes index arithmetic on the grid spacing, and a
+year range becomes a contiguous ``isel`` slice read directly from disk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+@dataclass
+class AxisIndex:
+    name: str
+    values: np.ndarray
+    start: float
+    step: float
+    regular: bool
+
+    @classmethod
+    def build(cls, name: str, values: np.ndarray) -> "AxisIndex":
+        coords = np.asarray(values, dtype=float)
+        if coords.size < 2:
+            return cls(name=name, values=coords, start=float(coords[0]) if coords.size else 0.0, step=0.0, regular=False)
+        diffs = np.diff(coords)
+        step = float(np.median(diffs))
+        regular = bool(step != 0.0 and np.allclose(diffs, step, rtol=1e-6, atol=abs(step) * 1e-6))
+        return cls(name=name, values=coords, start=float(coords[0]), step=step, regular=regular)
+
+    def nearest(self, targets: np.ndarray) -> np.ndarray:
+        """Índice da coordenada mais próxima de cada alvo (O(1) por alvo em grades regulares)."""
+        points = np.asarray(targets, dtype=float).reshape(-1)
+        size = self.values.size
+        if size == 0:
+            raise ValueError(f"Coordenada '{self.name}' vazia.")
+        if self.regular:
+            idx = np.rint((points - self.start) / self.step).astype(int)
+            return np.clip(idx, 0, size - 1)
+        return np.nanargmin(np.abs(self.values[np.newaxis, :] - points[:, np.newaxis]), axis=1).astype(int)
+
+
+@dataclass
+class DatasetIndex:
+    time_name: str
+    lat: AxisIndex
+    lon: AxisIndex
+    time_index: pd.Index
+    year_slices: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+
+    @staticmethod
+    def _find_coord(ds: xr.Dataset, candidates: list[str]) -> str:
+        for name in candidates:
+            if name in ds.coords:
+                return name
+        raise KeyError(f"Nenhuma coordenada encontrada entre: {candidates}")
+
+    @classmethod
+    def build(cls, ds: xr.Dataset) -> "DatasetIndex":
+        time_name = cls._find_coord(ds, ["time", "t"])
+        lat_name = cls._find_coord(ds, ["lat", "latitude", "y"])
+        lon_name = cls._find_coord(ds, ["lon", "longitude", "x"])
+        time_index = ds.indexes[time_name]
+        return cls(
+            time_name=time_name,
+            lat=AxisIndex.build(lat_name, ds[lat_name].values),
+            lon=AxisIndex.build(lon_name, ds[lon_name].values),
+            time_index=time_index,
+            year_slices=cls._build_year_slices(time_index),
+        )
+
+    @staticmethod
+    def _build_year_slices(time_index: pd.Index) -> Dict[int, Tuple[int, int]]:
+        if len(time_index) == 0:
+            return {}
+        values = np.asarray(time_index.values)
+        if np.issubdtype(values.dtype, np.datetime64):
+            years = values.astype("datetime64[Y]").astype(int) + 1970
+        else:
+            # cftime (calendários CMIP sem bissexto): decodifica uma única vez na abertura
+            years = np.fromiter((item.year for item in values), dtype=int, count=values.size)
+        if np.any(np.diff(years) < 0):
+            raise ValueError(f"Eixo temporal '{time_index.name}' não está ordenado.")
+        unique_years, starts = np.unique(years, return_index=True)
+        stops = np.append(starts[1:], years.size)
+        return {int(year): (int(start), int(stop)) for year, start, stop in zip(unique_years, starts, stops)}
+
+    @property
+    def lat_name(self) -> str:
+        return self.lat.name
+
+    @property
+    def lon_name(self) -> str:
+        return self.lon.name
+
+    def snap(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.lat.nearest(lats), self.lon.nearest(lons)
+
+    def year_slice(self, start_year: int, end_year: int) -> slice:
+        """Fatia contígua [início do start_year, fim do end_year] do eixo temporal."""
+        ranges = [bounds for year, bounds in self.year_slices.items() if start_year <= year <= end_year]
+        if not ranges:
+            return slice(0, 0)
+        return slice(min(start for start, _ in ranges), max(stop for _, stop in ranges))
+
+    def time_slice(self, start_time: Optional[str], end_time: Optional[str]) -> slice:
+        if not start_time and not end_time:
+            return slice(None)
+        return self.time_index.slice_indexer(start_time, end_time)
@@ -1,34 +1,76 @@
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
 import os
 import xarray as xr
 import numpy as np
 
-# Defina o diretório base dos NetCDFs
-BASE_DIR = Path(os.environ.get("NETCDF_BASE_DIR", "D:/OceanPact/Netcdf"))
+from .climate_source import VariableLayout, parse_time, to_datetime
+from .climatology import DISPLAY_SCALE, climatology_store, yearly_monthly_means
+from .netcdf_catalog import BASE_DIR, NetcdfCatalog, netcdf_catalog
+from .netcdf_handles import DatasetHandle, DatasetHandlePool, FileSignature, file_signature
+from .netcdf_index import DatasetIndex
+from .netcdf_timeline import VirtualTimeline
+from .point_cache import point_series_cache
+from .point_store import is_point_store_current, open_point_store, point_store_path, point_store_signature
+from .region_stats import region_statistics
+from .spatial_aggregation import region_geometry, weight_mask_cache, weighted_spatial_mean
+from .wind_derived import KNOTS_PER_MS, wind_speed_direction
+from .wind_rose import wind_status
+
+# Janela padrão das séries de vento sem start/end: do início do período preditivo em diante.
+DEFAULT_SERIES_START = "2015-01-01"
+# Cópias time-major (uma chunk com o eixo temporal completo por tile lat/lon)
+POINT_STORE_DIR = Path(os.environ.get("NETCDF_POINT_STORE_DIR", str(BASE_DIR / "point_store")))
+# Blocos dask das consultas de região: chunks nativos agrupados no tempo até ~este tamanho
+REGION_CHUNK_MB = int(os.environ.get("NETCDF_REGION_CHUNK_MB", "64"))
     
+# Atributo -> (período, hazard, estatística, anos de início aceitos, caminho padrão sem catálogo)
+_PATH_LAYOUT: Dict[str, Tuple[str, str, str, Tuple[Optional[int], Optional[int]], str]] = {
+    "wind_hist_mean": ("historico", "vento", "mean", (None, None), "historico/vento/sfcWind_hist_processado.nc"),
+    "wind_hist_max": ("historico", "vento", "max", (None, None), "historico/vento/sfcWindmax_hist_processado.nc"),
+    "wind_pred_mean": ("preditivo", "vento", "mean", (None, None), "preditivo/vento/sfcWind_ssp585_processado.nc"),
+    "wind_pred_max": ("preditivo", "vento", "max", (None, None), "preditivo/vento/sfcWindmax_ssp585_processado.nc"),
+    "wave_hist_mean": ("historico", "onda", "mean", (None, None), "historico/onda/hsmean_ww3_mri_1979_2015.nc"),
+    "wave_hist_max": ("historico", "onda", "max", (None, None), "historico/onda/hsmax_ww3_mri_1979_2015.nc"),
+    "wave_pred_mean_early": ("preditivo", "onda", "mean", (None, 2030), "preditivo/onda/hsmean_ww3_mri_2015_2030.nc"),
+    "wave_pred_mean_late": ("preditivo", "onda", "mean", (2031, None), "preditivo/onda/hsmean_ww3_mri_2031_2060.nc"),
+    "wave_pred_max_early": ("preditivo", "onda", "max", (None, 2030), "preditivo/onda/hsmax_ww3_mri_2015_2030.nc"),
+    "wave_pred_max_late": ("preditivo", "onda", "max", (2031, None), "preditivo/onda/hsmax_ww3_mri_2031_2060.nc"),
+}
+
+
 class NetcdfPaths:
-    def __init__(self):
-        self.wind_hist_mean = BASE_DIR / "historico" / "vento" / "sfcWind_hist_processado.nc"
-        self.wind_hist_max = BASE_DIR / "historico" / "vento" / "sfcWindmax_hist_processado.nc"
-        self.wind_pred_mean = BASE_DIR / "preditivo" / "vento" / "sfcWind_ssp585_processado.nc"
-        self.wind_pred_max = BASE_DIR / "preditivo" / "vento" / "sfcWindmax_ssp585_processado.nc"
-        self.wave_hist_mean = BASE_DIR / "historico" / "onda" / "hsmean_ww3_mri_1979_2015.nc"
-        self.wave_hist_max = BASE_DIR / "historico" / "onda" / "hsmax_ww3_mri_1979_2015.nc"
-        self.wave_pred_mean_early = BASE_DIR / "preditivo" / "onda" / "hsmean_ww3_mri_2015_2030.nc"
-        self.wave_pred_mean_late = BASE_DIR / "preditivo" / "onda" / "hsmean_ww3_mri_2031_2060.nc"
-        self.wave_pred_max_early = BASE_DIR / "preditivo" / "onda" / "hsmax_ww3_mri_2015_2030.nc"
-        self.wave_pred_max_late = BASE_DIR / "preditivo" / "onda" / "hsmax_ww3_mri_2031_2060.nc"
+    """Arquivos do acervo resolvidos pelo catálogo; sem catálogo, usa os nomes padrão."""
+
+    def __init__(self, catalog: NetcdfCatalog = netcdf_catalog):
+        for name, (period, hazard, stat, (min_year, max_year), default) in _PATH_LAYOUT.items():
+            path = BASE_DIR / default
+            for entry in catalog.find(period=period, hazard=hazard, stat=stat):
+                start_year = int(entry["time"]["start"][:4]) if entry.get("time") else None
+                if min_year is not None and (start_year is None or start_year < min_year):
+                    continue
+                if max_year is not None and (start_year is None or start_year > max_year):
+                    continue
+                path = catalog.resolve(entry)
+                break
+            setattr(self, name, path)
 
 
 class NetcdfReader:
+    name = "netcdf"
+
     def __init__(self):
-        self.paths = NetcdfPaths()
-        self._cache = {}
+        self._paths: Optional[NetcdfPaths] = None
+        self._paths_version = -1
+        self._handles = DatasetHandlePool()
+        self._point_sources: Dict[Path, Tuple[FileSignature, Optional[FileSignature], Optional[Path]]] = {}
+        self._timelines: Dict[Tuple[str, str, str], Tuple[Tuple, VirtualTimeline]] = {}
     def get_interval_series(
         self,
         variable: str,
@@ -40,39 +82,23 @@ class NetcdfReader:
     ) -> np.ndarray:
         """
         Análise do intervalo completo: de 1 de janeiro do ano inicial até 31 de dezembro do ano final.
-        Seleciona arquivos históricos e preditivos conforme o ano.
+        Lê a linha do tempo contínua histórico + preditivo, sem pular arquivos intermediários.
         """
-        # Monta datas
-        start_date = f"{start_year}-01-01"
-        end_date = f"{end_year}-12-31"
-        # Decide arquivos
-        paths = []
-        # Histórico: 1979–2015
-        if start_year <= 2015:
-            hist_path = self._pick_wind_path(start_date, stat) if variable.startswith("sfcWind") else self._pick_wave_path(start_date, stat)
-            paths.append(hist_path)
-        # Preditivo: 2016 em diante
-        if end_year > 2015:
-            pred_path = self._pick_wind_path(end_date, stat) if variable.startswith("sfcWind") else self._pick_wave_path(end_date, stat)
-            paths.append(pred_path)
-        # Carrega e concatena
-        arrays = []
-        for path in paths:
-            print(f"[NetcdfReader] Opening NetCDF file: {path}")
-            ds = self._open(path)
-            time_name = self._find_coord(ds, ["time", "t"])
-            lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-            lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-            var_name = variable if variable in ds.data_vars else list(ds.data_vars)[0]
-            arr = ds[var_name].sel({lat_name: lat, lon_name: lon}, method="nearest")
-            arr = arr.sel({time_name: slice(start_date, end_date)})
-            arrays.append(arr)
-        # Concatena arrays
-        if arrays:
-            arr_concat = np.concatenate([a.values for a in arrays])
-            return arr_concat
-        else:
+        hazard = "wind" if variable.startswith("sfcWind") else "wave"
+        timeline = self.timeline(hazard, stat)
+        segments = self._read_timeline_points(
+            timeline,
+            [variable],
+            np.array([lat]),
+            np.array([lon]),
+            start_time=f"{start_year}-01-01",
+            end_time=f"{end_year}-12-31",
+            fallback_first=True,
+        )
+        if not segments:
             return np.array([])
+        return np.concatenate([values[0] for _, _, values, _ in segments])
+
     def get_wind_speed_series(
         self,
         lat: float,
@@ -81,37 +107,33 @@ class NetcdfReader:
         end_time: Optional[str] = None,
         stat: str = "mean",
     ) -> np.ndarray:
-        path = self._pick_wind_path(start_time or end_time or "2015-01-01", stat)
-        print(f"[NetcdfReader] Opening NetCDF file: {path}")
-        ds = self._open(path)
-        print(f"[NetcdfReader] Dataset coords: {list(ds.coords)}")
-        print(f"[NetcdfReader] Dataset dims: {list(ds.dims)}")
         if stat == "max":
             candidates = ["sfcWindmax_corr", "sfcWindmax"]
         else:
             candidates = ["sfcWind_corr", "sfcWind", "sfcWindmax_corr", "sfcWindmax"]
-        var_name = next((v for v in candidates if v in ds.data_vars), None)
-        if var_name is None:
-            raise KeyError(f"Nenhuma variável de vento encontrada. Disponíveis: {list(ds.data_vars)}")
-        if "_corr" not in var_name:
-            print(f"[NetcdfReader] Aviso: usando variável não corrigida '{var_name}' (não encontrei *_corr)")
-
-        print(f"[NetcdfReader] Variable '{var_name}' dims: {ds[var_name].dims}")
-        print(f"[NetcdfReader] Variable '{var_name}' coords: {list(ds[var_name].coords)}")
-        time_name = self._find_coord(ds, ["time", "t"])
-        lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-        lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-        point = ds[var_name].sel({lat_name: lat, lon_name: lon}, method="nearest")
-        if start_time or end_time:
-            point = point.sel({time_name: slice(start_time, end_time)})
-        values = np.asarray(point)
-
-        # Detect units and convert if in m/s
-        units = str(point.attrs.get("units", "")).lower()
-        needs_knots = any(u in units for u in ["m/s", "m s-1", "meter per second", "metros/segundo"])
-        if needs_knots or units == "":
-            values = values * 1.9438444924406
-        return values  # Already in knots if converted
+        start_time, end_time = self._series_window(start_time, end_time)
+        segments = self._read_timeline_points(
+            self.timeline("wind", stat),
+            candidates,
+            np.array([lat]),
+            np.array([lon]),
+            start_time=start_time,
+            end_time=end_time,
+        )
+        arrays = []
+        for path, var_name, values, _ in segments:
+            if "_corr" not in var_name:
+                print(f"[NetcdfReader] Aviso: usando variável não corrigida '{var_name}' (não encontrei *_corr)")
+            # Detect units and convert if in m/s
+            units = str(self._open(path)[var_name].attrs.get("units", "")).lower()
+            needs_knots = any(u in units for u in ["m/s", "m s-1", "meter per second", "metros/segundo"])
+            row = values[0]
+            if needs_knots or units == "":
+                row = row * KNOTS_PER_MS
+            arrays.append(row)
+        if not arrays:
+            return np.array([])
+        return np.concatenate(arrays)  # Already in knots if converted
 
     def get_wind_direction_series(
         self,
@@ -121,32 +143,63 @@ class NetcdfReader:
         end_time: Optional[str] = None,
         stat: str = "mean",
     ) -> np.ndarray:
-        path = self._pick_wind_path(start_time or end_time or "2015-01-01", stat)
-        print(f"[NetcdfReader] Opening NetCDF file: {path}")
-        ds = self._open(path)
-        print(f"[NetcdfReader] Dataset coords: {list(ds.coords)}")
-        print(f"[NetcdfReader] Dataset dims: {list(ds.dims)}")
-        u_var = "u10" if "u10" in ds.data_vars else None
-        v_var = "v10" if "v10" in ds.data_vars else None
-        if u_var:
-            print(f"[NetcdfReader] Variable '{u_var}' dims: {ds[u_var].dims}")
-            print(f"[NetcdfReader] Variable '{u_var}' coords: {list(ds[u_var].coords)}")
-        if v_var:
-            print(f"[NetcdfReader] Variable '{v_var}' dims: {ds[v_var].dims}")
-            print(f"[NetcdfReader] Variable '{v_var}' coords: {list(ds[v_var].coords)}")
-        time_name = self._find_coord(ds, ["time", "t"])
-        lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-        lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-        if u_var and v_var:
-            u10 = ds[u_var].sel({lat_name: lat, lon_name: lon}, method="nearest")
-            v10 = ds[v_var].sel({lat_name: lat, lon_name: lon}, method="nearest")
-            if start_time or end_time:
-                u10 = u10.sel({time_name: slice(start_time, end_time)})
-                v10 = v10.sel({time_name: slice(start_time, end_time)})
-            direction_deg = (np.degrees(np.arctan2(u10, v10)) + 180.0) % 360.0
-            return np.asarray(direction_deg)
+        """Direção (graus) na mesma linha do tempo e janela de ``get_wind_speed_series``."""
+        timeline = self.timeline("wind", stat)
+        start_time, end_time = self._series_window(start_time, end_time)
+        components = []
+        try:
+            for name in ("u10", "v10"):
+                segments = self._read_timeline_points(
+                    timeline, [name], np.array([lat]), np.array([lon]), start_time=start_time, end_time=end_time
+                )
+                components.append(
+                    np.concatenate([values[0] for _, _, values, _ in segments]) if segments else np.array([])
+                )
+        except KeyError as exc:
+            print(f"[NetcdfReader] Aviso: direção indisponível ({exc}); usando zeros")
+            size = sum(rows.stop - rows.start for _, rows in timeline.resolve(start_time, end_time))
+            return np.zeros(size)
+        _, direction_deg = wind_speed_direction(*components)
+        return np.asarray(direction_deg)
+
+    @staticmethod
+    def _series_window(start_time: Optional[str], end_time: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Sem janela, as séries de vento começam no período preditivo (``DEFAULT_SERIES_START``)."""
+        if start_time is None and end_time is None:
+            return DEFAULT_SERIES_START, None
+        return start_time, end_time
+
+    def get_points_series(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        stat: str = "mean",
+    ) -> np.ndarray:
+        """Séries de vários pontos de uma vez, como matriz (pontos x tempo)."""
+        if variable in ["sfcWind", "sfcWind_corr", "u10", "v10"]:
+            hazard = "wind"
+        elif variable == "hs":
+            hazard = "wave"
         else:
-            return np.zeros(ds[time_name].shape)
+            raise ValueError(f"Unsupported variable: {variable}")
+        lats_arr = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons_arr = np.atleast_1d(np.asarray(lons, dtype=float))
+        print(f"[NetcdfReader] Variable '{variable}' points: {lats_arr.size}")
+        segments = self._read_timeline_points(
+            self.timeline(hazard, stat),
+            [variable],
+            lats_arr,
+            lons_arr,
+            start_time=start_time,
+            end_time=end_time,
+            fallback_first=True,
+        )
+        if not segments:
+            return np.empty((lats_arr.size, 0), dtype=float)
+        return np.hstack([values for _, _, values, _ in segments])
 
     def get_point_series(
         self,
@@ -157,59 +210,562 @@ class NetcdfReader:
         end_time: Optional[str] = None,
         stat: str = "mean",
     ) -> np.ndarray:
-        # Pick correct file for wind or wave
-        if variable in ["sfcWind", "sfcWind_corr", "u10", "v10"]:
-            path = self._pick_wind_path(start_time or end_time or "2015-01-01", stat)
-        elif variable == "hs":
-            path = self._pick_wave_path(start_time or end_time or "2015-01-01", stat)
-        else:
+        return self.get_points_series([lat], [lon], variable, start_time, end_time, stat)[0]
+
+    @staticmethod
+    def _variable_timeline(variable: str) -> Optional[Tuple[str, str]]:
+        """(hazard, estatística) da linha do tempo que contém ``variable``; ``None`` se não é do acervo."""
+        if variable.startswith("sfcWindmax"):
+            return "wind", "max"
+        if variable.startswith("sfcWind"):
+            return "wind", "mean"
+        if variable == "hs":
+            return "wave", "mean"
+        return None
+
+    def _require_timeline(self, variable: str) -> VirtualTimeline:
+        key = self._variable_timeline(variable)
+        if key is None:
             raise ValueError(f"Unsupported variable: {variable}")
-        print(f"[NetcdfReader] Opening NetCDF file: {path}")
-        ds = self._open(path)
-        print(f"[NetcdfReader] Dataset coords: {list(ds.coords)}")
-        print(f"[NetcdfReader] Dataset dims: {list(ds.dims)}")
-        var_name = variable if variable in ds.data_vars else list(ds.data_vars)[0]
-        print(f"[NetcdfReader] Variable '{var_name}' dims: {ds[var_name].dims}")
-        print(f"[NetcdfReader] Variable '{var_name}' coords: {list(ds[var_name].coords)}")
-        time_name = self._find_coord(ds, ["time", "t"])
-        # Auto-select coordinate names based on variable type
-        if var_name == "hs":
-            lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-            lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-        else:
-            lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-            lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-        point = ds[var_name].sel({lat_name: lat, lon_name: lon}, method="nearest")
-        if start_time or end_time:
-            point = point.sel({time_name: slice(start_time, end_time)})
-        return np.asarray(point)
+        return self.timeline(*key)
+
+    def get_available_variables(self) -> List[str]:
+        """Variáveis (tempo, lat, lon) do acervo, segundo o catálogo."""
+        names = set()
+        for entry in netcdf_catalog.entries():
+            for name, info in (entry.get("variables") or {}).items():
+                if len(info.get("dims") or []) == 3 and self._variable_timeline(name) is not None:
+                    names.add(name)
+        return sorted(names)
+
+    def get_time_range(self) -> Tuple[datetime, datetime]:
+        """Primeiro e último passo de tempo do acervo (histórico + preditivo)."""
+        starts = [parse_time(entry["time"]["start"]) for entry in netcdf_catalog.entries() if entry.get("time")]
+        ends = [parse_time(entry["time"]["end"]) for entry in netcdf_catalog.entries() if entry.get("time")]
+        if not starts:
+            raise FileNotFoundError("Catálogo NetCDF vazio. Rode o refresh do catálogo ou configure NETCDF_BASE_DIR.")
+        return to_datetime(min(starts)), to_datetime(max(ends))
+
+    def get_spatial_bounds(self) -> Dict[str, float]:
+        """União dos bbox dos arquivos do catálogo."""
+        boxes = [entry["bbox"] for entry in netcdf_catalog.entries() if entry.get("bbox")]
+        if not boxes:
+            raise FileNotFoundError("Catálogo NetCDF vazio. Rode o refresh do catálogo ou configure NETCDF_BASE_DIR.")
+        return {
+            "north": max(box["max_lat"] for box in boxes),
+            "south": min(box["min_lat"] for box in boxes),
+            "west": min(box["min_lon"] for box in boxes),
+            "east": max(box["max_lon"] for box in boxes),
+        }
 
+    def describe_variable(self, variable: str) -> Optional[VariableLayout]:
+        """Cobertura e chunks de ``variable`` a partir do catálogo, sem abrir os NetCDFs.
 
-    def _open(self, path: Path) -> xr.Dataset:
+        Mapas leem os chunks do NetCDF (contíguo = um passo de tempo por leitura);
+        séries pontuais leem o point store time-major quando ele está atualizado.
+        """
+        key = self._variable_timeline(variable)
+        if key is None:
+            return None
+        entries = []
+        for path in self._timeline_paths(*key, "ssp585"):
+            entry = netcdf_catalog.get(path)
+            if entry and entry.get("time") and entry.get("grid") and variable in (entry.get("variables") or {}):
+                entries.append((path, entry))
+        if not entries:
+            return None
+
+        path, first = entries[0]
+        info = first["variables"][variable]
+        if len(info["dims"]) != 3:
+            return None
+        grid = first["grid"]
+        by_dim = dict(zip(info["dims"], info["chunks"] or [1, grid["nlat"], grid["nlon"]]))
+        map_chunks = (
+            int(by_dim[first["time"]["name"]]),
+            int(by_dim[grid["lat_name"]]),
+            int(by_dim[grid["lon_name"]]),
+        )
+        point_chunks = map_chunks
+        if path.exists():
+            store_key, opener = self._point_source(path)
+            if store_key[1] == "point_store":
+                store_var = self._handles.get(store_key, path, opener).dataset[variable]
+                store_chunks = dict(zip(store_var.dims, store_var.encoding.get("chunks") or store_var.shape))
+                point_chunks = (
+                    int(store_chunks[first["time"]["name"]]),
+                    int(store_chunks[grid["lat_name"]]),
+                    int(store_chunks[grid["lon_name"]]),
+                )
+
+        bbox = first["bbox"]
+        return VariableLayout(
+            variable=variable,
+            time_start=min(parse_time(entry["time"]["start"]) for _, entry in entries),
+            time_end=max(parse_time(entry["time"]["end"]) for _, entry in entries),
+            shape=(sum(int(entry["time"]["count"]) for _, entry in entries), int(grid["nlat"]), int(grid["nlon"])),
+            map_chunks=map_chunks,
+            point_chunks=point_chunks,
+            itemsize=int(np.dtype(info["dtype"]).itemsize),
+            bounds={
+                "north": bbox["max_lat"],
+                "south": bbox["min_lat"],
+                "west": bbox["min_lon"],
+                "east": bbox["max_lon"],
+            },
+        )
+
+    def wind_hazard_variables(self) -> Optional[Dict]:
+        """Velocidade diária do CMIP6; direção só se o arquivo trouxer u10/v10."""
+        entries = netcdf_catalog.find(period="historico", hazard="vento", stat="mean")
+        for entry in entries:
+            variables = entry.get("variables") or {}
+            speed = next((name for name in ("sfcWind_corr", "sfcWind") if name in variables), None)
+            if speed is not None:
+                return {"speed": speed, "direction": "u10" in variables and "v10" in variables}
+        return None
+
+    def get_timeseries_at_point(
+        self,
+        variable: str,
+        lat: float,
+        lon: float,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Dict:
+        """Série da célula mais próxima na linha do tempo contínua (point store quando existir)."""
+        timeline = self._require_timeline(variable)
+        segments = self._read_timeline_points(
+            timeline, [variable], np.array([lat]), np.array([lon]), start_time=start_time, end_time=end_time
+        )
+        index = timeline.segments[0].index
+        lat_idx, lon_idx = index.snap(np.array([lat]), np.array([lon]))
+        return {
+            "time": np.concatenate([times for _, _, _, times in segments]) if segments else np.array([], dtype="datetime64[ns]"),
+            "values": np.concatenate([values[0] for _, _, values, _ in segments]) if segments else np.array([]),
+            "lat": float(index.lat.values[lat_idx[0]]),
+            "lon": float(index.lon.values[lon_idx[0]]),
+        }
+
+    @staticmethod
+    def _region_chunks(da: xr.DataArray, time_name: str) -> Dict[str, int]:
+        """Chunks nativos do arquivo, agrupados no tempo até ~``REGION_CHUNK_MB`` por bloco dask."""
+        chunks = da.encoding.get("chunksizes")
+        if chunks is None or len(chunks) != len(da.dims):
+            chunks = [1 if dim == time_name else size for dim, size in zip(da.dims, da.shape)]
+        by_dim = {dim: int(size) for dim, size in zip(da.dims, chunks)}
+        block_bytes = da.dtype.itemsize * int(np.prod(list(by_dim.values())))
+        factor = max(1, (REGION_CHUNK_MB * 1024 * 1024) // max(block_bytes, 1))
+        by_dim[time_name] = min(int(da.sizes[time_name]), by_dim[time_name] * int(factor))
+        return by_dim
+
+    @contextmanager
+    def _region_data(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Iterator[Tuple[xr.DataArray, DatasetIndex]]:
+        """Recorte lazy (dask) do período e do bbox, concatenado sobre os arquivos da linha do tempo.
+
+        Os handles ficam presos no pool enquanto o bloco ``with`` está aberto, pois a
+        redução só lê os chunks no ``compute``.
+        """
+        ranges = self._require_timeline(variable).resolve(start_time, end_time)
+        if not ranges:
+            raise ValueError(f"Sem dados de {variable} no período {start_time} - {end_time}.")
+        with ExitStack() as stack:
+            parts = []
+            index = None
+            for path, rows in ranges:
+                key, opener = self._source(path)
+                handle = stack.enter_context(self._handles.acquire(key, path, opener))
+                index = handle.index
+                full = handle.dataset[variable]
+                chunks = self._region_chunks(full, index.time_name)
+                part = full.isel({index.time_name: rows})
+                part = self._slice_coord(part, index.lat.name, lat_min, lat_max)
+                part = self._slice_coord(part, index.lon.name, lon_min, lon_max)
+                parts.append(part.chunk({dim: min(size, part.sizes[dim]) for dim, size in chunks.items()}))
+            data = parts[0] if len(parts) == 1 else xr.concat(parts, dim=index.time_name)
+            yield data, index
+
+    def get_statistics(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        quantiles: Sequence[float] = (),
+        hist_bins: Optional[int] = None,
+    ) -> Dict:
+        """Estatísticas da região em uma leitura de cada chunk (ver ``region_statistics``)."""
+        with self._region_data(variable, start_time, end_time, lat_min, lat_max, lon_min, lon_max) as (data, _):
+            return region_statistics(data, quantiles=quantiles, hist_bins=hist_bins)
+
+    def get_spatial_average(
+        self,
+        variable: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        polygon: Optional[str] = None,
+        feature: Optional[str] = None,
+    ) -> Dict:
+        """Média espacial ponderada por área sobre o bbox e/ou um polígono de exposição."""
+        region = region_geometry(lat_min, lat_max, lon_min, lon_max, polygon, feature)
+        with self._region_data(variable, start_time, end_time) as (data, index):
+            weights = weight_mask_cache.get(region, index.lat.values, index.lon.values)
+            spatial_avg = weighted_spatial_mean(data, weights, index.lat.name, index.lon.name)
+        return {
+            "time": spatial_avg[index.time_name].values,
+            "values": spatial_avg.values,
+            "region": {
+                "polygon": polygon,
+                "feature": feature,
+                "cells": int(np.count_nonzero(weights)),
+                "weighting": "coverage*cos(lat)",
+            },
+        }
+
+    def get_grid_snapshot(
+        self,
+        variable: str,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Dict:
+        """Grade 2D do passo de tempo mais próximo, lida do NetCDF (layout por mapa)."""
+        path = self._require_timeline(variable).path_at(time)
+        snapshot, _ = self._read_snapshot(path, [variable], time, lat_min, lat_max, lon_min, lon_max)
+        return snapshot
+
+    def get_wind_hazard_snapshot(
+        self,
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> Dict:
+        """Velocidade (nós) e status do vento; direção NaN quando o arquivo não tem u10/v10."""
+        path = self._pick_wind_path(time, "mean")
+        candidates = ["sfcWind_corr", "sfcWind"]
+        snapshot, units = self._read_snapshot(path, candidates, time, lat_min, lat_max, lon_min, lon_max)
+        speed = np.asarray(snapshot["values"], dtype=float)
+        if units == "" or any(unit in units for unit in ("m/s", "m s-1", "meter per second", "metros/segundo")):
+            speed = speed * KNOTS_PER_MS
+
+        direction = np.full(speed.shape, np.nan)
+        if {"u10", "v10"} <= set(self._open(path).data_vars):
+            u10, _ = self._read_snapshot(path, ["u10"], time, lat_min, lat_max, lon_min, lon_max)
+            v10, _ = self._read_snapshot(path, ["v10"], time, lat_min, lat_max, lon_min, lon_max)
+            _, direction = wind_speed_direction(u10["values"], v10["values"])
+
+        return {
+            "lat": snapshot["lat"],
+            "lon": snapshot["lon"],
+            "values": speed,
+            "speed_knots": speed,
+            "direction_deg": direction,
+            "status": wind_status(speed, operational_limit_knots, attention_limit_knots),
+            "time": snapshot["time"],
+            "limits": {
+                "operational_max_knots": float(operational_limit_knots),
+                "attention_max_knots": float(attention_limit_knots),
+            },
+        }
+
+    @property
+    def paths(self) -> NetcdfPaths:
+        version = netcdf_catalog.current_version()
+        if self._paths is None or version != self._paths_version:
+            self._paths = NetcdfPaths()
+            self._paths_version = version
+        return self._paths
+
+    def _source(self, path: Path) -> Tuple[Hashable, Callable[[], xr.Dataset]]:
         if not path.exists():
             raise FileNotFoundError(
                 f"Arquivo NetCDF não encontrado: {path}. "
                 f"Configure NETCDF_BASE_DIR para o diretório raiz dos NetCDFs."
             )
-        if path not in self._cache:
-            self._cache[path] = xr.open_dataset(path)
-        return self._cache[path]
+        return (path, "netcdf"), lambda: xr.open_dataset(path)
+
+    def _point_source(self, path: Path) -> Tuple[Hashable, Callable[[], xr.Dataset]]:
+        """Origem para séries pontuais: point store time-major se estiver atualizado, senão o NetCDF.
+
+        A decisão vale para a versão do NetCDF e do ``.zmetadata`` do store: um store
+        reconstruído ou apagado troca a chave do handle (e volta ao NetCDF se sumiu).
+        """
+        key, opener = self._source(path)
+        signature = file_signature(path)
+        store = point_store_path(path, BASE_DIR, POINT_STORE_DIR)
+        store_signature = point_store_signature(store)
+        decision = self._point_sources.get(path)
+        if decision is None or decision[:2] != (signature, store_signature):
+            if store_signature is not None and is_point_store_current(path, store):
+                print(f"[NetcdfReader] Using time-major point store: {store}")
+                current = (signature, store_signature, store)
+            else:
+                current = (signature, store_signature, None)
+            if decision is not None and decision[2] is not None:
+                self._handles.discard((path, "point_store", decision[1]))
+            self._point_sources[path] = decision = current
+        if decision[2] is None:
+            return key, opener
+        return (path, "point_store", store_signature), lambda: open_point_store(store)
+
+    def _open(self, path: Path) -> xr.Dataset:
+        """Dataset do pool para consultar metadados; leituras de dados usam ``_handles.acquire``."""
+        key, opener = self._source(path)
+        return self._handles.get(key, path, opener).dataset
+
+    def handle_stats(self) -> Dict:
+        return self._handles.stats()
+
+    def _source_paths(self, hazard: str, stat: str, source: str) -> List[Path]:
+        """Arquivos de uma fonte: ``historical`` ou um cenário (só os preditivos)."""
+        if hazard == "wind":
+            if source == "historical":
+                return [self.paths.wind_hist_max if stat == "max" else self.paths.wind_hist_mean]
+            return [self._pick_wind_future_path(source, stat)]
+        if hazard == "wave":
+            if source == "historical":
+                return [self.paths.wave_hist_max if stat == "max" else self.paths.wave_hist_mean]
+            return self._pick_wave_future_paths(source, stat, 2015, 2060)
+        raise ValueError(f"Hazard não suportado: {hazard}")
+
+    def source_indexes(self, hazard: str, stat: str, source: str) -> List[Tuple[Path, DatasetIndex]]:
+        """Arquivos existentes de uma fonte, em ordem, com o índice de cada um."""
+        return self._indexes([path for path in self._source_paths(hazard, stat, source) if path.exists()])
+
+    @contextmanager
+    def read_source(self, path: Path) -> Iterator[DatasetHandle]:
+        """Handle de ``path`` (point store se atualizado, senão o NetCDF) com o lock de leitura adquirido."""
+        key, opener = self._point_source(path)
+        with self._handles.acquire(key, path, opener) as handle:
+            yield handle
+
+    def _indexes(self, paths: Sequence[Path]) -> List[Tuple[Path, DatasetIndex]]:
+        sources = []
+        for path in paths:
+            key, opener = self._point_source(path)
+            sources.append((path, self._handles.get(key, path, opener).index))
+        return sources
+
+    def _timeline_paths(self, hazard: str, stat: str, scenario: str) -> List[Path]:
+        paths = self._source_paths(hazard, stat, "historical")
+        if scenario != "historical":
+            paths.extend(self._source_paths(hazard, stat, scenario))
+        return paths
+
+    def timeline(self, hazard: str, stat: str = "mean", scenario: str = "ssp585") -> VirtualTimeline:
+        """Linha do tempo contínua (histórico + preditivo) de um hazard/estatística/cenário.
+
+        ``scenario="historical"`` restringe aos arquivos históricos. Reconstruída quando
+        algum arquivo muda em disco.
+        """
+        scenario_norm = (scenario or "ssp585").lower()
+        paths = [path for path in self._timeline_paths(hazard, stat, scenario_norm) if path.exists()]
+        if not paths:
+            raise FileNotFoundError(
+                f"Nenhum arquivo NetCDF encontrado para {hazard}/{stat}/{scenario_norm}. "
+                f"Configure NETCDF_BASE_DIR para o diretório raiz dos NetCDFs."
+            )
+        cache_key = (hazard, stat, scenario_norm)
+        version = tuple((path, file_signature(path)) for path in paths)
+        cached = self._timelines.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        timeline = VirtualTimeline.build(f"{hazard}/{stat}/{scenario_norm}", self._indexes(paths))
+        self._timelines[cache_key] = (version, timeline)
+        return timeline
+
+    def _read_timeline_points(
+        self,
+        timeline: VirtualTimeline,
+        candidates: Sequence[str],
+        lats: np.ndarray,
+        lons: np.ndarray,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        years: Optional[Tuple[int, int]] = None,
+        fallback_first: bool = False,
+    ) -> List[Tuple[Path, str, np.ndarray, np.ndarray]]:
+        """Lê os trechos (arquivo, linhas) do período em paralelo, um por arquivo.
+
+        Retorna, em ordem temporal, ``(arquivo, variável, matriz pontos x tempo, tempos)``.
+        """
+        if years is not None:
+            ranges = timeline.resolve_years(*years)
+        else:
+            ranges = timeline.resolve(start_time, end_time)
+
+        def read(item: Tuple[Path, slice]) -> Tuple[Path, str, np.ndarray, np.ndarray]:
+            path, rows = item
+            ds = self._open(path)
+            var_name = next((name for name in candidates if name in ds.data_vars), None)
+            if var_name is None:
+                if not fallback_first:
+                    raise KeyError(f"Nenhuma variável entre {list(candidates)} em {path}. Disponíveis: {list(ds.data_vars)}")
+                var_name = list(ds.data_vars)[0]
+            values, times = self._read_points(path, var_name, lats, lons, rows=rows)
+            matrix = np.vstack(values) if values else np.empty((0, times.size), dtype=float)
+            return path, var_name, matrix, times
+
+        if len(ranges) <= 1:
+            return [read(item) for item in ranges]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            return list(executor.map(read, ranges))
 
     @staticmethod
-    def _sanitize(values: np.ndarray):
-        arr = np.asarray(values)
-        arr = np.where(np.isfinite(arr), arr, np.nan)
-        data = arr.astype(object).tolist()
+    def _spatial_chunks(da: xr.DataArray, lat_name: str, lon_name: str) -> Tuple[int, int]:
+        """Tamanho de chunk em lat/lon no armazenamento (NetCDF4 ou Zarr)."""
+        chunks = da.encoding.get("chunksizes") or da.encoding.get("chunks")
+        if chunks is not None and len(chunks) == len(da.dims):
+            by_dim = dict(zip(da.dims, chunks))
+            return int(by_dim[lat_name]), int(by_dim[lon_name])
+        return int(da.sizes[lat_name]), int(da.sizes[lon_name])
+
+    def _read_points(
+        self,
+        path: Path,
+        var_name: str,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        years: Optional[Tuple[int, int]] = None,
+        rows: Optional[slice] = None,
+    ) -> Tuple[list[np.ndarray], np.ndarray]:
+        """Séries das células mais próximas de cada ponto, uma leitura por chunk espacial.
+
+        Retorna a lista de séries (uma por ponto, na ordem pedida) e o eixo temporal.
+        Células já em cache não são relidas; as demais são agrupadas por chunk e
+        lidas com indexação pontual, de modo que cada chunk é descomprimida uma vez.
+        A janela temporal é ``start_time``/``end_time``, ``years`` (ano inicial e final,
+        inclusivos) ou ``rows`` (linhas já resolvidas pela linha do tempo virtual).
+        """
+        key, opener = self._point_source(path)
+        with self._handles.acquire(key, path, opener) as handle:
+            return self._read_points_locked(handle, var_name, lats, lons, start_time, end_time, years, rows)
 
-        def replace(item):
-            if isinstance(item, list):
-                return [replace(x) for x in item]
-            if isinstance(item, float):
-                if np.isnan(item) or np.isinf(item):
-                    return None
-            return item
+    def _read_points_locked(
+        self,
+        handle: DatasetHandle,
+        var_name: str,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        start_time: Optional[str],
+        end_time: Optional[str],
+        years: Optional[Tuple[int, int]],
+        rows: Optional[slice],
+    ) -> Tuple[list[np.ndarray], np.ndarray]:
+        ds = handle.dataset
+        index = handle.index
+        da = ds[var_name]
+
+        lat_idx, lon_idx = index.snap(lats, lons)
+        if lat_idx.size != lon_idx.size:
+            raise ValueError("lats e lons devem ter o mesmo tamanho.")
+
+        if rows is not None:
+            window = ("rows", int(rows.start), int(rows.stop))
+        elif years is not None:
+            window = ("years", int(years[0]), int(years[1]))
+        else:
+            window = ("time", start_time, end_time)
+        cells = list(dict.fromkeys(zip(lat_idx.tolist(), lon_idx.tolist())))
+        resolved: Dict[Tuple[int, int], np.ndarray] = {}
+        missing: list[Tuple[int, int]] = []
+        for cell in cells:
+            cached = point_series_cache.get((handle.token, var_name, cell[0], cell[1], window))
+            if cached is None:
+                missing.append(cell)
+            else:
+                resolved[cell] = cached[0]
+
+        # O eixo temporal é o mesmo para todas as células: um item por (arquivo, janela).
+        times_key = (handle.token, window)
+        cached_times = point_series_cache.get(times_key)
+        if missing or cached_times is None:
+            if rows is not None:
+                time_slice = slice(int(rows.start), int(rows.stop))
+            elif years is not None:
+                time_slice = index.year_slice(int(years[0]), int(years[1]))
+            else:
+                time_slice = index.time_slice(start_time, end_time)
+        if cached_times is None:
+            times = point_series_cache.put(times_key, (np.array(ds[index.time_name].values[time_slice]),))[0]
+        else:
+            times = cached_times[0]
+
+        if missing:
+            chunk_lat, chunk_lon = self._spatial_chunks(da, index.lat_name, index.lon_name)
+            missing.sort(key=lambda cell: (cell[0] // chunk_lat, cell[1] // chunk_lon, cell))
+            groups: Dict[Tuple[int, int], list[Tuple[int, int]]] = {}
+            for cell in missing:
+                groups.setdefault((cell[0] // chunk_lat, cell[1] // chunk_lon), []).append(cell)
+
+            for group in groups.values():
+                iy = xr.DataArray([cell[0] for cell in group], dims="points")
+                ix = xr.DataArray([cell[1] for cell in group], dims="points")
+                block = da.isel({index.time_name: time_slice, index.lat_name: iy, index.lon_name: ix})
+                block_values = np.asarray(block.transpose("points", ...).values)
+                for row, cell in zip(block_values, group):
+                    key = (handle.token, var_name, cell[0], cell[1], window)
+                    resolved[cell] = point_series_cache.put(key, (row,))[0]
+
+        series = [resolved[cell] for cell in zip(lat_idx.tolist(), lon_idx.tolist())]
+        return series, times
+
+    def _read_point(
+        self,
+        path: Path,
+        var_name: str,
+        lat: float,
+        lon: float,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Série (valores, tempos) da célula mais próxima, servida pelo cache compartilhado."""
+        rows, times = self._read_points(path, var_name, np.array([lat]), np.array([lon]), start_time, end_time)
+        return rows[0], times
 
-        return replace(data)
+    def _read_point_years(
+        self,
+        path: Path,
+        var_name: str,
+        lat: float,
+        lon: float,
+        start_year: int,
+        end_year: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Série (valores, tempos) da célula mais próxima restrita a [start_year, end_year]."""
+        rows, times = self._read_points(
+            path, var_name, np.array([lat]), np.array([lon]), years=(start_year, end_year)
+        )
+        return rows[0], times
+
+    @staticmethod
+    def cache_stats() -> Dict:
+        return point_series_cache.stats()
 
     @staticmethod
     def _find_coord(ds: xr.Dataset, candidates: list[str]) -> str:
@@ -235,17 +791,8 @@ class NetcdfReader:
     def _select_time(da: xr.DataArray, time_value: str, time_name: str) -> xr.DataArray:
         return da.sel({time_name: time_value}, method="nearest")
 
-    def _parse_year(self, time_value: str) -> int:
-        try:
-            return datetime.fromisoformat(time_value.replace("Z", "")).year
-        except ValueError:
-            return int(time_value[:4])
-
     def _pick_wind_path(self, time_value: str, stat: str) -> Path:
-        year = self._parse_year(time_value)
-        if year < 2015:
-            return self.paths.wind_hist_max if stat == "max" else self.paths.wind_hist_mean
-        return self.paths.wind_pred_max if stat == "max" else self.paths.wind_pred_mean
+        return self.timeline("wind", stat).path_at(time_value)
 
     def _pick_wind_future_path(self, scenario: str, stat: str) -> Path:
         scenario_norm = (scenario or "ssp585").lower()
@@ -266,12 +813,41 @@ class NetcdfReader:
         return paths
 
     def _pick_wave_path(self, time_value: str, stat: str) -> Path:
-        year = self._parse_year(time_value)
-        if year < 2015:
-            return self.paths.wave_hist_max if stat == "max" else self.paths.wave_hist_mean
-        if year < 2031:
-            return self.paths.wave_pred_max_early if stat == "max" else self.paths.wave_pred_mean_early
-        return self.paths.wave_pred_max_late if stat == "max" else self.paths.wave_pred_mean_late
+        return self.timeline("wave", stat).path_at(time_value)
+
+    def _read_snapshot(
+        self,
+        path: Path,
+        candidates: Sequence[str],
+        time: str,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+    ) -> Tuple[Dict, str]:
+        """Grade do passo de tempo mais próximo (primeira variável existente entre ``candidates``) e suas unidades."""
+        key, opener = self._source(path)
+        with self._handles.acquire(key, path, opener) as handle:
+            ds = handle.dataset
+            time_name = self._find_coord(ds, ["time", "t"])
+            lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
+            lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
+
+            var_name = next((name for name in candidates if name in ds.data_vars), list(ds.data_vars)[0])
+            data = ds[var_name]
+            units = str(data.attrs.get("units", "")).lower()
+            data = self._select_time(data, time, time_name)
+            data = self._slice_coord(data, lat_name, lat_min, lat_max)
+            data = self._slice_coord(data, lon_name, lon_min, lon_max)
+            data = data.load()
+
+        snapshot = {
+            "lat": np.asarray(data[lat_name].values),
+            "lon": np.asarray(data[lon_name].values),
+            "values": data.values,
+            "time": str(data[time_name].values),
+        }
+        return snapshot, units
 
     def get_wind_snapshot(
         self,
@@ -283,24 +859,8 @@ class NetcdfReader:
         stat: str = "mean",
     ) -> Dict:
         path = self._pick_wind_path(time, stat)
-        ds = self._open(path)
-        time_name = self._find_coord(ds, ["time", "t"])
-        lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-        lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-
-        var_name = "sfcWind_corr" if "sfcWind_corr" in ds.data_vars else "sfcWind"
-        data = ds[var_name]
-        data = self._select_time(data, time, time_name)
-        data = self._slice_coord(data, lat_name, lat_min, lat_max)
-        data = self._slice_coord(data, lon_name, lon_min, lon_max)
-        data = data.load()
-
-        return {
-            "lat": self._sanitize(np.asarray(data[lat_name].values)),
-            "lon": self._sanitize(np.asarray(data[lon_name].values)),
-            "values": self._sanitize(data.values),
-            "time": str(data[time_name].values),
-        }
+        snapshot, _ = self._read_snapshot(path, ["sfcWind_corr", "sfcWind"], time, lat_min, lat_max, lon_min, lon_max)
+        return snapshot
 
     def get_wave_snapshot(
         self,
@@ -312,24 +872,8 @@ class NetcdfReader:
         stat: str = "mean",
     ) -> Dict:
         path = self._pick_wave_path(time, stat)
-        ds = self._open(path)
-        time_name = self._find_coord(ds, ["time", "t"])
-        lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-        lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-
-        var_name = "hs" if "hs" in ds.data_vars else list(ds.data_vars)[0]
-        data = ds[var_name]
-        data = self._select_time(data, time, time_name)
-        data = self._slice_coord(data, lat_name, lat_min, lat_max)
-        data = self._slice_coord(data, lon_name, lon_min, lon_max)
-        data = data.load()
-
-        return {
-            "lat": self._sanitize(np.asarray(data[lat_name].values)),
-            "lon": self._sanitize(np.asarray(data[lon_name].values)),
-            "values": self._sanitize(data.values),
-            "time": str(data[time_name].values),
-        }
+        snapshot, _ = self._read_snapshot(path, ["hs"], time, lat_min, lat_max, lon_min, lon_max)
+        return snapshot
 
     @staticmethod
     def _period_to_years(period: str) -> Tuple[int, int]:
@@ -409,6 +953,69 @@ class NetcdfReader:
             "stop_samples": int(np.sum(stop_mask)),
         }
 
+    @staticmethod
+    def _cube_summary(summary: Dict, scale: float, unit: str) -> Dict:
+        """Mesmo formato de ``_array_summary_*`` a partir do resumo gravado no cubo."""
+        samples = int(summary["samples"])
+        if samples == 0:
+            return {
+                "samples": 0,
+                f"mean_{unit}": 0.0,
+                f"p90_{unit}": 0.0,
+                f"p95_{unit}": 0.0,
+                f"max_{unit}": 0.0,
+                "operational_samples": 0,
+                "attention_samples": 0,
+                "stop_samples": 0,
+            }
+        at_or_above_op, at_or_above_att = (int(count) for count in summary["exceedance"])
+        return {
+            "samples": samples,
+            f"mean_{unit}": float(summary["mean"]) * scale,
+            f"p90_{unit}": float(summary["p90"]) * scale,
+            f"p95_{unit}": float(summary["p95"]) * scale,
+            f"max_{unit}": float(summary["max"]) * scale,
+            "operational_samples": samples - at_or_above_op,
+            "attention_samples": max(at_or_above_op - at_or_above_att, 0),
+            "stop_samples": at_or_above_att,
+        }
+
+    def _scenario_period(
+        self,
+        hazard: str,
+        stat: str,
+        source: str,
+        lat: float,
+        lon: float,
+        start_year: int,
+        end_year: int,
+        op_limit: float,
+        att_limit: float,
+        load: Callable[[], xr.DataArray],
+    ) -> Tuple[Dict, np.ndarray, np.ndarray, Dict[int, float]]:
+        """Resumo e médias anuais/mensais de um período em unidades de exibição.
+
+        Vem do cubo de climatologia quando ele cobre o período e os limites pedidos;
+        só então a série bruta (``load``, em unidades do arquivo) deixa de ser lida.
+        """
+        scale = DISPLAY_SCALE[hazard]
+        unit = "knots" if hazard == "wind" else "meters"
+        cube = climatology_store.lookup(
+            hazard, stat, source, lat, lon, start_year, end_year, thresholds=(op_limit, att_limit)
+        )
+        if cube is not None and cube.get("summary") is not None:
+            summary = self._cube_summary(cube["summary"], scale, unit)
+            series = None
+        else:
+            series = load() * scale
+            values = np.asarray(series.values)
+            if hazard == "wind":
+                summary = self._array_summary_knots(values, op_limit, att_limit)
+            else:
+                summary = self._array_summary_meters(values, op_limit, att_limit)
+        years, yearly, month_values = yearly_monthly_means(series, cube, scale)
+        return summary, years, yearly, month_values
+
     def _load_wave_point_period(
         self,
         *,
@@ -419,35 +1026,24 @@ class NetcdfReader:
         end_year: int,
         source: str,
     ) -> xr.DataArray:
-        if source == "historical":
-            paths = [self.paths.wave_hist_max if stat == "max" else self.paths.wave_hist_mean]
-        else:
-            paths = self._pick_wave_future_paths("ssp585", stat, start_year, end_year)
-
-        points: list[xr.DataArray] = []
-        for path in paths:
-            ds = self._open(path)
-            time_name = self._find_coord(ds, ["time", "t"])
-            lat_name = self._find_coord(ds, ["lat", "latitude", "y"])
-            lon_name = self._find_coord(ds, ["lon", "longitude", "x"])
-            var_name = "hs" if "hs" in ds.data_vars else list(ds.data_vars)[0]
-
-            point = ds[var_name].sel({lat_name: lat, lon_name: lon}, method="nearest")
-            time_values = point[time_name]
-            mask = (time_values.dt.year >= start_year) & (time_values.dt.year <= end_year)
-            filtered = point.where(mask, drop=True).load()
-            if filtered.sizes.get(time_name, 0) > 0:
-                points.append(filtered)
+        timeline = self.timeline("wave", stat, "historical" if source == "historical" else "ssp585")
+        segments = self._read_timeline_points(
+            timeline,
+            ["hs"],
+            np.array([lat]),
+            np.array([lon]),
+            years=(start_year, end_year),
+            fallback_first=True,
+        )
+        segments = [segment for segment in segments if segment[3].size > 0]
 
-        if not points:
+        if not segments:
             empty_time = np.array([], dtype="datetime64[ns]")
             return xr.DataArray(np.array([], dtype=float), coords={"time": empty_time}, dims=["time"])
 
-        if len(points) == 1:
-            return points[0]
-
-        combined = xr.concat(points, dim="time")
-        return combined.sortby("time")
+        values = np.concatenate([matrix[0] for _, _, matrix, _ in segments])
+        times = np.concatenate([times for _, _, _, times in segments])
+        return xr.DataArray(values, coords={"time": times}, dims=["time"])
 
     def get_wind_scenario_comparison(
         self,
@@ -469,54 +1065,23 @@ class NetcdfReader:
         hist_path = self.paths.wind_hist_max if stat == "max" else self.paths.wind_hist_mean
         fut_path = self._pick_wind_future_path(scenario, stat)
 
-        hist_ds = self._open(hist_path)
-        fut_ds = self._open(fut_path)
-
-        hist_time_name = self._find_coord(hist_ds, ["time", "t"])
-        hist_lat_name = self._find_coord(hist_ds, ["lat", "latitude", "y"])
-        hist_lon_name = self._find_coord(hist_ds, ["lon", "longitude", "x"])
-
-        fut_time_name = self._find_coord(fut_ds, ["time", "t"])
-        fut_lat_name = self._find_coord(fut_ds, ["lat", "latitude", "y"])
-        fut_lon_name = self._find_coord(fut_ds, ["lon", "longitude", "x"])
-
-        hist_var = "sfcWind_corr" if "sfcWind_corr" in hist_ds.data_vars else "sfcWind"
-        fut_var = "sfcWind_corr" if "sfcWind_corr" in fut_ds.data_vars else "sfcWind"
-
-        hist_point = hist_ds[hist_var].sel({hist_lat_name: lat, hist_lon_name: lon}, method="nearest")
-        fut_point = fut_ds[fut_var].sel({fut_lat_name: lat, fut_lon_name: lon}, method="nearest")
-
-        hist_time_values = hist_point[hist_time_name]
-        fut_time_values = fut_point[fut_time_name]
-
-        hist_mask = (hist_time_values.dt.year >= hist_start) & (hist_time_values.dt.year <= hist_end)
-        fut_mask = (fut_time_values.dt.year >= fut_start) & (fut_time_values.dt.year <= fut_end)
-
-        hist_filtered = hist_point.where(hist_mask, drop=True).load()
-        fut_filtered = fut_point.where(fut_mask, drop=True).load()
-
-        to_knots = 1.9438444924406
-        hist_values_knots = np.asarray(hist_filtered.values) * to_knots
-        fut_values_knots = np.asarray(fut_filtered.values) * to_knots
-
-        hist_summary = self._array_summary_knots(hist_values_knots, operational_max_knots, attention_max_knots)
-        fut_summary = self._array_summary_knots(fut_values_knots, operational_max_knots, attention_max_knots)
-
-        hist_yearly = (hist_filtered * to_knots).groupby(f"{hist_time_name}.year").mean(skipna=True)
-        fut_yearly = (fut_filtered * to_knots).groupby(f"{fut_time_name}.year").mean(skipna=True)
-        hist_monthly = (hist_filtered * to_knots).groupby(f"{hist_time_name}.month").mean(skipna=True)
-        fut_monthly = (fut_filtered * to_knots).groupby(f"{fut_time_name}.month").mean(skipna=True)
-
-        hist_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(hist_monthly["month"].values), np.asarray(hist_monthly.values))
-            if np.isfinite(value)
-        }
-        fut_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(fut_monthly["month"].values), np.asarray(fut_monthly.values))
-            if np.isfinite(value)
-        }
+        def load(path: Path, start_year: int, end_year: int) -> Callable[[], xr.DataArray]:
+            def read() -> xr.DataArray:
+                ds = self._open(path)
+                var_name = "sfcWind_corr" if "sfcWind_corr" in ds.data_vars else "sfcWind"
+                values, times = self._read_point_years(path, var_name, lat, lon, start_year, end_year)
+                return xr.DataArray(values, coords={"time": times}, dims=["time"])
+            return read
+
+        # Resumo e médias do cubo de climatologia; série bruta só se o cubo não cobrir o pedido
+        hist_summary, hist_years, hist_yearly, hist_month_values = self._scenario_period(
+            "wind", stat, "historical", lat, lon, hist_start, hist_end,
+            operational_max_knots, attention_max_knots, load(hist_path, hist_start, hist_end),
+        )
+        fut_summary, fut_years, fut_yearly, fut_month_values = self._scenario_period(
+            "wind", stat, scenario.lower(), lat, lon, fut_start, fut_end,
+            operational_max_knots, attention_max_knots, load(fut_path, fut_start, fut_end),
+        )
 
         return {
             "meta": {
@@ -537,10 +1102,10 @@ class NetcdfReader:
                 "stop_samples": int(fut_summary["stop_samples"] - hist_summary["stop_samples"]),
             },
             "series": {
-                "historical_years": self._sanitize(np.asarray(hist_yearly["year"].values)),
-                "historical_yearly_mean_knots": self._sanitize(np.asarray(hist_yearly.values)),
-                "future_years": self._sanitize(np.asarray(fut_yearly["year"].values)),
-                "future_yearly_mean_knots": self._sanitize(np.asarray(fut_yearly.values)),
+                "historical_years": hist_years,
+                "historical_yearly_mean_knots": hist_yearly,
+                "future_years": fut_years,
+                "future_yearly_mean_knots": fut_yearly,
                 "monthly_labels": [f"{month:02d}" for month in range(1, 13)],
                 "historical_monthly_mean_knots": [hist_month_values.get(month) for month in range(1, 13)],
                 "future_monthly_mean_knots": [fut_month_values.get(month) for month in range(1, 13)],
@@ -564,45 +1129,21 @@ class NetcdfReader:
         hist_start, hist_end = self._period_to_years(historical_period)
         fut_start, fut_end = self._period_to_years(future_period)
 
-        hist_filtered = self._load_wave_point_period(
-            lat=lat,
-            lon=lon,
-            stat=stat,
-            start_year=hist_start,
-            end_year=hist_end,
-            source="historical",
+        def load(start_year: int, end_year: int, source: str) -> Callable[[], xr.DataArray]:
+            return lambda: self._load_wave_point_period(
+                lat=lat, lon=lon, stat=stat, start_year=start_year, end_year=end_year, source=source
+            )
+
+        # Resumo e médias do cubo de climatologia; série bruta só se o cubo não cobrir o pedido
+        hist_summary, hist_years, hist_yearly, hist_month_values = self._scenario_period(
+            "wave", stat, "historical", lat, lon, hist_start, hist_end,
+            operational_max_meters, attention_max_meters, load(hist_start, hist_end, "historical"),
         )
-        fut_filtered = self._load_wave_point_period(
-            lat=lat,
-            lon=lon,
-            stat=stat,
-            start_year=fut_start,
-            end_year=fut_end,
-            source="future",
+        fut_summary, fut_years, fut_yearly, fut_month_values = self._scenario_period(
+            "wave", stat, scenario.lower(), lat, lon, fut_start, fut_end,
+            operational_max_meters, attention_max_meters, load(fut_start, fut_end, "future"),
         )
 
-        hist_values_meters = np.asarray(hist_filtered.values)
-        fut_values_meters = np.asarray(fut_filtered.values)
-
-        hist_summary = self._array_summary_meters(hist_values_meters, operational_max_meters, attention_max_meters)
-        fut_summary = self._array_summary_meters(fut_values_meters, operational_max_meters, attention_max_meters)
-
-        hist_yearly = hist_filtered.groupby("time.year").mean(skipna=True)
-        fut_yearly = fut_filtered.groupby("time.year").mean(skipna=True)
-        hist_monthly = hist_filtered.groupby("time.month").mean(skipna=True)
-        fut_monthly = fut_filtered.groupby("time.month").mean(skipna=True)
-
-        hist_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(hist_monthly["month"].values), np.asarray(hist_monthly.values))
-            if np.isfinite(value)
-        }
-        fut_month_values = {
-            int(month): float(value)
-            for month, value in zip(np.asarray(fut_monthly["month"].values), np.asarray(fut_monthly.values))
-            if np.isfinite(value)
-        }
-
         return {
             "meta": {
                 "scenario": scenario.lower(),
@@ -622,10 +1163,10 @@ class NetcdfReader:
                 "stop_samples": int(fut_summary["stop_samples"] - hist_summary["stop_samples"]),
             },
             "series": {
-                "historical_years": self._sanitize(np.asarray(hist_yearly["year"].values)),
-                "historical_yearly_mean_meters": self._sanitize(np.asarray(hist_yearly.values)),
-                "future_years": self._sanitize(np.asarray(fut_yearly["year"].values)),
-                "future_yearly_mean_meters": self._sanitize(np.asarray(fut_yearly.values)),
+                "historical_years": hist_years,
+                "historical_yearly_mean_meters": hist_yearly,
+                "future_years": fut_years,
+                "future_yearly_mean_meters": fut_yearly,
                 "monthly_labels": [f"{month:02d}" for month in range(1, 13)],
                 "historical_monthly_mean_meters": [hist_month_values.get(month) for month in range(1, 13)],
                 "future_monthly_mean_meters": [fut_month_values.get(month) for month in range(1, 13)],
@@ -0,0 +1,89 @@
+"""Virtual, continuous time axis stitched over the historical and predictive NetCDF files.
+
+A hazard/stat/scenario combination is split across ``*_hist_*``, ``*_2015_2030``
+and ``*_2031_2060`` (or a single predictive file for wind). ``VirtualTimeline``
+orders those files by their first time step, trims overlaps (the later file
+wins, matching the year >= 2015 rule of the readers) and resolves any period to
+the exact (file, row range) pairs that cover it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .netcdf_index import DatasetIndex
+
+
+@dataclass(frozen=True)
+class TimelineSegment:
+    path: Path
+    index: DatasetIndex
+    rows: slice
+
+    @property
+    def start_time(self):
+        return self.index.time_index[self.rows.start]
+
+    @property
+    def end_time(self):
+        return self.index.time_index[self.rows.stop - 1]
+
+
+def _time_key(value) -> str:
+    """ISO sem fuso, comparável entre datetime64 e cftime."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat().split("+")[0]
+    return str(value)
+
+
+class VirtualTimeline:
+    def __init__(self, name: str, segments: Sequence[TimelineSegment]) -> None:
+        self.name = name
+        self.segments: List[TimelineSegment] = list(segments)
+
+    @classmethod
+    def build(cls, name: str, sources: Sequence[Tuple[Path, DatasetIndex]]) -> "VirtualTimeline":
+        """Ordena os arquivos pelo primeiro passo de tempo e corta as sobreposições."""
+        ordered = sorted(
+            ((path, index) for path, index in sources if len(index.time_index) > 0),
+            key=lambda item: _time_key(item[1].time_index[0]),
+        )
+        segments: List[TimelineSegment] = []
+        for position, (path, index) in enumerate(ordered):
+            stop = len(index.time_index)
+            if position + 1 < len(ordered):
+                next_start = _time_key(ordered[position + 1][1].time_index[0])
+                stop = min(stop, int(index.time_index.get_slice_bound(next_start, "left")))
+            if stop > 0:
+                segments.append(TimelineSegment(path=path, index=index, rows=slice(0, stop)))
+        return cls(name, segments)
+
+    @property
+    def size(self) -> int:
+        return sum(segment.rows.stop - segment.rows.start for segment in self.segments)
+
+    def resolve(self, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Tuple[Path, slice]]:
+        """Pares (arquivo, linhas) que cobrem [start_time, end_time], em ordem temporal."""
+        ranges: List[Tuple[Path, slice]] = []
+        for segment in self.segments:
+            window = segment.index.time_slice(start_time, end_time)
+            lo = max(window.start if window.start is not None else 0, segment.rows.start)
+            hi = min(window.stop if window.stop is not None else segment.rows.stop, segment.rows.stop)
+            if hi > lo:
+                ranges.append((segment.path, slice(int(lo), int(hi))))
+        return ranges
+
+    def resolve_years(self, start_year: int, end_year: int) -> List[Tuple[Path, slice]]:
+        return self.resolve(f"{int(start_year):04d}", f"{int(end_year):04d}")
+
+    def path_at(self, time_value: str) -> Path:
+        """Arquivo que contém ``time_value`` (o mais próximo se estiver fora da cobertura)."""
+        if not self.segments:
+            raise FileNotFoundError(f"Nenhum arquivo disponível para '{self.name}'.")
+        for segment in self.segments:
+            bound = int(segment.index.time_index.get_slice_bound(time_value, "left"))
+            if bound < segment.rows.stop:
+                return segment.path
+        return self.segments[-1].path
@@ -1,7 +1,10 @@
 import os
 import xarray as xr
+from pathlib import Path
 from typing import Optional
 
+from .netcdf_catalog import netcdf_catalog
+
 
 def _find_coord(ds: xr.Dataset, candidates: list[str]) -> str:
     for name in candidates:
@@ -21,6 +24,10 @@ def get_netcdf_series(file_path: str, variable: str, lat: float, lon: float):
 
 def find_netcdf_file(base_dir: str, hazard: str, period: str):
     # Exemplo: hazard='onda' ou 'vento', period='historico', etc
+    # Acervo catalogado: resolve pelo manifesto, sem varrer o disco
+    if Path(base_dir) == netcdf_catalog.base_dir:
+        for entry in netcdf_catalog.find(period=period, hazard=hazard):
+            return str(netcdf_catalog.resolve(entry))
     # Busca arquivos NetCDF na estrutura esperada
     for root, dirs, files in os.walk(os.path.join(base_dir, period, hazard)):
         for file in files:
@@ -0,0 +1,102 @@
+"""Shared, memory-bounded LRU cache for point time series extracted from NetCDF files."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+CacheValue = Tuple[np.ndarray, ...]
+
+
+class PointSeriesCache:
+    """LRU cache of read-only arrays with a byte budget and hit/miss/eviction counters.
+
+    Keys are expected to be ``(file, variable, lat_idx, lon_idx, time_window)``, i.e. the
+    grid cell already snapped to its index, so that nearby coordinates share one entry;
+    the time axis of a window is stored once, under ``(file, time_window)``. ``put`` takes
+    ownership of the arrays (they are made read-only, not copied), so callers must not
+    write to them afterwards.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = int(max(max_bytes, 0))
+        self._entries: "OrderedDict[Hashable, Tuple[CacheValue, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _freeze(arrays: CacheValue) -> Tuple[CacheValue, int]:
+        # O cache passa a ser dono dos arrays: marca somente leitura em vez de copiar.
+        frozen = []
+        nbytes = 0
+        for arr in arrays:
+            item = np.asarray(arr)
+            item.setflags(write=False)
+            nbytes += int(item.nbytes)
+            frozen.append(item)
+        return tuple(frozen), nbytes
+
+    def get(self, key: Hashable) -> Optional[CacheValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, arrays: CacheValue) -> CacheValue:
+        frozen, nbytes = self._freeze(arrays)
+        if nbytes > self.max_bytes:
+            # Larger than the whole budget: hand it back without caching.
+            return frozen
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (frozen, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.evictions += 1
+        return frozen
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], CacheValue]) -> CacheValue:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, loader())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": int(self._bytes),
+                "max_bytes": int(self.max_bytes),
+                "hits": int(self.hits),
+                "misses": int(self.misses),
+                "evictions": int(self.evictions),
+                "hit_ratio": float(self.hits / lookups) if lookups else 0.0,
+            }
+
+
+point_series_cache = PointSeriesCache(
+    max_bytes=int(float(os.getenv("NETCDF_POINT_CACHE_MB", "256")) * 1024 * 1024)
+)
@@ -0,0 +1,128 @@
+"""Time-major (point-optimized) Zarr copies of the NetCDF archives.
+
+The original NetCDF files are written map-first (one time step per chunk), so
+extracting 30+ years for a single cell touches thousands of chunks. The point
+store keeps the same variables and coordinates, but each chunk holds the full
+time axis for a small lat/lon tile: a point series becomes a single chunk read.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import xarray as xr
+
+try:
+    from numcodecs import Blosc  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    Blosc = None
+
+
+DEFAULT_TILE = int(os.getenv("NETCDF_POINT_STORE_TILE", "8"))
+DEFAULT_CLEVEL = int(os.getenv("NETCDF_POINT_STORE_CLEVEL", "5"))
+
+
+def point_store_path(nc_path: Path, base_dir: Path, store_dir: Path) -> Path:
+    """Map a NetCDF file to its point-store location, mirroring the archive layout."""
+    try:
+        relative = Path(nc_path).relative_to(base_dir)
+    except ValueError:
+        relative = Path(Path(nc_path).name)
+    return Path(store_dir) / relative.with_suffix(".zarr")
+
+
+def is_point_store_current(nc_path: Path, store_path: Path) -> bool:
+    """True when the store exists and was built from the current version of the file."""
+    if not store_path.exists() or not (store_path / ".zmetadata").exists():
+        return False
+    try:
+        with xr.open_zarr(str(store_path), consolidated=True, chunks=None) as ds:
+            source_mtime = float(ds.attrs.get("point_store_source_mtime", -1.0))
+            source_size = int(ds.attrs.get("point_store_source_size", -1))
+    except Exception:
+        return False
+    if not nc_path.exists():
+        return True
+    stat = nc_path.stat()
+    return source_size == int(stat.st_size) and source_mtime >= float(stat.st_mtime)
+
+
+def build_point_store(
+    nc_path: Path,
+    store_path: Path,
+    *,
+    tile: int = DEFAULT_TILE,
+    clevel: int = DEFAULT_CLEVEL,
+    overwrite: bool = False,
+) -> Dict[str, object]:
+    """Rewrite ``nc_path`` into a time-major Zarr store (full time axis per chunk)."""
+    nc_path = Path(nc_path)
+    store_path = Path(store_path)
+    if not nc_path.exists():
+        raise FileNotFoundError(f"Arquivo NetCDF não encontrado: {nc_path}")
+    if store_path.exists() and not overwrite and is_point_store_current(nc_path, store_path):
+        return {"source": str(nc_path), "store": str(store_path), "skipped": True}
+
+    stat = nc_path.stat()
+    tmp_path = store_path.with_name(store_path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with xr.open_dataset(nc_path) as source:
+        time_name = next((name for name in ("time", "t") if name in source.dims), None)
+        if time_name is None:
+            raise KeyError(f"Dimensão temporal não encontrada em {nc_path}")
+
+        target_chunks = {
+            dim: (-1 if dim == time_name else min(int(tile), int(size)))
+            for dim, size in source.sizes.items()
+        }
+        ds = source.chunk(target_chunks)
+
+        encoding: Dict[str, Dict] = {}
+        for name, var in ds.data_vars.items():
+            var_chunks = tuple(
+                int(size) if dim == time_name else min(int(tile), int(size))
+                for dim, size in zip(var.dims, var.shape)
+            )
+            var_encoding: Dict[str, object] = {"chunks": var_chunks}
+            if Blosc is not None:
+                var_encoding["compressor"] = Blosc(cname="zstd", clevel=int(clevel), shuffle=Blosc.BITSHUFFLE)
+            encoding[name] = var_encoding
+            ds[name].encoding = {}
+        for name in ds.coords:
+            ds[name].encoding = {k: v for k, v in ds[name].encoding.items() if k in {"units", "calendar", "dtype"}}
+
+        ds.attrs = {
+            **source.attrs,
+            "point_store_source": str(nc_path),
+            "point_store_source_mtime": float(stat.st_mtime),
+            "point_store_source_size": int(stat.st_size),
+            "point_store_tile": int(tile),
+        }
+        ds.to_zarr(str(tmp_path), mode="w", encoding=encoding, consolidated=True)
+
+    if store_path.exists():
+        shutil.rmtree(store_path)
+    tmp_path.rename(store_path)
+    return {"source": str(nc_path), "store": str(store_path), "skipped": False}
+
+
+def point_store_signature(store_path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of the store's ``.zmetadata``; changes whenever the store is rebuilt."""
+    try:
+        stat = (Path(store_path) / ".zmetadata").stat()
+    except OSError:
+        return None
+    return int(stat.st_mtime_ns), int(stat.st_size)
+
+
+def open_point_store(store_path: Path) -> xr.Dataset:
+    """Open a point store lazily (no dask), so a cell read decodes only its tile."""
+    if not (Path(store_path) / ".zmetadata").exists():
+        raise FileNotFoundError(f"Point store não encontrado: {store_path}")
+    return xr.open_zarr(str(store_path), consolidated=True, chunks=None)
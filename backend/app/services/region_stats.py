@@ -0,0 +1,211 @@
+"""Single-pass region statistics over lazy (dask-backed) cubes.
+
+``region_statistics`` summarizes every chunk once (count, mean, M2, min, max,
+an optional fixed-edge histogram and a small weighted quantile sketch; a
+histogram with only a bin count first takes one min/max pass for its edges) and
+merges the partial summaries pairwise with Chan et al.'s parallel update of the
+Welford moments. The chunk summaries are independent dask tasks, so the work is
+spread across the scheduler's workers (the local cluster for large regions, see
+``compute_cluster``) and a bounding-box query reads each chunk
+once instead of once per statistic.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import xarray as xr
+
+from .compute_cluster import compute_cluster
+
+try:
+    import dask
+    import dask.array as dsa
+except ImportError:  # pragma: no cover - optional dependency
+    dask = None
+    dsa = None
+
+
+SKETCH_SIZE = 2048
+SPLIT_EVERY = 8
+SKETCH_OVERSAMPLE = 8
+
+
+@dataclass
+class BlockSummary:
+    """Resumo mesclável de um bloco: momentos de Welford, extremos, histograma e sketch de quantis."""
+
+    count: int
+    mean: float
+    m2: float
+    minimum: float
+    maximum: float
+    hist_counts: Optional[np.ndarray] = None
+    sketch_values: Optional[np.ndarray] = None
+    sketch_weights: Optional[np.ndarray] = None
+
+
+def _compress_sketch(values: np.ndarray, weights: np.ndarray, size: int):
+    """Reduz o sketch a ``size`` pontos de mesmo peso nos quantis de peso acumulado."""
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    weights = weights[order]
+    if values.size <= size:
+        return values, weights
+    cumulative = np.cumsum(weights)
+    total = cumulative[-1]
+    targets = (np.arange(size) + 0.5) * (total / size)
+    picked = values[np.minimum(np.searchsorted(cumulative, targets), values.size - 1)]
+    return picked, np.full(size, total / size)
+
+
+def summarize_block(
+    block: np.ndarray,
+    hist_edges: Optional[np.ndarray] = None,
+    sketch_size: int = 0,
+) -> BlockSummary:
+    values = np.asarray(block, dtype=np.float64).ravel()
+    values = values[np.isfinite(values)]
+    hist_counts = None
+    if hist_edges is not None:
+        hist_counts = np.histogram(values, bins=hist_edges)[0].astype(np.int64)
+    if values.size == 0:
+        return BlockSummary(0, 0.0, 0.0, np.inf, -np.inf, hist_counts)
+
+    mean = float(values.mean())
+    sketch_values = sketch_weights = None
+    if sketch_size:
+        sample = values
+        if values.size > SKETCH_OVERSAMPLE * sketch_size:
+            # Subamostra uniforme antes de ordenar: o sketch não precisa do bloco inteiro.
+            picks = np.random.default_rng(values.size).integers(0, values.size, SKETCH_OVERSAMPLE * sketch_size)
+            sample = values[picks]
+        sketch_values, sketch_weights = _compress_sketch(sample, np.full(sample.size, values.size / sample.size), sketch_size)
+    return BlockSummary(
+        count=int(values.size),
+        mean=mean,
+        m2=float(np.square(values - mean).sum()),
+        minimum=float(values.min()),
+        maximum=float(values.max()),
+        hist_counts=hist_counts,
+        sketch_values=sketch_values,
+        sketch_weights=sketch_weights,
+    )
+
+
+def merge_summaries(summaries: Sequence[BlockSummary], sketch_size: int = SKETCH_SIZE) -> BlockSummary:
+    """Mescla resumos parciais (atualização paralela de Chan para média/M2)."""
+    count, mean, m2 = 0, 0.0, 0.0
+    minimum, maximum = np.inf, -np.inf
+    hist_counts = None
+    sketch_values: List[np.ndarray] = []
+    sketch_weights: List[np.ndarray] = []
+    for item in summaries:
+        if item.hist_counts is not None:
+            hist_counts = item.hist_counts.copy() if hist_counts is None else hist_counts + item.hist_counts
+        if item.count == 0:
+            continue
+        total = count + item.count
+        delta = item.mean - mean
+        mean += delta * item.count / total
+        m2 += item.m2 + delta * delta * count * item.count / total
+        count = total
+        minimum = min(minimum, item.minimum)
+        maximum = max(maximum, item.maximum)
+        if item.sketch_values is not None:
+            sketch_values.append(item.sketch_values)
+            sketch_weights.append(item.sketch_weights)
+
+    merged_values = merged_weights = None
+    if sketch_values:
+        merged_values, merged_weights = _compress_sketch(
+            np.concatenate(sketch_values), np.concatenate(sketch_weights), sketch_size
+        )
+    return BlockSummary(count, mean, m2, minimum, maximum, hist_counts, merged_values, merged_weights)
+
+
+def _sketch_quantiles(summary: BlockSummary, quantiles: Sequence[float]) -> np.ndarray:
+    values, weights = summary.sketch_values, summary.sketch_weights
+    if values is None or values.size == 0:
+        return np.full(len(quantiles), np.nan)
+    # Posição de cada ponto no meio do seu peso, limitada pelos extremos exatos.
+    cumulative = (np.cumsum(weights) - 0.5 * weights) / weights.sum()
+    positions = np.concatenate([[0.0], cumulative, [1.0]])
+    points = np.concatenate([[summary.minimum], values, [summary.maximum]])
+    return np.interp(np.asarray(quantiles, dtype=float), positions, points)
+
+
+def _tree_reduce(parts: List, sketch_size: int, split_every: int):
+    merge = dask.delayed(merge_summaries, pure=True)
+    while len(parts) > 1:
+        parts = [
+            merge(parts[start:start + split_every], sketch_size)
+            for start in range(0, len(parts), split_every)
+        ]
+    return parts[0]
+
+
+def _summarize(array, hist_edges: Optional[np.ndarray], block_sketch: int, sketch_size: int, split_every: int) -> BlockSummary:
+    """Resumo de todos os chunks (tarefas dask com redução em árvore) ou do array em memória."""
+    if dsa is not None and isinstance(array, dsa.Array):
+        blocks = array.to_delayed().ravel().tolist()
+        summarize = dask.delayed(summarize_block, pure=True)
+        parts = [summarize(block, hist_edges, block_sketch) for block in blocks]
+        (summary,) = compute_cluster.compute(
+            _tree_reduce(parts, sketch_size, max(int(split_every), 2)), nbytes=array.nbytes
+        )
+        return summary
+    return merge_summaries([summarize_block(np.asarray(array), hist_edges, block_sketch)], sketch_size)
+
+
+def region_statistics(
+    data: Union[xr.DataArray, np.ndarray],
+    quantiles: Sequence[float] = (),
+    hist_bins: Optional[Union[int, Sequence[float]]] = None,
+    hist_range: Optional[Sequence[float]] = None,
+    sketch_size: int = SKETCH_SIZE,
+    split_every: int = SPLIT_EVERY,
+) -> Dict:
+    """mean/min/max/std (e, opcionalmente, quantis e histograma) em uma única leitura de cada chunk.
+
+    O histograma é sempre exato por chunk: com bordas explícitas, contagem + ``hist_range``
+    ou, só com a contagem, bordas entre o mínimo e o máximo de uma primeira passada
+    (min/max) pelos mesmos chunks.
+    """
+    array = data.data if isinstance(data, xr.DataArray) else data
+    quantiles = [float(q) for q in quantiles]
+    block_sketch = sketch_size if quantiles else 0
+
+    hist_edges = None
+    if hist_bins is not None and not np.isscalar(hist_bins):
+        hist_edges = np.asarray(hist_bins, dtype=float)
+    elif hist_bins is not None:
+        if hist_range is None:
+            extent = _summarize(array, None, 0, sketch_size, split_every)
+            hist_range = (extent.minimum, extent.maximum) if extent.count else None
+        if hist_range is not None:
+            # Faixa degenerada (min == max) vira +-0.5, como no np.histogram
+            hist_edges = np.histogram_bin_edges(
+                np.array([], dtype=float), bins=int(hist_bins), range=(float(hist_range[0]), float(hist_range[1]))
+            )
+
+    summary = _summarize(array, hist_edges, block_sketch, sketch_size, split_every)
+
+    empty = summary.count == 0
+    result: Dict = {
+        "mean": float(summary.mean) if not empty else float("nan"),
+        "min": float(summary.minimum) if not empty else float("nan"),
+        "max": float(summary.maximum) if not empty else float("nan"),
+        "std": float(np.sqrt(summary.m2 / summary.count)) if not empty else float("nan"),
+        "count": int(summary.count),
+    }
+    if quantiles:
+        result["quantiles"] = dict(zip((f"p{q * 100:g}" for q in quantiles), _sketch_quantiles(summary, quantiles)))
+    if hist_edges is not None:
+        result["histogram"] = {"edges": hist_edges, "counts": summary.hist_counts, "approximate": False}
+    elif hist_bins is not None:
+        # Sem nenhum valor válido não há faixa para as bordas
+        result["histogram"] = {"edges": np.array([]), "counts": np.array([], dtype=np.int64), "approximate": False}
+    return result
@@ -0,0 +1,180 @@
+"""Area-weighted spatial aggregation over a bbox or an exposure polygon.
+
+``coverage_fraction`` rasterizes a polygon onto a regular lat/lon grid as the
+fraction of each cell it covers (exact cell/polygon intersection on the
+boundary, 1 for cells fully inside), multiplied by ``cos(lat)`` so every cell
+counts by its area. Masks are cached per (geometry, grid), so repeated queries
+for the same field/bloco only pay for the weighted reduction, which runs
+chunk by chunk on dask (on the local cluster when the region is large).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import shapely
+import xarray as xr
+
+from .compute_cluster import compute_cluster
+from .exposure_registry import exposure_registry
+
+
+MASK_CACHE_SIZE = 32
+
+
+def cell_edges(centers: np.ndarray) -> np.ndarray:
+    """Bordas das células a partir dos centros (pontos médios; extremos espelhados)."""
+    centers = np.asarray(centers, dtype=float)
+    if centers.size == 1:
+        return np.array([centers[0] - 0.5, centers[0] + 0.5])
+    middle = (centers[:-1] + centers[1:]) / 2.0
+    return np.concatenate([[2 * centers[0] - middle[0]], middle, [2 * centers[-1] - middle[-1]]])
+
+
+def coverage_fraction(geometry, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Fração de cada célula (lat, lon) coberta pela geometria, em [0, 1]."""
+    lat_edges = cell_edges(lat)
+    lon_edges = cell_edges(lon)
+    lat_low = np.minimum(lat_edges[:-1], lat_edges[1:])
+    lat_high = np.maximum(lat_edges[:-1], lat_edges[1:])
+    lon_low = np.minimum(lon_edges[:-1], lon_edges[1:])
+    lon_high = np.maximum(lon_edges[:-1], lon_edges[1:])
+
+    coverage = np.zeros((lat_low.size, lon_low.size), dtype=float)
+    if geometry is None or geometry.is_empty:
+        return coverage
+
+    # Só as células que tocam o bbox da geometria.
+    min_lon, min_lat, max_lon, max_lat = geometry.bounds
+    rows = np.flatnonzero((lat_high > min_lat) & (lat_low < max_lat))
+    cols = np.flatnonzero((lon_high > min_lon) & (lon_low < max_lon))
+    if rows.size == 0 or cols.size == 0:
+        return coverage
+
+    row_grid, col_grid = np.meshgrid(rows, cols, indexing="ij")
+    boxes = shapely.box(lon_low[col_grid], lat_low[row_grid], lon_high[col_grid], lat_high[row_grid])
+    shapely.prepare(geometry)
+    touching = shapely.intersects(geometry, boxes)
+    inside = touching & shapely.contains_properly(geometry, boxes)
+    boundary = touching & ~inside
+
+    fraction = inside.astype(float)
+    if boundary.any():
+        clipped = shapely.intersection(boxes[boundary], geometry)
+        fraction[boundary] = shapely.area(clipped) / shapely.area(boxes[boundary])
+    coverage[row_grid, col_grid] = np.clip(fraction, 0.0, 1.0)
+    return coverage
+
+
+def area_weights(lat: np.ndarray, coverage: np.ndarray) -> np.ndarray:
+    """Cobertura x cos(lat): peso proporcional à área coberta de cada célula."""
+    cos_lat = np.clip(np.cos(np.radians(np.asarray(lat, dtype=float))), 0.0, None)
+    return coverage * cos_lat[:, None]
+
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class WeightMaskCache:
+    """Máscaras de peso por (geometria, grade), com descarte LRU."""
+
+    def __init__(self, max_entries: int = MASK_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._masks: "OrderedDict[tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, geometry, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        lat = np.ascontiguousarray(lat, dtype=float)
+        lon = np.ascontiguousarray(lon, dtype=float)
+        key = (
+            _digest(shapely.to_wkb(geometry)) if geometry is not None else "full",
+            _digest(lat.tobytes(), lon.tobytes()),
+        )
+        with self._lock:
+            weights = self._masks.get(key)
+            if weights is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return weights
+            self.misses += 1
+
+        coverage = coverage_fraction(geometry, lat, lon) if geometry is not None else np.ones((lat.size, lon.size))
+        weights = area_weights(lat, coverage)
+        weights.setflags(write=False)
+        with self._lock:
+            self._masks[key] = weights
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+        return weights
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._masks), "hits": int(self.hits), "misses": int(self.misses)}
+
+
+weight_mask_cache = WeightMaskCache()
+
+
+def bbox_geometry(
+    lat_min: Optional[float],
+    lat_max: Optional[float],
+    lon_min: Optional[float],
+    lon_max: Optional[float],
+):
+    """Retângulo do bbox (lados omitidos ficam abertos); ``None`` se nenhum lado foi dado."""
+    if all(value is None for value in (lat_min, lat_max, lon_min, lon_max)):
+        return None
+    return shapely.box(
+        -180.0 if lon_min is None else lon_min,
+        -90.0 if lat_min is None else lat_min,
+        360.0 if lon_max is None else lon_max,
+        90.0 if lat_max is None else lat_max,
+    )
+
+
+def region_geometry(
+    lat_min: Optional[float] = None,
+    lat_max: Optional[float] = None,
+    lon_min: Optional[float] = None,
+    lon_max: Optional[float] = None,
+    polygon: Optional[str] = None,
+    feature: Optional[str] = None,
+):
+    """bbox intersectado com o polígono de exposição (camada inteira ou uma feição)."""
+    region = bbox_geometry(lat_min, lat_max, lon_min, lon_max)
+    if polygon:
+        shape = exposure_registry.polygon(polygon, feature)
+        if shape is None:
+            raise ValueError(f"Polígono não encontrado: {polygon}" + (f"/{feature}" if feature else ""))
+        region = shape if region is None else shape.intersection(region)
+    return region
+
+
+def weighted_spatial_mean(
+    data: xr.DataArray,
+    weights: np.ndarray,
+    lat_name: str,
+    lon_name: str,
+) -> xr.DataArray:
+    """Média espacial ponderada (ignora NaN), recortada às linhas/colunas com peso > 0, já calculada."""
+    rows = np.flatnonzero(weights.any(axis=1))
+    cols = np.flatnonzero(weights.any(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        raise ValueError("A região não cobre nenhuma célula da grade.")
+
+    row_slice = slice(int(rows[0]), int(rows[-1]) + 1)
+    col_slice = slice(int(cols[0]), int(cols[-1]) + 1)
+    cropped = data.isel({lat_name: row_slice, lon_name: col_slice})
+    mask = xr.DataArray(weights[row_slice, col_slice], dims=(lat_name, lon_name))
+    (result,) = compute_cluster.compute(cropped.weighted(mask).mean(dim=[lat_name, lon_name]), nbytes=cropped.nbytes)
+    return result
@@ -0,0 +1,453 @@
+"""Batched Monte Carlo uncertainty of the single-asset scenario losses.
+
+Each run of the scenario uncertainty scales the future series by an intensity
+factor, the annual frequency by a frequency factor and the operational /
+attention thresholds by a threshold factor. All factors are drawn up front and
+the perturbed losses are evaluated as one ``runs x events`` matrix, in chunks
+of runs bounded by ``MC_MAX_MEMORY_MB``.
+
+The impact function (``ClimadaWindWaveService._build_impact_func_set``) is
+non-decreasing in intensity and the factors are positive, so sorting the
+future series once leaves every row of the loss matrix sorted as well. With
+that, per run:
+
+* AAL is ``sum(losses) * frequency`` (constant per-event frequency);
+* PML is the last column;
+* the return-period curve and VaR are the interpolation done by
+  ``Impact.calc_freq_curve``, on a return-period axis shared by all runs;
+* TVaR is the mean of the losses at or above the linear quantile.
+
+Factors come from plain random draws, a Latin hypercube per batch or a
+scrambled Sobol sequence (``FactorSampler``), split in independent replicate
+streams, in doubling batches of runs that stop once the standard error of the
+p05/p50/p95 AAL and PML estimates across replicates is below ``MC_TOLERANCE``
+of the band width. The check only starts at ``MC_MIN_RUNS`` runs: with a
+smaller budget every run is evaluated and ``converged`` stays false. Runs are
+split evenly across the replicate streams, so the budget is rounded up to a
+multiple of the number of replicates.
+"""
+
+from __future__ import annotations
+
+import os
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+# Memória máxima da matriz de perdas (runs x eventos) avaliada de uma vez
+MC_MAX_MEMORY_MB = float(os.getenv("MC_MAX_MEMORY_MB", "256"))
+MC_MAX_RUNS = int(os.getenv("MC_MAX_RUNS", "5000"))
+MC_DEFAULT_RUNS = 512
+# Parada antecipada: erro padrão máximo de p05/p50/p95 de AAL e PML, como fração da largura da faixa
+MC_TOLERANCE = float(os.getenv("MC_TOLERANCE", "0.05"))
+MC_FIRST_BATCH = 64
+MC_MIN_RUNS = 128
+# Fluxos independentes de fatores (erro padrão por réplicas, válido também para Sobol/LHS)
+MC_REPLICATES = 8
+
+SAMPLERS = ("sobol", "lhs", "random")
+
+RETURN_PERIODS = (2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+FACTOR_DESCRIPTIONS = {
+    "intensity_factor": "lognormal mean=0 sigma=0.1 clipped [0.7,1.4]",
+    "frequency_factor": "lognormal mean=0 sigma=0.2 clipped [0.3,3.0]",
+    "threshold_factor": "normal mean=1 sigma=0.1 clipped [0.6,1.4]",
+}
+
+# Matrizes simultâneas por chunk: perdas, rampa de atenção e perdas da cauda
+_WORK_ARRAYS = 3
+
+
+@dataclass
+class UncertaintyFactors:
+    """Fatores de perturbação de cada run (um valor por run)."""
+
+    intensity: np.ndarray
+    frequency: np.ndarray
+    threshold: np.ndarray
+
+    @property
+    def runs(self) -> int:
+        return int(self.intensity.size)
+
+    def chunk(self, start: int, stop: int) -> "UncertaintyFactors":
+        return UncertaintyFactors(
+            intensity=self.intensity[start:stop],
+            frequency=self.frequency[start:stop],
+            threshold=self.threshold[start:stop],
+        )
+
+
+@dataclass
+class UncertaintySamples:
+    """Métricas de cada run: vetores (runs,) e curva de período de retorno (runs, períodos)."""
+
+    aal: np.ndarray
+    pml: np.ndarray
+    var: np.ndarray
+    tvar: np.ndarray
+    return_period: np.ndarray
+    curve: np.ndarray
+    chunk_runs: int
+
+
+def draw_factors(runs: int, rng: np.random.Generator) -> UncertaintyFactors:
+    """Sorteia todos os fatores de uma vez (mesmas distribuições de ``FACTOR_DESCRIPTIONS``)."""
+    return UncertaintyFactors(
+        intensity=np.clip(rng.lognormal(mean=0.0, sigma=0.1, size=runs), 0.7, 1.4),
+        frequency=np.clip(rng.lognormal(mean=0.0, sigma=0.2, size=runs), 0.3, 3.0),
+        threshold=np.clip(rng.normal(loc=1.0, scale=0.1, size=runs), 0.6, 1.4),
+    )
+
+
+def _factors_from_uniform(uniform: np.ndarray) -> UncertaintyFactors:
+    """Fatores a partir de pontos em [0, 1)^3 pelas inversas das distribuições de ``draw_factors``."""
+    normal = ndtri(np.clip(uniform, 1e-12, 1.0 - 1e-12))
+    return UncertaintyFactors(
+        intensity=np.clip(np.exp(0.1 * normal[:, 0]), 0.7, 1.4),
+        frequency=np.clip(np.exp(0.2 * normal[:, 1]), 0.3, 3.0),
+        threshold=np.clip(1.0 + 0.1 * normal[:, 2], 0.6, 1.4),
+    )
+
+
+class FactorSampler:
+    """Sorteio dos fatores em ``replicates`` fluxos independentes: ``random`` (Monte Carlo simples),
+    ``lhs`` (hipercubo latino por lote) ou ``sobol`` (Sobol embaralhado, contínuo entre lotes).
+
+    Os fluxos independentes dão o erro padrão das estimativas também para as sequências
+    quase-aleatórias, cujos pontos não são independentes entre si.
+    """
+
+    def __init__(self, name: str, seed: Optional[int] = None, replicates: int = MC_REPLICATES) -> None:
+        name = (name or "sobol").strip().lower()
+        if name not in SAMPLERS:
+            raise ValueError(f"Amostrador inválido: {name}. Use {', '.join(SAMPLERS)}.")
+        self.name = name
+        self.replicates = int(max(replicates, 1))
+        self._rngs = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(self.replicates)]
+        self._sobol = [qmc.Sobol(d=3, scramble=True, seed=rng) for rng in self._rngs] if name == "sobol" else []
+
+    def _draw_stream(self, stream: int, runs: int) -> UncertaintyFactors:
+        rng = self._rngs[stream]
+        if self.name == "random":
+            return draw_factors(runs, rng)
+        if self.name == "lhs":
+            return _factors_from_uniform(qmc.LatinHypercube(d=3, seed=rng).random(runs))
+        with warnings.catch_warnings():
+            # Lotes dobram (potências de 2); só o último, truncado no máximo de runs, perde o balanceamento
+            warnings.simplefilter("ignore", UserWarning)
+            return _factors_from_uniform(self._sobol[stream].random(runs))
+
+    def draw(self, runs_per_stream: int) -> Tuple[UncertaintyFactors, np.ndarray]:
+        """Fatores de ``runs_per_stream`` runs em cada fluxo e o fluxo de cada run."""
+        parts = [self._draw_stream(stream, runs_per_stream) for stream in range(self.replicates)]
+        factors = UncertaintyFactors(
+            intensity=np.concatenate([part.intensity for part in parts]),
+            frequency=np.concatenate([part.frequency for part in parts]),
+            threshold=np.concatenate([part.threshold for part in parts]),
+        )
+        return factors, np.repeat(np.arange(self.replicates), runs_per_stream)
+
+
+def _damage_ratio(
+    intensity: np.ndarray,
+    operational_max: np.ndarray,
+    attention_max: np.ndarray,
+    attention_loss_factor: float,
+    stop_loss_factor: float,
+) -> np.ndarray:
+    """MDR da curva de ``_build_impact_func_set`` com limiares por linha (em ``intensity``, in-place)."""
+    op = np.maximum(operational_max, 0.0)[:, None]
+    att = np.maximum(op[:, 0] + 1e-6, attention_max)[:, None]
+    upper = np.maximum(att + 1e-6, att * 1.6)
+    attention_factor = float(np.clip(attention_loss_factor, 0.0, 1.0))
+    stop_factor = float(np.clip(max(stop_loss_factor, attention_factor), 0.0, 1.0))
+
+    below = intensity <= att
+    ramp_attention = np.clip((intensity - op) / (att - op), 0.0, 1.0)
+    ramp_attention *= attention_factor
+    np.subtract(intensity, att, out=intensity)
+    np.divide(intensity, upper - att, out=intensity)
+    np.clip(intensity, 0.0, 1.0, out=intensity)
+    intensity *= stop_factor - attention_factor
+    intensity += attention_factor
+    np.copyto(intensity, ramp_attention, where=below)
+    return intensity
+
+
+def _rebuilt_ratio(
+    intensity: np.ndarray,
+    attention_max: np.ndarray,
+    attention_loss_factor: float,
+    stop_loss_factor: float,
+) -> np.ndarray:
+    """Curva manual de ``_compute_single_hazard`` para perdas planas (rampa atenção -> parada)."""
+    att = attention_max[:, None]
+    stop_max = np.maximum(att + 1e-6, att * 1.6)
+    ramp = attention_loss_factor + (
+        (stop_loss_factor - attention_loss_factor) * (intensity - att) / np.maximum(stop_max - att, 1e-6)
+    )
+    mdd = np.where(intensity >= att, ramp, 0.0)
+    mdd[intensity >= stop_max] = stop_loss_factor
+    return mdd
+
+
+def _interp_rows(queries: np.ndarray, axis: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """``np.interp`` linha a linha: ``queries`` (runs, k) sobre eixo comum ``axis`` e valores ``rows`` (runs, n)."""
+    n = axis.size
+    if n == 1:
+        return np.repeat(rows[:, :1], queries.shape[1], axis=1)
+    upper = np.clip(np.searchsorted(axis, queries, side="right"), 1, n - 1)
+    lower = upper - 1
+    weight = np.clip((queries - axis[lower]) / (axis[upper] - axis[lower]), 0.0, 1.0)
+    low_values = np.take_along_axis(rows, lower, axis=1)
+    high_values = np.take_along_axis(rows, upper, axis=1)
+    return low_values + weight * (high_values - low_values)
+
+
+def _linear_quantile(rows: np.ndarray, quantile: float) -> np.ndarray:
+    """Quantil linear (``np.nanquantile`` padrão) de linhas já ordenadas."""
+    position = quantile * (rows.shape[1] - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, rows.shape[1] - 1)
+    fraction = position - lower
+    return rows[:, lower] + fraction * (rows[:, upper] - rows[:, lower])
+
+
+def chunk_size(n_events: int, runs: int, max_memory_mb: float = MC_MAX_MEMORY_MB) -> int:
+    """Runs por chunk para que as matrizes de trabalho caibam em ``max_memory_mb``."""
+    per_run = max(n_events, 1) * 8 * _WORK_ARRAYS
+    return int(min(max(int(max_memory_mb * 1024 * 1024) // per_run, 1), max(runs, 1)))
+
+
+def simulate_losses(
+    intensity: np.ndarray,
+    factors: UncertaintyFactors,
+    *,
+    annualization: float,
+    operational_max: float,
+    attention_max: float,
+    attention_loss_factor: float,
+    stop_loss_factor: float,
+    asset_value: float,
+    risk_quantile: float,
+    return_periods: Sequence[float] = RETURN_PERIODS,
+    max_memory_mb: float = MC_MAX_MEMORY_MB,
+) -> UncertaintySamples:
+    """AAL/PML/VaR/TVaR e curva de período de retorno de cada run, em chunks de runs."""
+    values = np.asarray(intensity, dtype=float).reshape(-1)
+    values = np.sort(values[np.isfinite(values)])
+    if values.size == 0:
+        values = np.array([0.0], dtype=float)
+    n_events = int(values.size)
+    value = float(max(asset_value, 0.0))
+
+    quantile = float(np.clip(risk_quantile, 0.5, 0.999))
+    var_period = 1.0 / float(max(1e-6, 1.0 - quantile))
+    periods = np.asarray(list(return_periods) + [var_period], dtype=float)
+    # Eixo de ``calc_freq_curve`` com frequência f: 1 / ((n - j) f); dividido por f fica comum a todas as runs
+    axis = 1.0 / np.arange(n_events, 0, -1, dtype=float)
+
+    runs = factors.runs
+    aal = np.empty(runs)
+    pml = np.empty(runs)
+    var = np.empty(runs)
+    tvar = np.empty(runs)
+    curve = np.empty((runs, len(return_periods)))
+
+    step = chunk_size(n_events, runs, max_memory_mb)
+    for start in range(0, runs, step):
+        stop = min(start + step, runs)
+        batch = factors.chunk(start, stop)
+        operational = float(operational_max) * batch.threshold
+        attention = float(attention_max) * batch.threshold
+
+        losses = _damage_ratio(
+            np.multiply.outer(batch.intensity, values), operational, attention, attention_loss_factor, stop_loss_factor
+        )
+        losses *= value
+
+        # Perdas planas (todas iguais ou nulas): mesma reconstrução de ``_compute_single_hazard``
+        top = losses[:, -1]
+        flat = (top <= 0.0) | (top - losses[:, 0] <= np.maximum(1e-6, 1e-6 * top))
+        if flat.any():
+            rebuilt = max(asset_value, 0.0) * _rebuilt_ratio(
+                np.multiply.outer(batch.intensity[flat], values), attention[flat], attention_loss_factor, stop_loss_factor
+            )
+            losses[flat] = np.sort(rebuilt, axis=1)
+
+        annual = float(annualization) * batch.frequency
+        per_event = annual / n_events
+        at_periods = _interp_rows(np.multiply.outer(per_event, periods), axis, losses)
+
+        aal[start:stop] = losses.sum(axis=1) * per_event
+        pml[start:stop] = losses[:, -1]
+        curve[start:stop] = at_periods[:, :-1]
+
+        threshold = _linear_quantile(losses, quantile)
+        var_q = at_periods[:, -1]
+        var[start:stop] = np.where(np.isfinite(var_q) & (var_q > 0.0), var_q, threshold)
+
+        tail = losses >= threshold[:, None]
+        tail_count = tail.sum(axis=1)
+        tail_sum = np.where(tail, losses, 0.0).sum(axis=1)
+        tvar[start:stop] = np.where(tail_count > 0, tail_sum / np.maximum(tail_count, 1), threshold)
+
+    return UncertaintySamples(
+        aal=aal,
+        pml=pml,
+        var=var,
+        tvar=tvar,
+        return_period=np.asarray(return_periods, dtype=float),
+        curve=curve,
+        chunk_runs=int(step),
+    )
+
+
+def _bands(samples: np.ndarray) -> Dict[str, float]:
+    if samples.size == 0:
+        return {"p05": 0.0, "p50": 0.0, "p95": 0.0}
+    p05, p50, p95 = np.nanpercentile(samples, [5, 50, 95])
+    return {"p05": float(p05), "p50": float(p50), "p95": float(p95)}
+
+
+def summarize(samples: UncertaintySamples) -> Dict:
+    """Faixas p05/p50/p95 entre runs, no formato do bloco ``uncertainty.future``."""
+    if samples.curve.size:
+        curve_bands = np.nanpercentile(samples.curve, [5, 50, 95], axis=0)
+    else:
+        curve_bands = np.zeros((3, 0))
+    return {
+        "aal": _bands(samples.aal),
+        "pml": _bands(samples.pml),
+        "var": _bands(samples.var),
+        "tvar": _bands(samples.tvar),
+        "return_period_curve": {
+            "return_period": [float(v) for v in samples.return_period],
+            "p05": [float(v) for v in curve_bands[0]],
+            "p50": [float(v) for v in curve_bands[1]],
+            "p95": [float(v) for v in curve_bands[2]],
+        },
+    }
+
+
+def concat_samples(parts: Sequence[UncertaintySamples]) -> UncertaintySamples:
+    """Junta as amostras de lotes sucessivos de runs."""
+    return UncertaintySamples(
+        aal=np.concatenate([part.aal for part in parts]),
+        pml=np.concatenate([part.pml for part in parts]),
+        var=np.concatenate([part.var for part in parts]),
+        tvar=np.concatenate([part.tvar for part in parts]),
+        return_period=parts[0].return_period,
+        curve=np.concatenate([part.curve for part in parts], axis=0),
+        chunk_runs=max(part.chunk_runs for part in parts),
+    )
+
+
+def quantile_standard_error(samples: np.ndarray, streams: np.ndarray, quantile: float) -> float:
+    """Erro padrão do quantil entre fluxos independentes (desvio das estimativas por fluxo / raiz do nº de fluxos)."""
+    labels = np.unique(streams)
+    if labels.size < 2:
+        return float("inf")
+    estimates = np.array([np.nanquantile(samples[streams == label], quantile) for label in labels])
+    return float(np.std(estimates, ddof=1) / np.sqrt(labels.size))
+
+
+def convergence(samples: UncertaintySamples, streams: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """Erro padrão de p05/p50/p95 de AAL e PML relativo à largura da faixa (p95 - p05; p50 se a faixa for nula)."""
+    out: Dict[str, Dict[str, float]] = {}
+    for metric in ("aal", "pml"):
+        values = getattr(samples, metric)
+        bands = _bands(values)
+        scale = (bands["p95"] - bands["p05"]) or abs(bands["p50"])
+        errors = {}
+        for label, quantile in (("p05", 0.05), ("p50", 0.5), ("p95", 0.95)):
+            error = quantile_standard_error(values, streams, quantile)
+            errors[label] = 0.0 if error == 0.0 else (error / scale if scale > 0 else float("inf"))
+        out[metric] = errors
+    return out
+
+
+def scenario_uncertainty(
+    intensity: np.ndarray,
+    *,
+    annualization: float,
+    operational_max: float,
+    attention_max: float,
+    attention_loss_factor: float,
+    stop_loss_factor: float,
+    asset_value: float,
+    risk_quantile: float,
+    runs: int = MC_DEFAULT_RUNS,
+    seed: Optional[int] = None,
+    sampler: str = "sobol",
+    tolerance: float = MC_TOLERANCE,
+) -> Dict:
+    """Bloco ``uncertainty`` da comparação de cenários.
+
+    Lotes de runs dobram (64, 64, 128, ...) até ``runs`` (arredondado para cima a um
+    múltiplo das réplicas); a partir de ``MC_MIN_RUNS`` o erro padrão das faixas de AAL
+    e PML, relativo à largura da faixa, é comparado a ``tolerance`` (0 desliga a parada).
+    """
+    requested_runs = int(min(max(int(runs), 1), MC_MAX_RUNS))
+    factor_sampler = FactorSampler(sampler, seed, replicates=min(MC_REPLICATES, requested_runs))
+    replicates = factor_sampler.replicates
+    max_per_stream = -(-requested_runs // replicates)
+    max_runs = max_per_stream * replicates
+    values = np.asarray(intensity, dtype=float).reshape(-1)
+    values = np.sort(values[np.isfinite(values)])
+
+    parts: List[UncertaintySamples] = []
+    labels: List[np.ndarray] = []
+    per_stream = 0
+    converged = False
+    errors: Dict[str, Dict[str, float]] = {}
+    while per_stream < max_per_stream:
+        batch = min(max(per_stream, MC_FIRST_BATCH // replicates, 1), max_per_stream - per_stream)
+        factors, streams = factor_sampler.draw(batch)
+        parts.append(simulate_losses(
+            values,
+            factors,
+            annualization=annualization,
+            operational_max=operational_max,
+            attention_max=attention_max,
+            attention_loss_factor=attention_loss_factor,
+            stop_loss_factor=stop_loss_factor,
+            asset_value=asset_value,
+            risk_quantile=risk_quantile,
+        ))
+        labels.append(streams)
+        per_stream += batch
+        if tolerance > 0 and per_stream * replicates >= MC_MIN_RUNS:
+            errors = convergence(concat_samples(parts), np.concatenate(labels))
+            if all(error <= tolerance for metric in errors.values() for error in metric.values()):
+                converged = True
+                break
+
+    samples = concat_samples(parts)
+    if not errors:
+        errors = convergence(samples, np.concatenate(labels))
+    parameters: Dict[str, object] = dict(FACTOR_DESCRIPTIONS)
+    parameters.update({
+        "sampler": factor_sampler.name,
+        "runs": int(per_stream * replicates),
+        "requested_runs": requested_runs,
+        "max_runs": max_runs,
+        "min_runs": MC_MIN_RUNS,
+        "replicates": replicates,
+        "converged": converged,
+        "tolerance": float(tolerance),
+        "relative_standard_error": {
+            metric: {label: (float(error) if np.isfinite(error) else None) for label, error in bands.items()}
+            for metric, bands in errors.items()
+        },
+        "seed": seed,
+        "chunk_runs": samples.chunk_runs,
+    })
+    return {"parameters": parameters, "future": summarize(samples)}
@@ -0,0 +1,95 @@
+"""Derived ERA5 wind variables persisted next to u10/v10 in ``climatologia.zarr``.
+
+ERA5 only ships the wind components, so every speed/direction query pays for
+``hypot`` and ``arctan2`` over the whole selection. ``build_derived_wind``
+(``scripts/build_wind_derived.py``) appends ``wind_speed_kn`` and
+``wind_dir_deg`` with the same chunking as ``u10``; ``ZarrDataReader`` reads them
+directly when they exist and match the source shape.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import xarray as xr
+import zarr
+
+
+# 1 m/s em nós (3600 s/h / 1852 m/milha náutica); única conversão usada no backend
+KNOTS_PER_MS = 3600.0 / 1852.0
+SPEED_VAR = "wind_speed_kn"
+DIRECTION_VAR = "wind_dir_deg"
+DERIVED_WIND_VARS = (SPEED_VAR, DIRECTION_VAR)
+
+# Inteiros escalados: 0.01 nó / 0.01 grau de resolução.
+_SCALED_ENCODING = {
+    SPEED_VAR: {"dtype": "int16", "scale_factor": 0.01, "_FillValue": np.int16(-32768)},
+    DIRECTION_VAR: {"dtype": "uint16", "scale_factor": 0.01, "_FillValue": np.uint16(65535)},
+}
+
+
+def wind_speed_direction(u10, v10) -> Tuple:
+    """Velocidade em nós e direção meteorológica (de onde o vento vem, 0-360°)."""
+    speed = np.hypot(u10, v10) * KNOTS_PER_MS
+    direction = (np.degrees(np.arctan2(u10, v10)) + 180.0) % 360.0
+    return speed, direction
+
+
+def has_derived_wind(ds: xr.Dataset) -> bool:
+    """True se as variáveis derivadas existem e cobrem a mesma grade/tempo de u10."""
+    if "u10" not in ds.data_vars:
+        return False
+    shape = ds["u10"].shape
+    return all(name in ds.data_vars and ds[name].shape == shape for name in DERIVED_WIND_VARS)
+
+
+def build_derived_wind(zarr_path: Path, scaled: bool = False, overwrite: bool = False) -> Dict:
+    """Acrescenta ``wind_speed_kn``/``wind_dir_deg`` ao store, chunk a chunk, com os chunks de u10."""
+    zarr_path = Path(zarr_path)
+    ds = xr.open_zarr(str(zarr_path), consolidated=(zarr_path / ".zmetadata").exists())
+    if has_derived_wind(ds) and not overwrite:
+        return {"skipped": True}
+
+    u10 = ds["u10"]
+    v10 = ds["v10"]
+    source_chunks = u10.encoding.get("chunks") or tuple(max(c) for c in u10.chunks)
+    chunks = dict(zip(u10.dims, source_chunks))
+    u10 = u10.chunk(chunks)
+    v10 = v10.chunk(chunks)
+    speed, direction = wind_speed_direction(u10, v10)
+
+    derived = xr.Dataset(
+        {
+            SPEED_VAR: speed.astype(np.float32).assign_attrs(units="knots", long_name="10 m wind speed", source="u10,v10"),
+            DIRECTION_VAR: direction.astype(np.float32).assign_attrs(
+                units="degree", long_name="10 m wind direction (meteorological, from)", source="u10,v10"
+            ),
+        }
+    )
+
+    compressor = ds["u10"].encoding.get("compressor")
+    encoding: Dict[str, Dict] = {}
+    for name in DERIVED_WIND_VARS:
+        var_encoding: Dict = {"chunks": source_chunks}
+        if compressor is not None:
+            var_encoding["compressor"] = compressor
+        if scaled:
+            var_encoding.update(_SCALED_ENCODING[name])
+        else:
+            var_encoding["dtype"] = "float32"
+        encoding[name] = var_encoding
+
+    if overwrite and any(name in ds.data_vars for name in DERIVED_WIND_VARS):
+        group = zarr.open_group(str(zarr_path), mode="a")
+        for name in DERIVED_WIND_VARS:
+            if name in group:
+                del group[name]
+    ds.close()
+
+    # Só as variáveis novas são gravadas; as coordenadas já existem no store.
+    derived.drop_vars(list(derived.coords)).to_zarr(str(zarr_path), mode="a", encoding=encoding, consolidated=False)
+    # Sempre consolida: o ZarrDataReader abre com metadados consolidados quando existem.
+    zarr.consolidate_metadata(str(zarr_path))
+    return {"skipped": False, "chunks": list(source_chunks), "scaled": bool(scaled)}
@@ -0,0 +1,313 @@
+"""Wind rose aggregation for ERA5 points, live or from a per-cell precomputed cube.
+
+``summarize_wind_rose`` turns a direction/speed series into the rose served by
+``get_multi_risk_point`` in a single pass: each sample gets a (sector, status)
+index and one ``bincount`` yields the total and per-status counts, while the
+sector maxima come from one ``maximum.at`` over the same index.
+
+``build_wind_rose_cube`` (``scripts/build_wind_rose_cube.py``) stores, for every
+grid cell and calendar month, the joint direction x speed histogram and the
+maximum speed per sector. ``WindRoseCube.lookup`` then answers a rose for any
+cell (and month subset) with one chunk read, without the hourly series.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import dask.array as dsa
+import numpy as np
+import xarray as xr
+
+from .netcdf_index import AxisIndex
+from .wind_derived import DIRECTION_VAR, SPEED_VAR, has_derived_wind, wind_speed_direction
+
+try:
+    from numcodecs import Blosc  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    Blosc = None
+
+
+WIND_ROSE_CUBE_PATH = Path(os.environ.get("ERA5_WIND_ROSE_PATH", "D:/OceanPact/wind_rose.zarr"))
+DIRECTION_LABELS = (
+    "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+    "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW",
+)
+N_SECTORS = len(DIRECTION_LABELS)
+SECTOR_EDGES = np.linspace(0, 360, N_SECTORS + 1)
+# Classes de velocidade do cubo (nós); a última é aberta (>= 40).
+SPEED_EDGES_KNOTS = (0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 35.0, 40.0)
+N_STATUS = 3
+
+
+def wind_status(speed_knots: np.ndarray, operational_limit_knots: float, attention_limit_knots: float) -> np.ndarray:
+    """0 = operacional, 1 = atenção, 2 = parada."""
+    status = np.zeros(np.shape(speed_knots), dtype=np.uint8)
+    status[speed_knots >= operational_limit_knots] = 1
+    status[speed_knots >= attention_limit_knots] = 2
+    return status
+
+
+def sector_index(direction_deg: np.ndarray) -> np.ndarray:
+    """Setor de 22,5° de cada direção (360° cai no último setor, como ``np.histogram``)."""
+    sectors = np.floor_divide(np.asarray(direction_deg, dtype=float), 360.0 / N_SECTORS).astype(np.intp)
+    return np.clip(sectors, 0, N_SECTORS - 1)
+
+
+def _rose_payload(
+    counts: np.ndarray,
+    status_counts: Optional[np.ndarray],
+    spoke_max: np.ndarray,
+    operational_limit_knots: float,
+    attention_limit_knots: float,
+) -> Dict:
+    payload = {
+        "bins": [f"{int(SECTOR_EDGES[i])}-{int(SECTOR_EDGES[i + 1])}" for i in range(N_SECTORS)],
+        "direction_labels": list(DIRECTION_LABELS),
+        "spoke_max_values": spoke_max.astype(float).tolist(),
+        "global_max_speed": float(spoke_max.max()) if spoke_max.size else 0.0,
+        "counts": counts.astype(int).tolist(),
+        "limits": {
+            "operational_max": float(operational_limit_knots),
+            "attention_max": float(attention_limit_knots),
+        },
+    }
+    if status_counts is not None:
+        payload["operational_counts"] = status_counts[:, 0].astype(int).tolist()
+        payload["attention_counts"] = status_counts[:, 1].astype(int).tolist()
+        payload["stop_counts"] = status_counts[:, 2].astype(int).tolist()
+    return payload
+
+
+def summarize_wind_rose(
+    direction_deg: np.ndarray,
+    speed_knots: np.ndarray,
+    operational_limit_knots: float,
+    attention_limit_knots: float,
+) -> Dict:
+    """Rosa dos ventos (contagens total/por status e máximo por setor) em uma única passada."""
+    direction = np.asarray(direction_deg, dtype=float).ravel()
+    speed = np.asarray(speed_knots, dtype=float).ravel()
+    finite = np.isfinite(direction) & np.isfinite(speed)
+    direction = direction[finite]
+    speed = speed[finite]
+
+    sectors = sector_index(direction)
+    status = wind_status(speed, operational_limit_knots, attention_limit_knots)
+    status_counts = np.bincount(sectors * N_STATUS + status, minlength=N_SECTORS * N_STATUS).reshape(N_SECTORS, N_STATUS)
+
+    spoke_max = np.zeros(N_SECTORS, dtype=float)
+    np.maximum.at(spoke_max, sectors, speed)
+    return _rose_payload(
+        status_counts.sum(axis=1), status_counts, spoke_max, operational_limit_knots, attention_limit_knots
+    )
+
+
+def speed_bin_index(speed_knots: np.ndarray, edges: Sequence[float] = SPEED_EDGES_KNOTS) -> np.ndarray:
+    """Classe de velocidade de cada amostra (a última classe é aberta)."""
+    return np.clip(np.searchsorted(np.asarray(edges[1:]), speed_knots, side="right"), 0, len(edges) - 1)
+
+
+def _find_dim(ds: xr.Dataset, candidates: Iterable[str]) -> str:
+    name = next((item for item in candidates if item in ds.dims), None)
+    if name is None:
+        raise ValueError(f"Coordenada não encontrada: {list(candidates)}")
+    return name
+
+
+def build_wind_rose_cube(
+    zarr_path: Path,
+    store_path: Path = WIND_ROSE_CUBE_PATH,
+    *,
+    max_memory_mb: int = 1024,
+    tile: int = 8,
+    speed_edges: Sequence[float] = SPEED_EDGES_KNOTS,
+) -> Dict[str, object]:
+    """Histogramas conjuntos direção x velocidade por célula e mês a partir do store ERA5."""
+    zarr_path = Path(zarr_path)
+    ds = xr.open_zarr(str(zarr_path), consolidated=(zarr_path / ".zmetadata").exists())
+    lat_name = _find_dim(ds, ("latitude", "lat"))
+    lon_name = _find_dim(ds, ("longitude", "lon"))
+    derived = has_derived_wind(ds)
+    source_vars = list((SPEED_VAR, DIRECTION_VAR) if derived else ("u10", "v10"))
+
+    lat_values = np.asarray(ds[lat_name].values)
+    lon_values = np.asarray(ds[lon_name].values)
+    nlat, nlon = lat_values.size, lon_values.size
+    months = ds["time"].values.astype("datetime64[M]").astype(np.int64) % 12
+    ntime = months.size
+    n_speed = len(speed_edges)
+
+    # Estrutura do cubo gravada antes (só metadados e coordenadas); cada faixa de latitude
+    # é escrita na sua região assim que termina, sem montar o cubo inteiro em memória.
+    tile_lat, tile_lon = min(tile, nlat), min(tile, nlon)
+    template = xr.Dataset(
+        {
+            "counts": (
+                ("month", "sector", "speed_bin", "lat", "lon"),
+                dsa.zeros((12, N_SECTORS, n_speed, nlat, nlon), dtype=np.uint32, chunks=(12, N_SECTORS, n_speed, tile_lat, tile_lon)),
+            ),
+            "sector_max": (
+                ("month", "sector", "lat", "lon"),
+                dsa.zeros((12, N_SECTORS, nlat, nlon), dtype=np.float32, chunks=(12, N_SECTORS, tile_lat, tile_lon)),
+            ),
+        },
+        coords={
+            "month": np.arange(1, 13),
+            "sector": np.asarray(DIRECTION_LABELS),
+            "speed_bin": np.asarray(speed_edges, dtype=float),
+            "lat": lat_values,
+            "lon": lon_values,
+        },
+        attrs={
+            "source": str(zarr_path),
+            "source_vars": ",".join(source_vars),
+            "time_start": str(ds["time"].values[0]) if ntime else "",
+            "time_end": str(ds["time"].values[-1]) if ntime else "",
+            "speed_units": "knots",
+        },
+    )
+    encoding: Dict[str, Dict] = {
+        "counts": {"chunks": (12, N_SECTORS, n_speed, tile_lat, tile_lon)},
+        "sector_max": {"chunks": (12, N_SECTORS, tile_lat, tile_lon)},
+    }
+    if Blosc is not None:
+        for name in encoding:
+            encoding[name]["compressor"] = Blosc(cname="zstd", clevel=5, shuffle=Blosc.BITSHUFFLE)
+
+    store_path = Path(store_path)
+    tmp_path = store_path.with_name(store_path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    template.to_zarr(str(tmp_path), mode="w", encoding=encoding, consolidated=True, compute=False)
+
+    # Faixas de latitude (alinhadas aos chunks do cubo) x blocos de tempo que cabem no
+    # orçamento (2 campos float32 + índices int64).
+    band = tile_lat
+    bytes_per_step = band * nlon * (2 * 4 + 4 * 8)
+    time_block = max(1, int(max_memory_mb * 1024 * 1024 // max(bytes_per_step, 1)))
+    for lat_start in range(0, nlat, band):
+        lat_slice = slice(lat_start, min(lat_start + band, nlat))
+        nband = lat_slice.stop - lat_slice.start
+        ncell = nband * nlon
+        cell = np.arange(ncell, dtype=np.int64).reshape(1, nband, nlon)
+        band_counts = np.zeros(12 * N_SECTORS * n_speed * ncell, dtype=np.int64)
+        band_max = np.zeros(12 * N_SECTORS * ncell, dtype=np.float32)
+        for t_start in range(0, ntime, time_block):
+            t_slice = slice(t_start, min(t_start + time_block, ntime))
+            block = ds[source_vars].isel({"time": t_slice, lat_name: lat_slice})
+            block = block.transpose("time", lat_name, lon_name).load()
+            first, second = (np.asarray(block[name].values, dtype=np.float32) for name in source_vars)
+            if derived:
+                speed, direction = first, second
+            else:
+                speed, direction = wind_speed_direction(first, second)
+
+            finite = np.isfinite(speed) & np.isfinite(direction)
+            month_sector = months[t_slice].reshape(-1, 1, 1) * N_SECTORS + sector_index(direction)
+            joint = (month_sector * n_speed + speed_bin_index(speed, speed_edges)) * ncell + cell
+            band_counts += np.bincount(joint[finite], minlength=band_counts.size)
+            np.maximum.at(band_max, (month_sector * ncell + cell)[finite], speed[finite])
+
+        xr.Dataset(
+            {
+                "counts": (
+                    ("month", "sector", "speed_bin", "lat", "lon"),
+                    band_counts.reshape(12, N_SECTORS, n_speed, nband, nlon).astype(np.uint32),
+                ),
+                "sector_max": (("month", "sector", "lat", "lon"), band_max.reshape(12, N_SECTORS, nband, nlon)),
+            }
+        ).to_zarr(str(tmp_path), region={"lat": lat_slice})
+    ds.close()
+
+    if store_path.exists():
+        shutil.rmtree(store_path)
+    tmp_path.rename(store_path)
+    return {
+        "store": str(store_path),
+        "source_vars": source_vars,
+        "grid": [int(nlat), int(nlon)],
+        "time_steps": int(ntime),
+    }
+
+
+class WindRoseCube:
+    """Leitura do cubo de rosas dos ventos; ``None`` quando o cubo não existe."""
+
+    def __init__(self, store_path: Path = WIND_ROSE_CUBE_PATH) -> None:
+        self.store_path = Path(store_path)
+        self._cached: Optional[Tuple[float, xr.Dataset, Tuple[AxisIndex, AxisIndex]]] = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> Optional[Tuple[xr.Dataset, Tuple[AxisIndex, AxisIndex]]]:
+        try:
+            mtime = (self.store_path / ".zmetadata").stat().st_mtime
+        except OSError:
+            return None
+        with self._lock:
+            if self._cached is None or self._cached[0] != mtime:
+                cube = xr.open_zarr(str(self.store_path), consolidated=True, chunks=None)
+                axes = (AxisIndex.build("lat", cube["lat"].values), AxisIndex.build("lon", cube["lon"].values))
+                self._cached = (mtime, cube, axes)
+            return self._cached[1], self._cached[2]
+
+    def available(self) -> bool:
+        return self._open() is not None
+
+    def lookup(
+        self,
+        lat: float,
+        lon: float,
+        months: Optional[Sequence[int]] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> Optional[Dict]:
+        """Rosa da célula mais próxima para os meses pedidos (1-12; todos se omitido).
+
+        As contagens por status vêm das classes de velocidade: são exatas quando os
+        limites coincidem com bordas das classes (``limits_exact``).
+        """
+        opened = self._open()
+        if opened is None:
+            return None
+        cube, axes = opened
+        lat_idx = int(axes[0].nearest(np.array([lat]))[0])
+        lon_idx = int(axes[1].nearest(np.array([lon]))[0])
+        cell = {"lat": lat_idx, "lon": lon_idx}
+        month_idx = sorted({int(month) - 1 for month in months if 1 <= int(month) <= 12}) if months else list(range(12))
+        if not month_idx:
+            return None
+
+        joint = np.asarray(cube["counts"].isel(cell).values)[month_idx].sum(axis=0)
+        spoke_max = np.asarray(cube["sector_max"].isel(cell).values)[month_idx].max(axis=0)
+        speed_edges = np.asarray(cube["speed_bin"].values, dtype=float)
+
+        # Cada classe conta pelo status da sua borda inferior.
+        bin_status = wind_status(speed_edges, operational_limit_knots, attention_limit_knots)
+        status_counts = np.stack([joint[:, bin_status == status].sum(axis=1) for status in range(N_STATUS)], axis=1)
+
+        payload = _rose_payload(
+            joint.sum(axis=1), status_counts, spoke_max, operational_limit_knots, attention_limit_knots
+        )
+        payload.update(
+            {
+                "lat": float(cube["lat"].values[lat_idx]),
+                "lon": float(cube["lon"].values[lon_idx]),
+                "months": [idx + 1 for idx in month_idx],
+                "speed_edges": speed_edges,
+                "speed_counts": joint,
+                "limits_exact": bool(
+                    np.isin([operational_limit_knots, attention_limit_knots], speed_edges).all()
+                ),
+                "period": {"start": cube.attrs.get("time_start"), "end": cube.attrs.get("time_end")},
+            }
+        )
+        return payload
+
+
+wind_rose_cube = WindRoseCube()
@@ -1,31 +1,102 @@
 """Service for reading climate data from Zarr files."""
 
+import os
 import xarray as xr
+import zarr
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 from datetime import datetime
-import geopandas as gpd
-from shapely.geometry import Point
-from shapely.ops import unary_union
-import fiona
-from .climada_petals import climada_petals_engine
+from .climada_petals import SENSITIVITY_QUANTILES, climada_petals_engine
+from .climate_source import VariableLayout, parse_time, to_datetime
+from .exposure_registry import exposure_registry
+from .loss_distribution import LossDistribution
+from .region_stats import region_statistics
+from .spatial_aggregation import region_geometry, weight_mask_cache, weighted_spatial_mean
+from .wind_derived import DIRECTION_VAR, SPEED_VAR, has_derived_wind, wind_speed_direction
+from .wind_rose import summarize_wind_rose, wind_status
+
+
+# Cache LRU de chunks comprimidos compartilhado entre requisições (0 desliga).
+ZARR_CHUNK_CACHE_MB = int(os.getenv("ZARR_CHUNK_CACHE_MB", "512"))
+
+
+def _unwrap_store(store):
+    return store
+
+
+class LocalLRUStoreCache(zarr.storage.LRUStoreCache):
+    """Cache LRU só do processo da API: serializado (grafos enviados aos workers do
+    ``compute_cluster``) vira o store de baixo, sem copiar os chunks em cache."""
+
+    def __reduce__(self):
+        return _unwrap_store, (self._store,)
+
+
+@dataclass
+class WindFields:
+    """Velocidade (nós), direção meteorológica (graus) e status de uma única leitura de u10/v10."""
+
+    speed_knots: xr.DataArray
+    direction_deg: xr.DataArray
+    status: np.ndarray
 
 
 class ZarrDataReader:
     """Read and process climate data from Zarr stores."""
+
+    name = "zarr"
     
-    def __init__(self, zarr_path: str = "D:/OceanPact/climatologia.zarr"):
+    def __init__(self, zarr_path: str = "D:/OceanPact/climatologia.zarr", cache_mb: int = ZARR_CHUNK_CACHE_MB):
         """Initialize reader with Zarr path."""
         self.zarr_path = Path(zarr_path)
+        self.cache_bytes = max(int(cache_mb), 0) * 1024 * 1024
         self._ds = None
+        self._store = None
+        self._consolidated = False
+        self._derived_wind: Optional[bool] = None
     
     @property
     def ds(self) -> xr.Dataset:
         """Lazy load dataset."""
         if self._ds is None:
-            self._ds = xr.open_zarr(str(self.zarr_path))
+            self._ds = self._open()
+            self._derived_wind = None
         return self._ds
+
+    def _open(self) -> xr.Dataset:
+        """Abre o store com metadados consolidados (se houver) atrás de um cache LRU de chunks."""
+        store = zarr.storage.DirectoryStore(str(self.zarr_path))
+        if self.cache_bytes > 0:
+            store = LocalLRUStoreCache(store, max_size=self.cache_bytes)
+        self._store = store
+        # .zmetadata: um único read em vez de um .zarray/.zattrs por variável.
+        self._consolidated = ".zmetadata" in store
+        return xr.open_zarr(store, consolidated=self._consolidated)
+
+    def cache_stats(self) -> Dict:
+        """Estatísticas do cache de chunks do store ERA5."""
+        store = self._store
+        if not isinstance(store, zarr.storage.LRUStoreCache):
+            return {"enabled": False, "opened": self._ds is not None, "consolidated": self._consolidated}
+        hits, misses = int(store.hits), int(store.misses)
+        return {
+            "enabled": True,
+            "opened": True,
+            "consolidated": self._consolidated,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": float(hits / (hits + misses)) if hits + misses else 0.0,
+            "max_size_bytes": int(self.cache_bytes),
+        }
+
+    @property
+    def derived_wind(self) -> bool:
+        """True quando o store tem ``wind_speed_kn``/``wind_dir_deg`` (scripts/build_wind_derived.py) válidos."""
+        if self._derived_wind is None:
+            self._derived_wind = has_derived_wind(self.ds)
+        return self._derived_wind
     
     def get_available_variables(self) -> List[str]:
         """Get list of available variables in dataset."""
@@ -34,10 +105,8 @@ class ZarrDataReader:
     def get_time_range(self) -> Tuple[datetime, datetime]:
         """Get min and max time in dataset."""
         times = self.ds.time.values
-        return (
-            np.datetime64(times.min()).astype(datetime),
-            np.datetime64(times.max()).astype(datetime)
-        )
+        # datetime64[ns].astype(datetime) devolve int; converte em segundos.
+        return to_datetime(times.min()), to_datetime(times.max())
     
     def get_spatial_bounds(self) -> Dict[str, float]:
         """Get spatial bounding box."""
@@ -49,6 +118,38 @@ class ZarrDataReader:
             "east": float(self.ds[lon_name].max().values),
         }
     
+    def describe_variable(self, variable: str) -> Optional[VariableLayout]:
+        """Cobertura e chunks de ``variable`` no store (mesma grade de chunks para ponto e mapa)."""
+        if variable not in self.ds.data_vars:
+            return None
+        lat_name, lon_name = self._get_lat_lon_names()
+        da = self.ds[variable]
+        order = ("time", lat_name, lon_name)
+        if set(da.dims) != set(order):
+            return None
+        chunks = da.encoding.get("chunks") or da.shape
+        by_dim = dict(zip(da.dims, chunks))
+        time_index = self.ds.indexes["time"]
+        chunk_shape = tuple(int(by_dim[dim]) for dim in order)
+        return VariableLayout(
+            variable=variable,
+            time_start=parse_time(time_index.min()),
+            time_end=parse_time(time_index.max()),
+            shape=tuple(int(da.sizes[dim]) for dim in order),
+            map_chunks=chunk_shape,
+            point_chunks=chunk_shape,
+            itemsize=int(da.dtype.itemsize),
+            bounds=self.get_spatial_bounds(),
+        )
+
+    def wind_hazard_variables(self) -> Optional[Dict]:
+        """Velocidade lida pelo snapshot de vento (derivada persistida ou u10); direção sempre disponível."""
+        if self.derived_wind:
+            return {"speed": SPEED_VAR, "direction": True}
+        if "u10" in self.ds.data_vars and "v10" in self.ds.data_vars:
+            return {"speed": "u10", "direction": True}
+        return None
+
     def query_data(
         self,
         variable: str,
@@ -116,8 +217,8 @@ class ZarrDataReader:
         # Load data and convert to dict
         data_loaded = data.load()
         return {
-            "time": data_loaded.time.values.astype(str).tolist(),
-            "values": data_loaded.values.tolist(),
+            "time": data_loaded.time.values,
+            "values": data_loaded.values,
             "lat": float(data_loaded[lat_name].values),
             "lon": float(data_loaded[lon_name].values),
         }
@@ -137,6 +238,58 @@ class ZarrDataReader:
             data = data.sel(time=slice(start_time, end_time))
         return data.load()
 
+    def get_wind_fields(
+        self,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        time: Optional[str] = None,
+        lat_min: Optional[float] = None,
+        lat_max: Optional[float] = None,
+        lon_min: Optional[float] = None,
+        lon_max: Optional[float] = None,
+        operational_limit_knots: float = 15.0,
+        attention_limit_knots: float = 20.0,
+    ) -> WindFields:
+        """Lê o vento uma vez para o ponto (ou caixa) e a janela de tempo e devolve velocidade, direção e status.
+
+        ``lat``/``lon`` selecionam o ponto mais próximo; sem eles a seleção é a
+        caixa ``lat_min..lon_max``. ``time`` escolhe o instante mais próximo, senão
+        ``start_time``/``end_time`` recortam a série. Usa ``wind_speed_kn``/``wind_dir_deg``
+        quando existem no store; senão deriva de u10/v10.
+        """
+        lat_name, lon_name = self._get_lat_lon_names()
+        # Variáveis persistidas: leitura direta, sem hypot/arctan2.
+        names = [SPEED_VAR, DIRECTION_VAR] if self.derived_wind else ["u10", "v10"]
+        components = self.ds[names]
+        if lat is not None and lon is not None:
+            components = components.sel(**{lat_name: lat, lon_name: lon}, method="nearest")
+        else:
+            if lat_min is not None or lat_max is not None:
+                components = components.sel(**{lat_name: slice(lat_max, lat_min)})
+            if lon_min is not None or lon_max is not None:
+                components = components.sel(**{lon_name: slice(lon_min, lon_max)})
+        if time is not None:
+            components = components.sel(time=time, method="nearest")
+        elif start_time or end_time:
+            components = components.sel(time=slice(start_time, end_time))
+
+        # Um único compute para as duas variáveis (os chunks de cada uma são lidos uma vez).
+        components = components.load()
+        if self.derived_wind:
+            speed = components[SPEED_VAR].values
+            direction = components[DIRECTION_VAR].values
+        else:
+            speed, direction = wind_speed_direction(components["u10"].values, components["v10"].values)
+
+        coords, dims = components[names[0]].coords, components[names[0]].dims
+        return WindFields(
+            speed_knots=xr.DataArray(speed, coords=coords, dims=dims, name=SPEED_VAR, attrs={"units": "knots"}),
+            direction_deg=xr.DataArray(direction, coords=coords, dims=dims, name=DIRECTION_VAR, attrs={"units": "degree"}),
+            status=wind_status(speed, operational_limit_knots, attention_limit_knots),
+        )
+
     def get_wind_speed_series(
         self,
         lat: float,
@@ -145,15 +298,7 @@ class ZarrDataReader:
         end_time: Optional[str] = None,
     ) -> xr.DataArray:
         """Get wind speed (knots) time series for a point."""
-        lat_name, lon_name = self._get_lat_lon_names()
-        u10 = self.ds["u10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-        v10 = self.ds["v10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-        if start_time or end_time:
-            u10 = u10.sel(time=slice(start_time, end_time))
-            v10 = v10.sel(time=slice(start_time, end_time))
-        speed_ms = np.sqrt(u10**2 + v10**2)
-        speed_knots = (speed_ms * 1.94384).load()
-        return speed_knots
+        return self.get_wind_fields(lat=lat, lon=lon, start_time=start_time, end_time=end_time).speed_knots
 
     def get_wind_direction_series(
         self,
@@ -163,212 +308,10 @@ class ZarrDataReader:
         end_time: Optional[str] = None,
     ) -> xr.DataArray:
         """Get wind direction (degrees, meteorological) time series for a point."""
-        lat_name, lon_name = self._get_lat_lon_names()
-        u10 = self.ds["u10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-        v10 = self.ds["v10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-        if start_time or end_time:
-            u10 = u10.sel(time=slice(start_time, end_time))
-            v10 = v10.sel(time=slice(start_time, end_time))
-        direction_deg = (np.degrees(np.arctan2(u10, v10)) + 180.0) % 360.0
-        return direction_deg.load()
-
-    def _exceedance_probs(self, n: int, method: str = "weibull") -> np.ndarray:
-        """Empirical exceedance plotting position."""
-        if n <= 0:
-            return np.array([], dtype=float)
-
-        rank = np.arange(1, n + 1, dtype=float)
-        method = (method or "weibull").lower()
-
-        if method == "hazen":
-            probs = (rank - 0.5) / n
-        elif method == "gringorten":
-            probs = (rank - 0.44) / (n + 0.12)
-        else:
-            probs = rank / (n + 1.0)
-
-        return np.clip(probs, 0.0, 1.0)
-
-    def _workspace_root(self) -> Path:
-        return Path(__file__).resolve().parents[3]
-
-    def _find_nearest_shapefile(self, lat: float, lon: float) -> Optional[Path]:
-        data_root = self._workspace_root() / "frontend" / "public" / "data"
-        if not data_root.exists():
-            return None
-
-        point = Point(lon, lat)
-        best_path: Optional[Path] = None
-        best_dist = float("inf")
-
-        for shp_path in data_root.rglob("*.shp"):
-            try:
-                with fiona.open(shp_path) as src:
-                    bounds = src.bounds
-                center_lon = (float(bounds[0]) + float(bounds[2])) / 2.0
-                center_lat = (float(bounds[1]) + float(bounds[3])) / 2.0
-                dist = point.distance(Point(center_lon, center_lat))
-                if dist < best_dist:
-                    best_dist = dist
-                    best_path = shp_path
-            except Exception:
-                continue
-
-        return best_path
-
-    def _polygon_exterior_coords(self, geom) -> Tuple[List[float], List[float]]:
-        if geom is None or geom.is_empty:
-            return [], []
-
-        polygon = None
-        if geom.geom_type == "Polygon":
-            polygon = geom
-        elif geom.geom_type == "MultiPolygon":
-            polygon = max(list(geom.geoms), key=lambda item: item.area, default=None)
-
-        if polygon is None or polygon.exterior is None:
-            return [], []
-
-        coords = list(polygon.exterior.coords)
-        lon_vals = [float(c[0]) for c in coords]
-        lat_vals = [float(c[1]) for c in coords]
-        return lon_vals, lat_vals
-
-    def _sample_points_inside_geometry(self, geometry, n_points: int = 220) -> Tuple[np.ndarray, np.ndarray]:
-        if geometry is None or geometry.is_empty:
-            return np.array([], dtype=float), np.array([], dtype=float)
-
-        min_lon, min_lat, max_lon, max_lat = geometry.bounds
-        if not np.isfinite([min_lon, min_lat, max_lon, max_lat]).all():
-            return np.array([], dtype=float), np.array([], dtype=float)
-
-        rng = np.random.default_rng(42)
-        sampled_lon: List[float] = []
-        sampled_lat: List[float] = []
-
-        max_attempts = n_points * 60
-        attempts = 0
-        while len(sampled_lon) < n_points and attempts < max_attempts:
-            attempts += 1
-            lon_candidate = float(rng.uniform(min_lon, max_lon))
-            lat_candidate = float(rng.uniform(min_lat, max_lat))
-            candidate = Point(lon_candidate, lat_candidate)
-            if geometry.covers(candidate):
-                sampled_lon.append(lon_candidate)
-                sampled_lat.append(lat_candidate)
-
-        return np.array(sampled_lon, dtype=float), np.array(sampled_lat, dtype=float)
+        return self.get_wind_fields(lat=lat, lon=lon, start_time=start_time, end_time=end_time).direction_deg
 
     def _build_exposure_reference(self, lat: float, lon: float) -> Optional[Dict]:
-        shp_path = self._find_nearest_shapefile(lat, lon)
-        if shp_path is None:
-            return None
-
-        try:
-            gdf = gpd.read_file(shp_path)
-        except Exception:
-            return None
-
-        if gdf.empty or "geometry" not in gdf:
-            return None
-
-        gdf = gdf[gdf.geometry.notnull()].copy()
-        gdf = gdf[~gdf.geometry.is_empty].copy()
-        if gdf.empty:
-            return None
-
-        if gdf.crs is None:
-            gdf = gdf.set_crs("EPSG:4326", allow_override=True)
-        elif str(gdf.crs).upper() != "EPSG:4326":
-            gdf = gdf.to_crs("EPSG:4326")
-
-        if len(gdf) > 800:
-            gdf = gdf.sample(n=800, random_state=42)
-
-        point = Point(lon, lat)
-        union_geom = unary_union(gdf.geometry.values)
-        point_series = gdf.geometry.representative_point()
-        lon_points = point_series.x.to_numpy(dtype=float)
-        lat_points = point_series.y.to_numpy(dtype=float)
-
-        gdf_metric = gdf.to_crs("EPSG:3857")
-        point_metric = gpd.GeoSeries([point], crs="EPSG:4326").to_crs("EPSG:3857").iloc[0]
-
-        areas = gdf_metric.geometry.area.to_numpy(dtype=float)
-        if np.all(~np.isfinite(areas)):
-            areas = np.ones_like(lon_points, dtype=float)
-        areas = np.nan_to_num(areas, nan=0.0, posinf=0.0, neginf=0.0)
-        if np.max(areas) <= 0:
-            areas = np.ones_like(areas, dtype=float)
-        values_array = areas / np.max(areas)
-
-        distances = gdf_metric.geometry.distance(point_metric)
-        nearest_idx = int(distances.idxmin())
-        nearest_geom = gdf.loc[nearest_idx, "geometry"]
-        boundary_lon, boundary_lat = self._polygon_exterior_coords(union_geom)
-
-        inside_count = 0
-        if union_geom is not None and not union_geom.is_empty:
-            inside_count = int(np.sum([union_geom.contains(Point(x, y)) for x, y in zip(lon_points, lat_points)]))
-
-        inside_ratio = (inside_count / max(lon_points.size, 1)) if lon_points.size else 0.0
-        need_interior_sampling = lon_points.size < 20 or inside_ratio < 0.6
-
-        if need_interior_sampling:
-            sample_geom = union_geom
-            if sample_geom is None or sample_geom.is_empty:
-                sample_geom = nearest_geom
-            if sample_geom is not None and not sample_geom.is_empty and sample_geom.geom_type not in {"Polygon", "MultiPolygon"}:
-                sample_geom = sample_geom.convex_hull
-
-            sampled_lon, sampled_lat = self._sample_points_inside_geometry(sample_geom, n_points=220)
-            if sampled_lon.size > 0:
-                lon_points = sampled_lon
-                lat_points = sampled_lat
-                values_array = np.ones_like(sampled_lon, dtype=float)
-
-        values = values_array.tolist()
-
-        min_lon, min_lat, max_lon, max_lat = gdf.total_bounds
-        hist, x_edges, y_edges = np.histogram2d(
-            lon_points,
-            lat_points,
-            bins=[12, 12],
-            range=[[float(min_lon), float(max_lon)], [float(min_lat), float(max_lat)]],
-        )
-
-        x_centers = ((x_edges[:-1] + x_edges[1:]) / 2.0).tolist()
-        y_centers = ((y_edges[:-1] + y_edges[1:]) / 2.0).tolist()
-
-        nearest_geom_metric = gdf_metric.loc[nearest_idx, "geometry"] if nearest_geom is not None else None
-        distance_km = float(point_metric.distance(nearest_geom_metric) / 1000.0) if nearest_geom_metric is not None else 0.0
-
-        return {
-            "source_name": shp_path.stem,
-            "source_path": str(shp_path.relative_to(self._workspace_root())).replace("\\", "/"),
-            "nearest_distance_km": distance_km,
-            "point": {"lat": float(lat), "lon": float(lon)},
-            "bbox": {
-                "min_lon": float(min_lon),
-                "max_lon": float(max_lon),
-                "min_lat": float(min_lat),
-                "max_lat": float(max_lat),
-            },
-            "boundary": {
-                "lon": boundary_lon,
-                "lat": boundary_lat,
-            },
-            "exposure_points": {
-                "lon": lon_points.tolist(),
-                "lat": lat_points.tolist(),
-                "value": [float(v) for v in values],
-            },
-            "raster": {
-                "x_centers": [float(v) for v in x_centers],
-                "y_centers": [float(v) for v in y_centers],
-                "z": hist.T.astype(float).tolist(),
-            },
-        }
+        return exposure_registry.reference(lat=lat, lon=lon)
 
     def get_multi_risk_point(
         self,
@@ -394,10 +337,10 @@ class ZarrDataReader:
         """Calculate multi-risk metrics for a single point."""
 
         series_map: Dict[str, xr.DataArray] = {}
+        wind_fields: Optional[WindFields] = None
         if "wind" in hazards:
-            series_map["wind"] = self.get_wind_speed_series(
-                lat, lon, start_time, end_time
-            )
+            wind_fields = self.get_wind_fields(lat=lat, lon=lon, start_time=start_time, end_time=end_time)
+            series_map["wind"] = wind_fields.speed_knots
         if "wave" in hazards:
             series_map["wave"] = self.get_point_series(
                 "hs", lat, lon, start_time, end_time
@@ -448,13 +391,12 @@ class ZarrDataReader:
             if clean.size:
                 counts, bin_edges = np.histogram(clean, bins=20)
                 bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-                sorted_vals = np.sort(clean)[::-1]
-                exceedance = self._exceedance_probs(sorted_vals.size, exceedance_method)
+                sorted_vals, exceedance = LossDistribution.from_samples(clean).exceedance_curve(exceedance_method)
                 distributions_out[hazard] = {
                     "hist_bins": bin_centers.tolist(),
                     "hist_counts": counts.tolist(),
-                    "exceedance_values": sorted_vals.tolist(),
-                    "exceedance_probs": exceedance.tolist(),
+                    "exceedance_values": sorted_vals,
+                    "exceedance_probs": exceedance,
                 }
             else:
                 distributions_out[hazard] = {
@@ -499,18 +441,17 @@ class ZarrDataReader:
                 hazard_total_hours = max(float(status.size), 1.0)
                 hazard_annualization = 8760.0 / hazard_total_hours
 
-                hazard_pricing = climada_petals_engine.compute_pricing(
+                # Quantil pedido e painel de sensibilidade numa única tabela (uma ordenação das perdas)
+                pricing_table = climada_petals_engine.compute_pricing_table(
                     loss_per_step=hazard_loss_per_step,
                     annualization=hazard_annualization,
-                    risk_quantile=quantile,
-                    risk_load_method=risk_load_method,
+                    risk_quantiles=[quantile, *SENSITIVITY_QUANTILES],
+                    risk_load_methods=[risk_load_method],
                     expense_ratio=float(max(expense_ratio, 0.0)),
                 )
-                quantile_sensitivity = climada_petals_engine.compute_quantile_sensitivity(
-                    loss_per_step=hazard_loss_per_step,
-                    annualization=hazard_annualization,
-                    risk_load_method=risk_load_method,
-                    expense_ratio=float(max(expense_ratio, 0.0)),
+                hazard_pricing = climada_petals_engine.pricing_from_table(pricing_table, quantile, risk_load_method)
+                quantile_sensitivity = climada_petals_engine.quantile_sensitivity_from_table(
+                    pricing_table, risk_load_method
                 )
 
                 hazard_pricing_models[hazard] = {
@@ -534,61 +475,14 @@ class ZarrDataReader:
                     "quantile_sensitivity": quantile_sensitivity,
                 }
 
-        if "wind" in hazards:
-            direction = self.get_wind_direction_series(lat, lon, start_time, end_time)
-            direction_values = direction.values
-            bins = np.linspace(0, 360, 17)
-            counts, _ = np.histogram(direction_values, bins=bins)
-
+        if wind_fields is not None:
+            # Mesma leitura de u10/v10 da velocidade, recortada ao eixo de tempo alinhado.
+            direction_values = wind_fields.direction_deg.sel(time=aligned_map["wind"].time).values
             wind_values = aligned_map["wind"].values
             wind_limits = thresholds.get("wind", {})
             wind_operational = float(wind_limits.get("operational_max", 15.0))
             wind_attention = float(wind_limits.get("attention_max", max(20.0, wind_operational)))
-
-            finite_mask = np.isfinite(direction_values) & np.isfinite(wind_values)
-            direction_clean = direction_values[finite_mask]
-            wind_clean = wind_values[finite_mask]
-
-            operational_mask = wind_clean < wind_operational
-            attention_mask = (wind_clean >= wind_operational) & (wind_clean < wind_attention)
-            stop_mask = wind_clean >= wind_attention
-
-            operational_counts, _ = np.histogram(direction_clean[operational_mask], bins=bins)
-            attention_counts, _ = np.histogram(direction_clean[attention_mask], bins=bins)
-            stop_counts, _ = np.histogram(direction_clean[stop_mask], bins=bins)
-
-            direction_labels = [
-                "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
-                "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"
-            ]
-            spoke_max_values = []
-            for idx in range(len(direction_labels)):
-                start = bins[idx]
-                end = bins[idx + 1]
-                if idx == len(direction_labels) - 1:
-                    sector_mask = (direction_clean >= start) & (direction_clean <= end)
-                else:
-                    sector_mask = (direction_clean >= start) & (direction_clean < end)
-
-                if np.any(sector_mask):
-                    spoke_max_values.append(float(np.nanmax(wind_clean[sector_mask])))
-                else:
-                    spoke_max_values.append(0.0)
-
-            wind_rose = {
-                "bins": [f"{int(bins[i])}-{int(bins[i+1])}" for i in range(len(bins) - 1)],
-                "direction_labels": direction_labels,
-                "spoke_max_values": spoke_max_values,
-                "global_max_speed": float(np.nanmax(wind_clean)) if wind_clean.size else 0.0,
-                "counts": counts.astype(int).tolist(),
-                "operational_counts": operational_counts.astype(int).tolist(),
-                "attention_counts": attention_counts.astype(int).tolist(),
-                "stop_counts": stop_counts.astype(int).tolist(),
-                "limits": {
-                    "operational_max": wind_operational,
-                    "attention_max": wind_attention,
-                },
-            }
+            wind_rose = summarize_wind_rose(direction_values, wind_values, wind_operational, wind_attention)
             if include_series:
                 series_out["wind_direction_deg"] = direction_values.tolist()
 
@@ -629,11 +523,10 @@ class ZarrDataReader:
 
         score_clean = score[np.isfinite(score)]
         if score_clean.size:
-            sorted_score = np.sort(score_clean)[::-1]
-            exceedance = self._exceedance_probs(sorted_score.size, exceedance_method)
+            sorted_score, exceedance = LossDistribution.from_samples(score_clean).exceedance_curve(exceedance_method)
             combined_exceedance = {
-                "values": sorted_score.tolist(),
-                "probs": exceedance.tolist(),
+                "values": sorted_score,
+                "probs": exceedance,
             }
             metrics_out["combined"] = {
                 "mean": float(np.nanmean(score_clean)),
@@ -742,20 +635,17 @@ class ZarrDataReader:
         lat_max: Optional[float] = None,
         lon_min: Optional[float] = None,
         lon_max: Optional[float] = None,
+        quantiles: Sequence[float] = (),
+        hist_bins: Optional[int] = None,
     ) -> Dict:
-        """Calculate statistics for queried data."""
+        """Calculate statistics for queried data (one chunked pass for all of them)."""
         
         data = self.query_data(
             variable, start_time, end_time,
             lat_min, lat_max, lon_min, lon_max
         )
         
-        return {
-            "mean": float(data.mean().values),
-            "min": float(data.min().values),
-            "max": float(data.max().values),
-            "std": float(data.std().values),
-        }
+        return region_statistics(data, quantiles=quantiles, hist_bins=hist_bins)
     
     def get_spatial_average(
         self,
@@ -766,20 +656,27 @@ class ZarrDataReader:
         lat_max: Optional[float] = None,
         lon_min: Optional[float] = None,
         lon_max: Optional[float] = None,
+        polygon: Optional[str] = None,
+        feature: Optional[str] = None,
     ) -> Dict:
-        """Get spatial average time series."""
+        """Get area-weighted spatial average time series over a bbox and/or an exposure polygon."""
         
-        data = self.query_data(
-            variable, start_time, end_time,
-            lat_min, lat_max, lon_min, lon_max
-        )
+        data = self.query_data(variable, start_time, end_time)
+        lat_name, lon_name = self._get_lat_lon_names()
+        region = region_geometry(lat_min, lat_max, lon_min, lon_max, polygon, feature)
         
-        # Average over space
-        spatial_avg = data.mean(dim=["lat", "lon"]).load()
+        weights = weight_mask_cache.get(region, data[lat_name].values, data[lon_name].values)
+        spatial_avg = weighted_spatial_mean(data, weights, lat_name, lon_name)
         
         return {
-            "time": spatial_avg.time.values.astype(str).tolist(),
-            "values": spatial_avg.values.tolist(),
+            "time": spatial_avg.time.values,
+            "values": spatial_avg.values,
+            "region": {
+                "polygon": polygon,
+                "feature": feature,
+                "cells": int(np.count_nonzero(weights)),
+                "weighting": "coverage*cos(lat)",
+            },
         }
     
     def get_grid_snapshot(
@@ -797,19 +694,20 @@ class ZarrDataReader:
         data = self.ds[variable].sel(time=time, method="nearest")
         
         # Apply spatial slice
+        lat_name, lon_name = self._get_lat_lon_names()
         if lat_min is not None or lat_max is not None:
-            data = data.sel(lat=slice(lat_max, lat_min))
+            data = data.sel(**{lat_name: slice(lat_max, lat_min)})
         
         if lon_min is not None or lon_max is not None:
-            data = data.sel(lon=slice(lon_min, lon_max))
+            data = data.sel(**{lon_name: slice(lon_min, lon_max)})
         
         # Load data
         data_loaded = data.load()
         
         return {
-            "lat": data_loaded.lat.values.tolist(),
-            "lon": data_loaded.lon.values.tolist(),
-            "values": data_loaded.values.tolist(),
+            "lat": data_loaded[lat_name].values,
+            "lon": data_loaded[lon_name].values,
+            "values": data_loaded.values,
             "time": str(data_loaded.time.values),
         }
 
@@ -826,42 +724,26 @@ class ZarrDataReader:
         """Get wind speed/direction and operational status for a snapshot."""
 
         lat_name, lon_name = self._get_lat_lon_names()
-        u10 = self.ds["u10"].sel(time=time, method="nearest")
-        v10 = self.ds["v10"].sel(time=time, method="nearest")
-
-        if lat_min is not None or lat_max is not None:
-            u10 = u10.sel(**{lat_name: slice(lat_max, lat_min)})
-            v10 = v10.sel(**{lat_name: slice(lat_max, lat_min)})
-
-        if lon_min is not None or lon_max is not None:
-            u10 = u10.sel(**{lon_name: slice(lon_min, lon_max)})
-            v10 = v10.sel(**{lon_name: slice(lon_min, lon_max)})
-
-        speed_ms = np.sqrt(u10**2 + v10**2)
-        speed_knots = speed_ms * 1.94384
-
-        # Meteorological direction (0-360, where wind comes from)
-        direction_deg = (np.degrees(np.arctan2(u10, v10)) + 180.0) % 360.0
-
-        speed_knots = speed_knots.load()
-        direction_deg = direction_deg.load()
-
-        status = np.zeros_like(speed_knots.values, dtype=np.uint8)
-        status = np.where(speed_knots.values >= attention_limit_knots, 2, status)
-        status = np.where(
-            (speed_knots.values >= operational_limit_knots)
-            & (speed_knots.values < attention_limit_knots),
-            1,
-            status,
+        fields = self.get_wind_fields(
+            time=time,
+            lat_min=lat_min,
+            lat_max=lat_max,
+            lon_min=lon_min,
+            lon_max=lon_max,
+            operational_limit_knots=operational_limit_knots,
+            attention_limit_knots=attention_limit_knots,
         )
+        speed_knots = fields.speed_knots
+        direction_deg = fields.direction_deg
+        status = fields.status
 
         return {
-            "lat": speed_knots.lat.values.tolist(),
-            "lon": speed_knots.lon.values.tolist(),
-            "values": speed_knots.values.tolist(),
-            "speed_knots": speed_knots.values.tolist(),
-            "direction_deg": direction_deg.values.tolist(),
-            "status": status.tolist(),
+            "lat": speed_knots[lat_name].values,
+            "lon": speed_knots[lon_name].values,
+            "values": speed_knots.values,
+            "speed_knots": speed_knots.values,
+            "direction_deg": direction_deg.values,
+            "status": status,
             "time": str(speed_knots.time.values),
             "limits": {
                 "operational_max_knots": float(operational_limit_knots),
@@ -890,28 +772,17 @@ class ZarrDataReader:
         """Calculate wind risk metrics for a single point."""
 
         lat_name, lon_name = self._get_lat_lon_names()
-        u10 = self.ds["u10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-        v10 = self.ds["v10"].sel(**{lat_name: lat, lon_name: lon}, method="nearest")
-
-        if start_time or end_time:
-            u10 = u10.sel(time=slice(start_time, end_time))
-            v10 = v10.sel(time=slice(start_time, end_time))
-
-        speed_ms = np.sqrt(u10**2 + v10**2)
-        speed_knots = speed_ms * 1.94384
-        direction_deg = (np.degrees(np.arctan2(u10, v10)) + 180.0) % 360.0
-
-        speed_knots = speed_knots.load()
-        direction_deg = direction_deg.load()
-
-        status = np.zeros_like(speed_knots.values, dtype=np.uint8)
-        status = np.where(speed_knots.values >= attention_limit_knots, 2, status)
-        status = np.where(
-            (speed_knots.values >= operational_limit_knots)
-            & (speed_knots.values < attention_limit_knots),
-            1,
-            status,
+        fields = self.get_wind_fields(
+            lat=lat,
+            lon=lon,
+            start_time=start_time,
+            end_time=end_time,
+            operational_limit_knots=operational_limit_knots,
+            attention_limit_knots=attention_limit_knots,
         )
+        speed_knots = fields.speed_knots
+        direction_deg = fields.direction_deg
+        status = fields.status
 
         total_hours = int(speed_knots.time.size)
         operational_hours = int(np.sum(status == 0))
@@ -944,19 +815,16 @@ class ZarrDataReader:
             total_hours_f = max(float(total_hours), 1.0)
             annualization = 8760.0 / total_hours_f
 
-            pricing_out = climada_petals_engine.compute_pricing(
+            pricing_table = climada_petals_engine.compute_pricing_table(
                 loss_per_step=loss_per_step,
                 annualization=annualization,
-                risk_quantile=quantile,
-                risk_load_method=risk_load_method,
+                risk_quantiles=[quantile, *SENSITIVITY_QUANTILES],
+                risk_load_methods=[risk_load_method],
                 expense_ratio=float(max(expense_ratio, 0.0)),
             )
-
-            quantile_sensitivity = climada_petals_engine.compute_quantile_sensitivity(
-                loss_per_step=loss_per_step,
-                annualization=annualization,
-                risk_load_method=risk_load_method,
-                expense_ratio=float(max(expense_ratio, 0.0)),
+            pricing_out = climada_petals_engine.pricing_from_table(pricing_table, quantile, risk_load_method)
+            quantile_sensitivity = climada_petals_engine.quantile_sensitivity_from_table(
+                pricing_table, risk_load_method
             )
 
             pricing_models = {
@@ -981,8 +849,8 @@ class ZarrDataReader:
             }
 
         return {
-            "lat": float(speed_knots.lat.values),
-            "lon": float(speed_knots.lon.values),
+            "lat": float(speed_knots[lat_name].values),
+            "lon": float(speed_knots[lon_name].values),
             "time": speed_knots.time.values.astype(str).tolist(),
             "speed_knots": speed_knots.values.tolist(),
             "direction_deg": direction_deg.values.tolist(),
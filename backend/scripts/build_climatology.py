@@ -0,0 +1,90 @@
+"""Precompute the per-cell climatology cubes used by the scenario comparison endpoints.
+
+For every hazard (wind, wave), stat (mean, max) and source (historical, ssp585)
+the cube stores monthly sums/counts per year for every grid cell, plus monthly
+p50/p90/p95/p99, the period p90/p95/max and the sample counts at or above the
+default status thresholds for the standard comparison periods. The endpoints
+read the cube and only read the raw series for non-standard periods or
+thresholds, or stale cubes.
+
+Usage:
+  python backend/scripts/build_climatology.py --base-dir "D:/OceanPact/Netcdf"
+
+Optional:
+  --output-dir "D:/OceanPact/Netcdf/climatology"
+  --historical-periods 1985-2014 --future-periods 2035-2064
+  --max-memory-mb 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build per-cell climatology cubes")
+    parser.add_argument("--base-dir", dest="base_dir", default=None, help="NetCDF root directory (NETCDF_BASE_DIR)")
+    parser.add_argument("--output-dir", dest="output_dir", default=None, help="Cube directory (NETCDF_CLIMATOLOGY_DIR)")
+    parser.add_argument("--historical-periods", nargs="*", default=None, help="Periods with stored quantiles (YYYY-YYYY)")
+    parser.add_argument("--future-periods", nargs="*", default=None, help="Periods with stored quantiles (YYYY-YYYY)")
+    parser.add_argument("--scenario", default="ssp585", help="Predictive scenario")
+    parser.add_argument("--max-memory-mb", type=int, default=1024, help="Memory budget per latitude band")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.base_dir:
+        os.environ["NETCDF_BASE_DIR"] = args.base_dir
+    if args.output_dir:
+        os.environ["NETCDF_CLIMATOLOGY_DIR"] = args.output_dir
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from app.services.climatology import CLIMATOLOGY_DIR, STANDARD_PERIODS, build_climatology, climatology_path
+    from app.services.netcdf_reader import BASE_DIR, netcdf_reader
+
+    historical_periods = args.historical_periods if args.historical_periods is not None else STANDARD_PERIODS["historical"]
+    future_periods = args.future_periods if args.future_periods is not None else STANDARD_PERIODS["future"]
+
+    print(f"[INFO] Base dir: {BASE_DIR}")
+    print(f"[INFO] Climatology dir: {CLIMATOLOGY_DIR}")
+
+    failures = 0
+    for hazard in ("wind", "wave"):
+        for stat in ("mean", "max"):
+            for source, periods in (("historical", historical_periods), (args.scenario.lower(), future_periods)):
+                name = f"{hazard}/{stat}/{source}"
+                store = climatology_path(hazard, stat, source)
+                started = time.perf_counter()
+                try:
+                    result = build_climatology(
+                        netcdf_reader,
+                        hazard,
+                        stat,
+                        source,
+                        store,
+                        periods=periods,
+                        max_memory_mb=args.max_memory_mb,
+                    )
+                except FileNotFoundError as exc:
+                    print(f"[SKIP] {name}: {exc}")
+                    continue
+                except Exception as exc:
+                    failures += 1
+                    print(f"[ERROR] {name}: {exc}")
+                    continue
+                elapsed = time.perf_counter() - started
+                print(
+                    f"[OK] {name}: {store} (var={result['variable']} years={result['years']} "
+                    f"quantiles={result['periods']}, {elapsed:.1f}s)"
+                )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
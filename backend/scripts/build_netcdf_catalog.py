@@ -0,0 +1,65 @@
+"""Scan the NetCDF archive and write (or incrementally refresh) its JSON catalog.
+
+For every file the catalog records variables, units, grid, bounding box, time
+range, chunking and a sha256 checksum. Files whose size and mtime did not
+change since the last run are not reopened.
+
+Usage:
+  python backend/scripts/build_netcdf_catalog.py --base-dir "D:/OceanPact/Netcdf"
+
+Optional:
+  --catalog "D:/OceanPact/Netcdf/catalog.json"
+  --skip-checksum
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the NetCDF archive catalog")
+    parser.add_argument("--base-dir", dest="base_dir", default=None, help="NetCDF root directory (NETCDF_BASE_DIR)")
+    parser.add_argument("--catalog", dest="catalog", default=None, help="Catalog JSON path (NETCDF_CATALOG_PATH)")
+    parser.add_argument("--skip-checksum", action="store_true", help="Do not compute sha256 checksums")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.base_dir:
+        os.environ["NETCDF_BASE_DIR"] = args.base_dir
+    if args.catalog:
+        os.environ["NETCDF_CATALOG_PATH"] = args.catalog
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from app.services.netcdf_catalog import netcdf_catalog
+
+    print(f"[INFO] Base dir: {netcdf_catalog.base_dir}")
+    print(f"[INFO] Catalog: {netcdf_catalog.catalog_path}")
+    if not netcdf_catalog.base_dir.exists():
+        print(f"[ERROR] Diretório não encontrado: {netcdf_catalog.base_dir}")
+        return 1
+
+    started = time.perf_counter()
+    summary = netcdf_catalog.refresh(checksum=not args.skip_checksum)
+    elapsed = time.perf_counter() - started
+    for entry in netcdf_catalog.entries():
+        time_range = entry.get("time") or {}
+        print(
+            f"[OK] {entry['path']}: vars={list(entry.get('variables', {}))} "
+            f"time={time_range.get('start')}..{time_range.get('end')}"
+        )
+    print(
+        f"[INFO] added={summary['added']} updated={summary['updated']} "
+        f"removed={summary['removed']} unchanged={summary['unchanged']} ({elapsed:.1f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
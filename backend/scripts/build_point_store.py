@@ -0,0 +1,70 @@
+"""Rewrite the NetCDF archives into time-major Zarr stores for fast point-series reads.
+
+Each output chunk holds the full time axis for a small lat/lon tile, so
+NetcdfReader extracts one cell with a single chunk read instead of one read per
+time step. The reader picks the stores up automatically from NETCDF_POINT_STORE_DIR
+(default: <NETCDF_BASE_DIR>/point_store).
+
+Usage:
+  python backend/scripts/build_point_store.py --base-dir "D:/OceanPact/Netcdf"
+
+Optional:
+  --output-dir "D:/OceanPact/Netcdf/point_store"
+  --tile 8 --clevel 5 --overwrite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build time-major point stores for the NetCDF archives")
+    parser.add_argument("--base-dir", dest="base_dir", default=None, help="NetCDF root directory (NETCDF_BASE_DIR)")
+    parser.add_argument("--output-dir", dest="output_dir", default=None, help="Point store directory (NETCDF_POINT_STORE_DIR)")
+    parser.add_argument("--tile", type=int, default=8, help="lat/lon tile size per chunk")
+    parser.add_argument("--clevel", type=int, default=5, help="zstd compression level")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild stores even when up to date")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.base_dir:
+        os.environ["NETCDF_BASE_DIR"] = args.base_dir
+    if args.output_dir:
+        os.environ["NETCDF_POINT_STORE_DIR"] = args.output_dir
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from app.services.netcdf_reader import BASE_DIR, POINT_STORE_DIR, NetcdfPaths
+    from app.services.point_store import build_point_store, point_store_path
+
+    print(f"[INFO] Base dir: {BASE_DIR}")
+    print(f"[INFO] Point store dir: {POINT_STORE_DIR}")
+
+    failures = 0
+    for name, nc_path in vars(NetcdfPaths()).items():
+        store = point_store_path(nc_path, BASE_DIR, POINT_STORE_DIR)
+        if not nc_path.exists():
+            print(f"[SKIP] {name}: {nc_path} não encontrado")
+            continue
+        started = time.perf_counter()
+        try:
+            result = build_point_store(nc_path, store, tile=args.tile, clevel=args.clevel, overwrite=args.overwrite)
+        except Exception as exc:
+            failures += 1
+            print(f"[ERROR] {name}: {exc}")
+            continue
+        elapsed = time.perf_counter() - started
+        state = "up to date" if result.get("skipped") else f"built in {elapsed:.1f}s"
+        print(f"[OK] {name}: {store} ({state})")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Append precomputed wind speed (knots) and direction to the ERA5 Zarr store.
+
+Adds ``wind_speed_kn`` and ``wind_dir_deg`` to ``climatologia.zarr`` with the
+same chunking (and compressor) as ``u10``. ZarrDataReader uses them automatically
+when present, so point, snapshot and wind-rose queries become plain reads.
+
+Usage:
+  python backend/scripts/build_wind_derived.py --zarr-path "D:/OceanPact/climatologia.zarr"
+
+Optional:
+  --scaled       int16/uint16 with scale_factor 0.01 instead of float32
+  --overwrite    rebuild even when the variables already exist
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Append wind_speed_kn / wind_dir_deg to the ERA5 Zarr store")
+    parser.add_argument("--zarr-path", dest="zarr_path", default="D:/OceanPact/climatologia.zarr", help="ERA5 Zarr store")
+    parser.add_argument("--scaled", action="store_true", help="Store as scaled integers (0.01 resolution)")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild the derived variables")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from app.services.wind_derived import build_derived_wind
+
+    zarr_path = Path(args.zarr_path)
+    if not zarr_path.exists():
+        print(f"[ERROR] Store não encontrado: {zarr_path}")
+        return 1
+
+    print(f"[INFO] Store: {zarr_path}")
+    started = time.perf_counter()
+    try:
+        result = build_derived_wind(zarr_path, scaled=args.scaled, overwrite=args.overwrite)
+    except Exception as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    if result.get("skipped"):
+        print("[SKIP] wind_speed_kn/wind_dir_deg já existem (use --overwrite para recriar)")
+        return 0
+    encoding = "int scaled" if result.get("scaled") else "float32"
+    print(f"[OK] wind_speed_kn/wind_dir_deg gravados ({encoding}, chunks {result.get('chunks')}) em {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Precompute per-cell monthly wind roses from the ERA5 Zarr store.
+
+For every grid cell and calendar month, stores the joint direction (16 sectors)
+x speed (knots) histogram and the maximum speed per sector. ``/api/v1/climate/wind-rose``
+answers from this cube with a single chunk read instead of loading the hourly series.
+
+Usage:
+  python backend/scripts/build_wind_rose_cube.py --zarr-path "D:/OceanPact/climatologia.zarr"
+
+Optional:
+  --output            cube path (default: ERA5_WIND_ROSE_PATH or D:/OceanPact/wind_rose.zarr)
+  --tile              lat/lon chunk size of the cube (default: 8)
+  --max-memory-mb     memory budget per processed block (default: 1024)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the per-cell monthly wind rose cube")
+    parser.add_argument("--zarr-path", dest="zarr_path", default="D:/OceanPact/climatologia.zarr", help="ERA5 Zarr store")
+    parser.add_argument("--output", default=None, help="Wind rose cube path")
+    parser.add_argument("--tile", type=int, default=8, help="Lat/lon chunk size")
+    parser.add_argument("--max-memory-mb", dest="max_memory_mb", type=int, default=1024, help="Memory per block")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from app.services.wind_rose import WIND_ROSE_CUBE_PATH, build_wind_rose_cube
+
+    zarr_path = Path(args.zarr_path)
+    if not zarr_path.exists():
+        print(f"[ERROR] Store não encontrado: {zarr_path}")
+        return 1
+
+    output = Path(args.output) if args.output else WIND_ROSE_CUBE_PATH
+    print(f"[INFO] Store: {zarr_path}")
+    print(f"[INFO] Cubo: {output}")
+    started = time.perf_counter()
+    try:
+        result = build_wind_rose_cube(zarr_path, output, max_memory_mb=args.max_memory_mb, tile=args.tile)
+    except Exception as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    print(
+        f"[OK] Rosas gravadas ({'/'.join(result['source_vars'])}, grade {result['grid']}, "
+        f"{result['time_steps']} passos) em {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Check the vectorized single-asset impact kernel against CLIMADA's ImpactCalc.
+
+Runs both paths of ``ClimadaWindWaveService`` (``_point_impact`` and
+``_climada_impact``) on the real wind and wave series of one point of the
+NetCDF acervo, for every asset profile. Compares ``at_event``, ``frequency``,
+``aai_agg`` and the return-period curve, and prints the speed-up. The synthetic
+edge cases (breakpoints, zeros, negatives, values beyond the last breakpoint)
+are covered by ``backend/tests/test_impact_parity.py``.
+
+Usage:
+  python backend/scripts/check_impact_parity.py --lat -22.5 --lon -40.5
+
+Optional:
+  --start/--end       period of the real series (default: 2015-01-01 onwards)
+  --rtol              relative tolerance (default: 1e-9)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+RETURN_PERIODS = [2, 5, 10, 20, 50, 100]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parity of the single-asset impact kernel vs ImpactCalc")
+    parser.add_argument("--lat", type=float, required=True, help="Latitude of the real series")
+    parser.add_argument("--lon", type=float, required=True, help="Longitude of the real series")
+    parser.add_argument("--start", default="2015-01-01", help="Start of the real series (ISO)")
+    parser.add_argument("--end", default=None, help="End of the real series (ISO)")
+    parser.add_argument("--rtol", type=float, default=1e-9, help="Relative tolerance")
+    return parser.parse_args()
+
+
+def compare(service, hazard: str, intensity: np.ndarray, profile, asset_value: float, rtol: float) -> tuple:
+    cfg = service._CONFIG[hazard]
+    if hazard == "wind":
+        op, att = profile.wind_operational_max, profile.wind_attention_max
+        att_factor, stop_factor = profile.wind_attention_loss_factor, profile.wind_stop_loss_factor
+    else:
+        op, att = profile.wave_operational_max, profile.wave_attention_max
+        att_factor, stop_factor = profile.wave_attention_loss_factor, profile.wave_stop_loss_factor
+    impf_set = service._build_impact_func_set(
+        haz_code=cfg.code,
+        unit=cfg.unit,
+        operational_max=op,
+        attention_max=att,
+        attention_loss_factor=att_factor,
+        stop_loss_factor=stop_factor,
+    )
+    # Mesma frequência do serviço: série horária anualizada e dividida entre os eventos
+    annualization = 8760.0 / max(intensity.size, 1)
+    per_event_frequency = annualization / max(intensity.size, 1)
+
+    started = time.perf_counter()
+    reference = service._climada_impact(
+        hazard_name=hazard,
+        intensity=intensity,
+        lat=-22.5,
+        lon=-40.5,
+        asset_value=asset_value,
+        impf_set=impf_set,
+        per_event_frequency=per_event_frequency,
+    )
+    climada_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fast = service._point_impact(
+        intensity=intensity,
+        lat=-22.5,
+        lon=-40.5,
+        asset_value=asset_value,
+        impact_func=impf_set.get_func(haz_type=cfg.code, fun_id=1),
+        per_event_frequency=per_event_frequency,
+    )
+    kernel_seconds = time.perf_counter() - started
+
+    atol = asset_value * 1e-12
+    problems = []
+    if not np.allclose(fast.at_event, reference.at_event, rtol=rtol, atol=atol):
+        worst = float(np.max(np.abs(fast.at_event - np.asarray(reference.at_event))))
+        problems.append(f"at_event (max |diff| {worst:.3g})")
+    if not np.allclose(fast.frequency, reference.frequency, rtol=rtol, atol=0.0):
+        problems.append("frequency")
+    if not np.isclose(fast.aai_agg, reference.aai_agg, rtol=rtol, atol=atol):
+        problems.append(f"aai_agg ({fast.aai_agg!r} != {reference.aai_agg!r})")
+    fast_curve = np.asarray(fast.calc_freq_curve(return_per=RETURN_PERIODS).impact, dtype=float)
+    reference_curve = np.asarray(reference.calc_freq_curve(return_per=RETURN_PERIODS).impact, dtype=float)
+    if not np.allclose(fast_curve, reference_curve, rtol=rtol, atol=atol):
+        problems.append("return-period curve")
+    return problems, climada_seconds, kernel_seconds
+
+
+def main() -> int:
+    args = parse_args()
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    try:
+        from app.services.climada_wind_wave_service import climada_wind_wave_service as service
+    except ImportError as exc:
+        print(f"[ERROR] CLIMADA indisponível: {exc}")
+        return 1
+
+    from app.services.netcdf_reader import netcdf_reader
+
+    wind = netcdf_reader.get_wind_speed_series(args.lat, args.lon, args.start, args.end, stat="max")
+    wave = netcdf_reader.get_point_series("hs", args.lat, args.lon, args.start, args.end, stat="max")
+    cases = []
+    for profile_name, profile in service._ASSET_PROFILES.items():
+        for hazard, series in (("wind", wind), ("wave", wave)):
+            series = np.asarray(series, dtype=float)
+            cases.append((f"{profile_name}/{hazard} ({args.lat}, {args.lon})", hazard, series[np.isfinite(series)], profile))
+
+    failures = 0
+    total_climada = total_kernel = 0.0
+    for name, hazard, series, profile in cases:
+        if series.size == 0:
+            print(f"[SKIP] {name}: série vazia")
+            continue
+        problems, climada_seconds, kernel_seconds = compare(service, hazard, series, profile, 1.0e6, args.rtol)
+        total_climada += climada_seconds
+        total_kernel += kernel_seconds
+        if problems:
+            failures += 1
+            print(f"[ERROR] {name}: divergência em {', '.join(problems)}")
+        else:
+            print(f"[OK] {name}: {series.size} eventos, ImpactCalc {climada_seconds * 1000:.1f} ms, kernel {kernel_seconds * 1000:.2f} ms")
+
+    speedup = total_climada / total_kernel if total_kernel > 0 else float("inf")
+    print(f"[INFO] {len(cases) - failures}/{len(cases)} casos iguais; ganho total {speedup:.0f}x")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Testes importam o pacote ``app`` do backend, como os scripts.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
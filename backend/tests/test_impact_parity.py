@@ -0,0 +1,114 @@
+"""Parity of the vectorized single-asset impact kernel with CLIMADA's ImpactCalc.
+
+``ClimadaWindWaveService._point_impact`` must reproduce ``_climada_impact``
+(``Hazard``/``Exposures`` + ``ImpactCalc``) for every asset profile and hazard:
+random series, values exactly on the curve breakpoints (and one ulp around
+them), zeros, negatives and values beyond the last breakpoint. The check on a
+real NetCDF series stays in ``scripts/check_impact_parity.py``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("climada")
+
+from app.services.climada_wind_wave_service import climada_wind_wave_service as service  # noqa: E402
+
+
+RETURN_PERIODS = [2, 5, 10, 20, 50, 100]
+ASSET_VALUE = 1.0e6
+RTOL = 1e-9
+N_EVENTS = 5000
+
+
+def _limits(profile, hazard: str) -> tuple:
+    if hazard == "wind":
+        return (
+            profile.wind_operational_max,
+            profile.wind_attention_max,
+            profile.wind_attention_loss_factor,
+            profile.wind_stop_loss_factor,
+        )
+    return (
+        profile.wave_operational_max,
+        profile.wave_attention_max,
+        profile.wave_attention_loss_factor,
+        profile.wave_stop_loss_factor,
+    )
+
+
+def _series(hazard: str, case: str, operational_max: float, attention_max: float) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    upper = max(attention_max + 1e-6, attention_max * 1.6)
+    breakpoints = np.array([0.0, operational_max, attention_max, upper])
+    if case == "random":
+        return rng.weibull(2.0, N_EVENTS) * 14.0 if hazard == "wind" else rng.gamma(2.0, 1.1, N_EVENTS)
+    if case == "breakpoints":
+        return np.concatenate([
+            breakpoints,
+            np.nextafter(breakpoints, np.inf),
+            np.nextafter(breakpoints[1:], -np.inf),
+        ])
+    if case == "zeros":
+        return np.zeros(64)
+    if case == "negatives":
+        return np.array([-1.0, -operational_max, -1e-12, 0.0, operational_max])
+    if case == "beyond_last_breakpoint":
+        return np.array([upper, upper * 1.5, upper * 3.0, upper * 100.0])
+    if case == "single":
+        return np.array([attention_max * 1.3])
+    raise ValueError(case)
+
+
+CASES = ["random", "breakpoints", "zeros", "negatives", "beyond_last_breakpoint", "single"]
+
+
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("hazard", ["wind", "wave"])
+@pytest.mark.parametrize("profile_name", sorted(service._ASSET_PROFILES))
+def test_point_impact_matches_impact_calc(profile_name: str, hazard: str, case: str) -> None:
+    profile = service._ASSET_PROFILES[profile_name]
+    cfg = service._CONFIG[hazard]
+    operational_max, attention_max, attention_factor, stop_factor = _limits(profile, hazard)
+    intensity = _series(hazard, case, operational_max, attention_max)
+    impf_set = service._build_impact_func_set(
+        haz_code=cfg.code,
+        unit=cfg.unit,
+        operational_max=operational_max,
+        attention_max=attention_max,
+        attention_loss_factor=attention_factor,
+        stop_loss_factor=stop_factor,
+    )
+    # Mesma frequência do serviço: série horária anualizada e dividida entre os eventos
+    per_event_frequency = (8760.0 / intensity.size) / intensity.size
+
+    reference = service._climada_impact(
+        hazard_name=hazard,
+        intensity=intensity,
+        lat=-22.5,
+        lon=-40.5,
+        asset_value=ASSET_VALUE,
+        impf_set=impf_set,
+        per_event_frequency=per_event_frequency,
+    )
+    fast = service._point_impact(
+        intensity=intensity,
+        lat=-22.5,
+        lon=-40.5,
+        asset_value=ASSET_VALUE,
+        impact_func=impf_set.get_func(haz_type=cfg.code, fun_id=1),
+        per_event_frequency=per_event_frequency,
+    )
+
+    atol = ASSET_VALUE * 1e-12
+    np.testing.assert_allclose(fast.at_event, np.asarray(reference.at_event), rtol=RTOL, atol=atol)
+    np.testing.assert_allclose(fast.frequency, np.asarray(reference.frequency), rtol=RTOL, atol=0.0)
+    assert fast.aai_agg == pytest.approx(reference.aai_agg, rel=RTOL, abs=atol)
+    np.testing.assert_allclose(
+        np.asarray(fast.calc_freq_curve(return_per=RETURN_PERIODS).impact, dtype=float),
+        np.asarray(reference.calc_freq_curve(return_per=RETURN_PERIODS).impact, dtype=float),
+        rtol=RTOL,
+        atol=atol,
+    )
@@ -10,6 +10,8 @@ import booleanPointInPolygon from '@turf/boolean-point-in-polygon';
 import { point as turfPoint } from '@turf/helpers';
 import 'mapbox-gl/dist/mapbox-gl.css';
 import './Map.css';
+import { climateDataService, fetchArrays } from '../../services/climateDataService';
+import type { Grid, Vector, WindRoseData } from '../../services/climateDataService';
 
 interface MapProps {
   hazardType: string;
@@ -34,6 +36,52 @@ interface MapProps {
   } | null;
 }
 
+// Rosa compacta (SVG) para o popup do mapa: fatias empilhadas operacional/atenção/parada.
+const buildWindRoseSvg = (rose: WindRoseData, size = 150) => {
+  const center = size / 2;
+  const maxRadius = center - 14;
+  const total = rose.counts.reduce((acc, value) => acc + value, 0) || 1;
+  const maxShare = Math.max(...rose.counts.map((value) => value / total), 1e-9);
+  const sectorWidth = 360 / rose.counts.length;
+  const point = (radius: number, deg: number) => {
+    const rad = ((deg - 90) * Math.PI) / 180;
+    return `${(center + radius * Math.cos(rad)).toFixed(1)},${(center + radius * Math.sin(rad)).toFixed(1)}`;
+  };
+  const wedge = (inner: number, outer: number, start: number, end: number, color: string) => (
+    outer - inner < 0.2
+      ? ''
+      : `<path d="M${point(inner, start)} L${point(outer, start)} A${outer},${outer} 0 0 1 ${point(outer, end)} `
+        + `L${point(inner, end)} A${inner},${inner} 0 0 0 ${point(inner, start)} Z" fill="${color}" fill-opacity="0.85" />`
+  );
+
+  const paths = rose.counts.map((_, idx) => {
+    const start = idx * sectorWidth - sectorWidth / 2 + 1;
+    const end = start + sectorWidth - 2;
+    const layers: [number, string][] = [
+      [rose.operational_counts[idx] ?? 0, '#22c55e'],
+      [rose.attention_counts[idx] ?? 0, '#f59e0b'],
+      [rose.stop_counts[idx] ?? 0, '#ef4444'],
+    ];
+    let radius = 0;
+    return layers.map(([count, color]) => {
+      const next = radius + (count / total / maxShare) * maxRadius;
+      const path = wedge(radius, next, start, end, color);
+      radius = next;
+      return path;
+    }).join('');
+  }).join('');
+
+  const labels = ['N', 'E', 'S', 'W'].map((label, idx) => {
+    const [x, y] = point(maxRadius + 8, idx * 90).split(',');
+    return `<text x="${x}" y="${y}" font-size="9" text-anchor="middle" dominant-baseline="middle" fill="#475569">${label}</text>`;
+  }).join('');
+
+  return `<svg width="${size}" height="${size}" viewBox="0 0 ${size} ${size}">`
+    + `<circle cx="${center}" cy="${center}" r="${maxRadius}" fill="none" stroke="#dbeafe" />`
+    + `<circle cx="${center}" cy="${center}" r="${maxRadius / 2}" fill="none" stroke="#dbeafe" />`
+    + `${paths}${labels}</svg>`;
+};
+
 const Map: React.FC<MapProps> = ({
   hazardType,
   filters,
@@ -58,6 +106,12 @@ const Map: React.FC<MapProps> = ({
   const landMaskRef = useRef<any | null>(null);
   const selectedPointMarkerRef = useRef<mapboxgl.Marker | null>(null);
   const hoverPopupRef = useRef<mapboxgl.Popup | null>(null);
+  const windRosePopupRef = useRef<mapboxgl.Popup | null>(null);
+  const windRoseRequestRef = useRef<AbortController | null>(null);
+  const hazardTypeRef = useRef(hazardType);
+  const limitsRef = useRef({ operationalMax, attentionMax });
+  hazardTypeRef.current = hazardType;
+  limitsRef.current = { operationalMax, attentionMax };
   const layerHoverHandlersRef = useRef<Record<string, { move: (e: any) => void; leave: () => void }>>({});
   const windArrowLayerId = 'wind-arrow-layer';
   const windArrowSourceId = 'wind-arrow-source';
@@ -154,6 +208,36 @@ const Map: React.FC<MapProps> = ({
     layerHoverHandlersRef.current[layerId] = { move, leave };
   };
 
+  // Rosa dos ventos da célula clicada, lida do cubo mensal pré-calculado no backend.
+  const showWindRose = async (lat: number, lon: number) => {
+    if (!map.current) return;
+    windRoseRequestRef.current?.abort();
+    const controller = new AbortController();
+    windRoseRequestRef.current = controller;
+
+    try {
+      const { operationalMax: operational, attentionMax: attention } = limitsRef.current;
+      const rose = await climateDataService.getWindRose(lat, lon, undefined, operational, attention);
+      if (controller.signal.aborted || !map.current || !rose.counts?.length) return;
+
+      if (!windRosePopupRef.current) {
+        windRosePopupRef.current = new mapboxgl.Popup({ closeButton: true, closeOnClick: false, offset: 12 });
+      }
+      const cellLat = rose.lat ?? lat;
+      const cellLon = rose.lon ?? lon;
+      windRosePopupRef.current
+        .setLngLat([lon, lat])
+        .setHTML(
+          `<div style="text-align:center"><strong>Rosa dos ventos</strong>`
+          + `<div style="font-size:11px;color:#475569">${cellLat.toFixed(2)}, ${cellLon.toFixed(2)}`
+          + ` · máx ${rose.global_max_speed.toFixed(1)} nós</div>${buildWindRoseSvg(rose)}</div>`,
+        )
+        .addTo(map.current);
+    } catch (error) {
+      console.warn('Wind rose unavailable:', error);
+    }
+  };
+
   const LAND_MASK_URL =
     'https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_110m_land.geojson';
 
@@ -241,6 +325,9 @@ const Map: React.FC<MapProps> = ({
     map.current.on('click', (event) => {
       const { lng, lat } = event.lngLat;
       onPointSelect?.({ lat, lon: lng });
+      if (hazardTypeRef.current === 'wind') {
+        showWindRose(lat, lng);
+      }
     });
 
     // Add navigation controls
@@ -597,7 +684,7 @@ const Map: React.FC<MapProps> = ({
     return `${apiBaseUrl}/api/v1/climate/wave-snapshot?${params.toString()}`;
   };
 
-  const computeMinMax = (values: number[][], step: number) => {
+  const computeMinMax = (values: Grid, step: number) => {
     let minValue = Number.POSITIVE_INFINITY;
     let maxValue = Number.NEGATIVE_INFINITY;
 
@@ -619,9 +706,9 @@ const Map: React.FC<MapProps> = ({
   };
 
   const buildHeatmapFeaturesFromGrid = (
-    latList: number[],
-    lonList: number[],
-    values: number[][],
+    latList: Vector,
+    lonList: Vector,
+    values: Grid,
     minOverride?: number,
     maxOverride?: number,
   ) => {
@@ -665,9 +752,9 @@ const Map: React.FC<MapProps> = ({
   };
 
   const addWindArrowLayer = (
-    latList: number[],
-    lonList: number[],
-    direction: number[][],
+    latList: Vector,
+    lonList: Vector,
+    direction: Grid,
   ) => {
     if (!map.current) return;
 
@@ -844,16 +931,11 @@ const Map: React.FC<MapProps> = ({
       try {
         console.log(`📊 Carregando vento: ${snapshotTime}`);
 
-        const response = await fetch(buildWindSnapshotUrl(snapshotTime), { signal: controller.signal });
-        if (!response.ok) {
-          throw new Error('Erro ao buscar dados de vento');
-        }
-
-        const windData = await response.json();
-        const latList = windData.lat as number[];
-        const lonList = windData.lon as number[];
-        const values = (windData.speed_knots ?? windData.values) as number[][];
-        const direction = (windData.direction_deg ?? []) as number[][];
+        const windData = await fetchArrays(buildWindSnapshotUrl(snapshotTime), { signal: controller.signal });
+        const latList = windData.lat as Vector;
+        const lonList = windData.lon as Vector;
+        const values = (windData.speed_knots ?? windData.values) as Grid;
+        const direction = (windData.direction_deg ?? []) as Grid;
 
         const { features, minValue, maxValue } = buildHeatmapFeaturesFromGrid(
           latList,
@@ -929,18 +1011,12 @@ const Map: React.FC<MapProps> = ({
       try {
         console.log(`📊 Carregando onda: ${snapshotTime}`);
 
-        const response = await fetch(buildWaveSnapshotUrl(snapshotTime), {
+        const waveData = await fetchArrays(buildWaveSnapshotUrl(snapshotTime), {
           signal: controller.signal,
         });
-
-        if (!response.ok) {
-          throw new Error('Erro ao buscar dados de onda');
-        }
-
-        const waveData = await response.json();
-        const latList = waveData.lat as number[];
-        const lonList = waveData.lon as number[];
-        const values = waveData.values as number[][];
+        const latList = waveData.lat as Vector;
+        const lonList = waveData.lon as Vector;
+        const values = waveData.values as Grid;
 
         const { features, minValue, maxValue } = buildHeatmapFeaturesFromGrid(
           latList,
@@ -1005,9 +1081,19 @@ const Map: React.FC<MapProps> = ({
       layerHoverHandlersRef.current = {};
       hoverPopupRef.current?.remove();
       hoverPopupRef.current = null;
+      windRoseRequestRef.current?.abort();
+      windRosePopupRef.current?.remove();
+      windRosePopupRef.current = null;
     };
   }, []);
 
+  useEffect(() => {
+    if (hazardType !== 'wind') {
+      windRoseRequestRef.current?.abort();
+      windRosePopupRef.current?.remove();
+    }
+  }, [hazardType]);
+
   return (
     <div className="map-wrapper">
       {!mapboxToken && (
@@ -2,6 +2,77 @@
 
 const API_BASE = "http://localhost:8000/api/v1/climate";
 
+// Binary array transport (see backend/app/responses.py): magic "OVA1", uint32 LE
+// header length, JSON header ({arrays, meta}) and 8-byte aligned little-endian buffers.
+export const ARRAY_MEDIA_TYPE = "application/x-oceanvalue-array";
+
+type NumericArray = Float32Array | Float64Array | Int32Array | Uint8Array;
+
+export type Vector = ArrayLike<number>;
+export type Grid = ArrayLike<ArrayLike<number>>;
+
+interface ArrayDescriptor {
+  dtype: string;
+  shape: number[];
+  offset: number;
+  nbytes: number;
+  nodata?: string | null;
+  encoding?: string; // "datetime64[ms]": epoch milliseconds as float64
+}
+
+interface TypedArrayConstructor {
+  new (buffer: ArrayBuffer, byteOffset: number, length: number): NumericArray;
+  BYTES_PER_ELEMENT: number;
+}
+
+const TYPED_ARRAYS: Record<string, TypedArrayConstructor> = {
+  float32: Float32Array,
+  float64: Float64Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+};
+
+// 2-D arrays become row views over the same buffer (no copies).
+const toRows = (flat: NumericArray, rows: number, cols: number): NumericArray[] =>
+  Array.from({ length: rows }, (_, i) => flat.subarray(i * cols, (i + 1) * cols));
+
+export function decodeArrayPayload(buffer: ArrayBuffer): Record<string, any> {
+  const decoder = new TextDecoder();
+  if (decoder.decode(new Uint8Array(buffer, 0, 4)) !== "OVA1") {
+    throw new Error("Unknown binary array payload");
+  }
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header = JSON.parse(decoder.decode(new Uint8Array(buffer, 8, headerLength)));
+  const dataStart = 8 + headerLength;
+
+  const payload: Record<string, any> = { ...(header.meta || {}) };
+  const arrays = (header.arrays || {}) as Record<string, ArrayDescriptor>;
+  for (const [name, info] of Object.entries(arrays)) {
+    const ctor = TYPED_ARRAYS[info.dtype];
+    if (!ctor) {
+      throw new Error(`Unsupported dtype ${info.dtype} for ${name}`);
+    }
+    const flat = new ctor(buffer, dataStart + info.offset, info.nbytes / ctor.BYTES_PER_ELEMENT);
+    payload[name] = info.shape.length === 2 ? toRows(flat, info.shape[0], info.shape[1]) : flat;
+  }
+  return payload;
+}
+
+// Requests the binary layout and falls back to JSON when the endpoint does not support it.
+export async function fetchArrays(url: string, init: RequestInit = {}): Promise<Record<string, any>> {
+  const headers = new Headers(init.headers);
+  headers.set("Accept", `${ARRAY_MEDIA_TYPE}, application/json;q=0.9`);
+  const response = await fetch(url, { ...init, headers });
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status} for ${url}`);
+  }
+  const contentType = response.headers.get("content-type") || "";
+  if (contentType.includes(ARRAY_MEDIA_TYPE)) {
+    return decodeArrayPayload(await response.arrayBuffer());
+  }
+  return response.json();
+}
+
 export interface ClimateVariable {
   name: string;
   description: string;
@@ -13,9 +84,9 @@ export interface DataPoint {
 }
 
 export interface GridData {
-  lat: number[];
-  lon: number[];
-  values: number[][];
+  lat: Vector;
+  lon: Vector;
+  values: Grid;
   time: string;
 }
 
@@ -27,9 +98,9 @@ export interface Statistics {
 }
 
 export interface SnapshotData {
-  lat: number[];
-  lon: number[];
-  values: number[][];
+  lat: Vector;
+  lon: Vector;
+  values: Grid;
 }
 
 export interface SpatialBounds {
@@ -39,6 +110,25 @@ export interface SpatialBounds {
   lon_max: number;
 }
 
+export interface WindRoseData {
+  bins: string[];
+  direction_labels: string[];
+  counts: number[];
+  operational_counts: number[];
+  attention_counts: number[];
+  stop_counts: number[];
+  spoke_max_values: number[];
+  global_max_speed: number;
+  limits: { operational_max: number; attention_max: number };
+  source: "cube" | "live";
+  lat?: number;
+  lon?: number;
+  months?: number[];
+  speed_edges?: number[];
+  speed_counts?: number[][];
+  limits_exact?: boolean;
+}
+
 export const climateDataService = {
   async getVariables(): Promise<Record<string, string>> {
     const response = await fetch(`${API_BASE}/variables`);
@@ -66,8 +156,8 @@ export const climateDataService = {
       ...(endTime && { end_time: endTime }),
     });
 
-    const response = await fetch(`${API_BASE}/timeseries?${params}`);
-    return response.json();
+    // Binary: values as Float32Array, time as epoch milliseconds (Float64Array).
+    return fetchArrays(`${API_BASE}/timeseries?${params}`);
   },
 
   async getStatistics(
@@ -100,7 +190,9 @@ export const climateDataService = {
     latMin?: number,
     latMax?: number,
     lonMin?: number,
-    lonMax?: number
+    lonMax?: number,
+    polygon?: string,
+    feature?: string
   ) {
     const params = new URLSearchParams({
       variable,
@@ -110,6 +202,9 @@ export const climateDataService = {
       ...(latMax !== undefined && { lat_max: latMax.toString() }),
       ...(lonMin !== undefined && { lon_min: lonMin.toString() }),
       ...(lonMax !== undefined && { lon_max: lonMax.toString() }),
+      // Camada de exposição (campos_producao, blocos_exploratorios...) e feição opcional.
+      ...(polygon && { polygon }),
+      ...(feature && { feature }),
     });
 
     const response = await fetch(`${API_BASE}/spatial-average?${params}`);
@@ -133,8 +228,28 @@ export const climateDataService = {
       ...(lonMax !== undefined && { lon_max: lonMax.toString() }),
     });
 
-    const response = await fetch(`${API_BASE}/snapshot?${params}`);
+    return (await fetchArrays(`${API_BASE}/snapshot?${params}`)) as GridData;
+  },
+  // Rosa dos ventos da célula ERA5 mais próxima (cubo pré-calculado por mês).
+  async getWindRose(
+    lat: number,
+    lon: number,
+    months?: number[],
+    operationalMaxKnots?: number,
+    attentionMaxKnots?: number
+  ): Promise<WindRoseData> {
+    const params = new URLSearchParams({
+      lat: lat.toString(),
+      lon: lon.toString(),
+      ...(months?.length && { months: months.join(",") }),
+      ...(operationalMaxKnots !== undefined && { operational_max_knots: operationalMaxKnots.toString() }),
+      ...(attentionMaxKnots !== undefined && { attention_max_knots: attentionMaxKnots.toString() }),
+    });
+
+    const response = await fetch(`${API_BASE}/wind-rose?${params}`);
+    if (!response.ok) {
+      throw new Error(`wind-rose failed: ${response.status}`);
+    }
     return response.json();
   },
 };
-